@@ -1,8 +1,111 @@
-from sqlalchemy.orm import Session
-from IHM_.IHM.models import Medecin
-
-def authenticate_user(db: Session, email: str, password: str):
-    medecin = db.query(Medecin).filter(Medecin.email == email).first()
-    if medecin and medecin.mot_de_passe == password:
-        return medecin
-    return None
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from IHM_.IHM.models import Medecin
+
+# durée courte : un changement de mot de passe fait par un autre processus (sans
+# événement dans celui-ci) est pris en compte au plus tard après USER_CACHE_TTL
+USER_CACHE_TTL = 30  # secondes
+USER_CACHE_SIZE = 1024
+
+# copie détachée de la session, réutilisable d'une requête à l'autre ; seul un hash
+# du mot de passe est gardé en mémoire
+CachedUser = namedtuple("CachedUser", ["id", "nom", "email", "password_hash"])
+
+
+class UserCache:
+    """
+    Cache LRU à durée de vie limitée des médecins, indexé par email.
+    """
+
+    def __init__(self, ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        with self._lock:
+            entry = self.entries.get(email)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.entries.pop(email, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, email, user):
+        with self._lock:
+            self.entries[email] = (time.monotonic(), user)
+            self.entries.move_to_end(email)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, email=None):
+        with self._lock:
+            if email is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(email, None)
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(Medecin, "after_update")
+@event.listens_for(Medecin, "after_delete")
+def _invalidate_medecin(mapper, connection, target):
+    # changement de mot de passe, d'email ou suppression : l'entrée ne doit plus servir
+    user_cache.invalidate(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        user_cache.invalidate(old_email)
+
+
+def password_hash(password):
+    if password is None:
+        return None
+    return hashlib.sha256(password.encode("utf-8")).digest()
+
+
+def to_cached(medecin):
+    return CachedUser(medecin.id, medecin.nom, medecin.email, password_hash(medecin.mot_de_passe))
+
+
+def check_password(user, password):
+    if user and user.password_hash is not None and password is not None \
+            and hmac.compare_digest(user.password_hash, password_hash(password)):
+        return user
+    return None
+
+
+def authenticate_user(db: Session, email: str, password: str):
+    user = user_cache.get(email)
+    if user is None:
+        medecin = db.query(Medecin).filter(Medecin.email == email).first()
+        if medecin is None:
+            return None
+        user = to_cached(medecin)
+        user_cache.put(email, user)
+    return check_password(user, password)
+
+
+async def authenticate_user_async(db, email: str, password: str):
+    """
+    Même chose avec une AsyncSession (handlers async de FastAPI).
+    """
+    user = user_cache.get(email)
+    if user is None:
+        result = await db.execute(select(Medecin).where(Medecin.email == email))
+        medecin = result.scalars().first()
+        if medecin is None:
+            return None
+        user = to_cached(medecin)
+        user_cache.put(email, user)
+    return check_password(user, password)
@@ -0,0 +1,252 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+MODELS_DIR = os.path.join(PROJECT_DIR, "models")
+MODEL_SERVER_URL = os.environ.get("MODEL_SERVER_URL", "http://127.0.0.1:8765")
+MAX_WORKERS = 2
+MAX_FINISHED_JOBS = 200  # historique conservé en mémoire
+PREPARED_TTL = 600  # secondes : audio préparé jamais transcrit, libéré au-delà
+MAX_PREPARED = 8  # AudioProcessor (buffers audio compris) gardés en mémoire au plus
+LAST_FILENAME_PATH = "data/last_filename.txt"
+RAW_DIR = "data/raw"
+
+# scripts encore lancés dans un interpréteur séparé
+SCRIPT_STEPS = {
+    "comprehension": "models/comprehension.py",
+    "score": "models/score.py",
+}
+
+
+def _models_on_path():
+    # les modules de models/ s'importent entre eux sans paquet (import audio_processor...)
+    if MODELS_DIR not in sys.path:
+        sys.path.insert(0, MODELS_DIR)
+
+
+class WarmModels:
+    """
+    Modèles chargés une seule fois et gardés en mémoire entre deux jobs. Si le serveur
+    de modèles (models/model_server.py) tourne, il est utilisé à la place d'un chargement local.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backend = None
+        self._diarizer = None
+        self._remote = None
+        self._connected = False
+
+    def _connect(self):
+        # une seule tentative de connexion au serveur de modèles par processus
+        if not self._connected:
+            _models_on_path()
+            from model_server import connect
+            self._remote = connect(MODEL_SERVER_URL)
+            self._connected = True
+        return self._remote
+
+    def vad_model(self):
+        """
+        Client du serveur de modèles pour le VAD du filtre qualité, None si le serveur
+        ne répond pas (AudioProcessor charge alors son modèle Silero par thread).
+        """
+        with self._lock:
+            return self._connect()
+
+    def transcription_backend(self):
+        with self._lock:
+            if self._backend is None:
+                self._backend = self._connect()
+                if self._backend is None:
+                    _models_on_path()
+                    from pipeline import build_backend
+                    from transcription_backends import SerializedBackend
+                    # modèle local partagé par les threads de jobs et les sessions live
+                    self._backend = SerializedBackend(build_backend())
+            return self._backend
+
+    def diarizer(self):
+        with self._lock:
+            if self._diarizer is None:
+                _models_on_path()
+                from diarization import Diarizer
+                from embedding_cache import EmbeddingCache
+                self._diarizer = Diarizer(cache=EmbeddingCache())
+            return self._diarizer
+
+
+class Job:
+    def __init__(self, step, audio_path=None):
+        self.id = uuid.uuid4().hex
+        self.step = step
+        self.audio_path = audio_path
+        self.status = "pending"
+        self.output = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "step": self.step,
+            "status": self.status,
+            "output": self.output,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    File de jobs en arrière-plan pour les étapes du dashboard : la requête HTTP
+    renvoie un identifiant tout de suite, le travail s'exécute dans un pool borné.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        _models_on_path()
+        from profiling import Profiler
+
+        # temps par étape des jobs et du traitement audio (exposés sur /metrics)
+        self.profiler = Profiler()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.models = WarmModels()
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._prepared = {}  # chemin audio -> (instant, Future (wav, AudioProcessor))
+        self.steps = {
+            "prepare": self.run_prepare,
+            "transcription": self.run_transcription,
+        }
+        for step, script in SCRIPT_STEPS.items():
+            self.steps[step] = lambda job, script=script: self.run_script(script)
+
+    def submit(self, step, audio_path=None):
+        if step not in self.steps:
+            raise KeyError(step)
+        job = Job(step, audio_path)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.status in ("done", "error")]
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[:-MAX_FINISHED_JOBS or None]:
+            del self.jobs[job.id]
+
+    def _run(self, job):
+        job.status = "running"
+        job.started_at = time.time()
+        # finished_at est renseigné avant le statut final : _prune trie les jobs terminés
+        try:
+            with self.profiler.timed(f"job_{job.step}"):
+                job.output = self.steps[job.step](job)
+            job.finished_at = time.time()
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e) or traceback.format_exc()
+            job.finished_at = time.time()
+            job.status = "error"
+
+    def run_script(self, script):
+        result = subprocess.run([sys.executable, script], capture_output=True, text=True, check=False, cwd=PROJECT_DIR)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        return result.stdout
+
+    def resolve_audio(self, job):
+        if job.audio_path is not None:
+            return job.audio_path
+        # sinon, le dernier fichier envoyé par le dashboard
+        with open(LAST_FILENAME_PATH, "r", encoding="utf-8") as f:
+            return os.path.join(RAW_DIR, f.read().strip())
+
+    def _evict_prepared(self):
+        # préparations terminées jamais suivies d'une transcription : les plus anciennes
+        # au-delà de PREPARED_TTL ou de MAX_PREPARED (appelé avec self._lock)
+        now = time.time()
+        done = sorted((at, path) for path, (at, future) in self._prepared.items() if future.done())
+        for i, (at, path) in enumerate(done):
+            if now - at > PREPARED_TTL or len(done) - i > MAX_PREPARED:
+                del self._prepared[path]
+
+    def prepare_audio(self, audio_path):
+        """
+        Conversion en .wav et filtre qualité, une seule fois par fichier : un appel
+        concurrent (transcription lancée pendant la préparation) attend le premier.
+        """
+        with self._lock:
+            self._evict_prepared()
+            entry = self._prepared.get(audio_path)
+            owner = entry is None
+            if owner:
+                entry = self._prepared[audio_path] = (time.time(), Future())
+        future = entry[1]
+        if owner:
+            try:
+                _models_on_path()
+                from toWav import toWav_av
+                from audio_processor import AudioProcessor
+
+                wav_path = audio_path if audio_path.endswith(".wav") else toWav_av(audio_path)
+                # segments de parole gardés en mémoire pour la transcription : ni _cleaned.wav ni CSV
+                processor = AudioProcessor(wav_path, verbose=False, mmap=True, export_cleaned=False,
+                                           vad_model=self.models.vad_model())
+                processor.process(log=False)
+                self.profiler.add(processor.timer.timings)
+                future.set_result((wav_path, processor))
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:
+                    if self._prepared.get(audio_path) is entry:
+                        del self._prepared[audio_path]  # nouvelle tentative possible
+        return future.result()
+
+    def run_prepare(self, job):
+        _, processor = self.prepare_audio(self.resolve_audio(job))
+        if processor.should_reject:
+            return "Audio rejeté (qualité) : " + ", ".join(processor.rejection_reasons)
+        return "Audio accepté"
+
+    def run_transcription(self, job):
+        """
+        Filtre qualité (réutilisé s'il a déjà tourné à la réception), transcription
+        des segments VAD et diarisation dans le processus, avec les modèles déjà chargés.
+        """
+        _models_on_path()
+        from transcriber import Transcriber
+        from transcribe_diarize import transcribe_diarize
+
+        audio_path = self.resolve_audio(job)
+        _, processor = self.prepare_audio(audio_path)
+        with self._lock:
+            self._prepared.pop(audio_path, None)  # libère les buffers audio
+        if processor.should_reject:
+            return "Audio rejeté (qualité) : " + ", ".join(processor.rejection_reasons)
+
+        transcriber, _ = transcribe_diarize(processor, self.models.transcription_backend(), self.models.diarizer())
+        self.profiler.add(transcriber.timer.timings)
+        return "\n".join(Transcriber.format_segment(seg) for seg in transcriber.segments)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import numpy as np
+
+from IHM_.IHM.jobs import _models_on_path
+
+LANGUAGE = "fr"
+SAMPLE_RATE = 16000
+FRAME_BYTES = 4  # float32
+
+
+async def run_live_session(websocket, models):
+    """
+    Transcription en direct : le client envoie des trames binaires (float32 mono
+    16 kHz), chaque énoncé détecté par le VAD est transcrit dès sa fin et renvoyé
+    en JSON. Le message texte "stop" termine la session après le dernier énoncé.
+    """
+    _models_on_path()
+    from live_transcriber import LiveSegmenter, transcribe_utterance
+
+    await websocket.accept()
+    backend = await asyncio.to_thread(models.transcription_backend)
+    # un modèle Silero par session (quelques dizaines de ms au chargement, ~2 Mo) :
+    # VADIterator garde l'état du modèle d'une trame à l'autre, le modèle par thread de
+    # vad_pool serait partagé entre sessions servies par le même thread
+    segmenter = await asyncio.to_thread(LiveSegmenter)
+    utterances = asyncio.Queue()
+
+    async def transcribe_loop():
+        # un énoncé à la fois, dans l'ordre d'arrivée ; le modèle est partagé avec les
+        # autres sessions et les jobs, les appels concurrents sont sérialisés par le backend
+        while True:
+            utterance = await utterances.get()
+            if utterance is None:
+                break
+            try:
+                message = await asyncio.to_thread(transcribe_utterance, backend, utterance, LANGUAGE)
+            except Exception as e:
+                # énoncé perdu, la session continue avec les suivants
+                message = {"type": "error", "start": utterance["start"], "end": utterance["end"], "error": str(e)}
+            message["latency_ms"] = (time.perf_counter() - utterance["detected_at"]) * 1000
+            message["pending"] = utterances.qsize()
+            await websocket.send_json(message)
+
+    async def detected(found):
+        now = time.perf_counter()
+        for utterance in found:
+            utterance["detected_at"] = now
+            await utterances.put(utterance)
+            await websocket.send_json({"type": "speech", "start": utterance["start"], "end": utterance["end"]})
+
+    consumer = asyncio.create_task(transcribe_loop())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            if data:
+                if len(data) % FRAME_BYTES:
+                    # trame tronquée : ignorée, la session continue
+                    now = segmenter.position / SAMPLE_RATE
+                    await websocket.send_json({"type": "error", "start": now, "end": now,
+                                               "error": f"Trame de {len(data)} octets : float32 attendus"})
+                    continue
+                samples = np.frombuffer(data, dtype=np.float32)
+                await detected(await asyncio.to_thread(segmenter.feed, samples))
+            elif message.get("text") == "stop":
+                await detected(await asyncio.to_thread(segmenter.flush))
+                await utterances.put(None)
+                await consumer
+                await websocket.send_json({"type": "done"})
+                await websocket.close()
+                return
+    finally:
+        if not consumer.done():
+            consumer.cancel()
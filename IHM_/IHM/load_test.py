@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# base SQLite locale à la place de MySQL, avant l'import de database
+LOAD_TEST_DB = "data/loadtest.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{LOAD_TEST_DB}")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from IHM_.IHM import auth
+from IHM_.IHM.database import Base, make_engine
+from IHM_.IHM.models import Medecin
+
+NUM_USERS = 200
+NUM_REQUESTS = 5000
+CONCURRENCY = 16
+
+
+def populate(engine, num_users=NUM_USERS):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            Medecin(nom=f"Médecin {i}", email=f"medecin{i}@hopital.fr", mot_de_passe=f"mdp{i}")
+            for i in range(num_users)
+        )
+        db.commit()
+
+
+def run(engine, cache, num_requests=NUM_REQUESTS, concurrency=CONCURRENCY, num_users=NUM_USERS):
+    """
+    Simule des connexions (session par requête, comme get_db) ; retourne les requêtes/s.
+    """
+    auth.user_cache = cache
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(0)
+    users = [rng.randrange(num_users) for _ in range(num_requests)]
+
+    def login(i):
+        db = Session()
+        try:
+            user = auth.authenticate_user(db, f"medecin{i}@hopital.fr", f"mdp{i}")
+            assert user is not None
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(login, users))
+    return num_requests / (time.perf_counter() - start)
+
+
+# script principal : requêtes/s avant (réglages par défaut, sans cache) et après
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge de l'authentification sur SQLite")
+    parser.add_argument("--requests", type=int, default=NUM_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--users", type=int, default=NUM_USERS)
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+    os.makedirs(os.path.dirname(LOAD_TEST_DB), exist_ok=True)
+    baseline_engine = create_engine(url, connect_args={"check_same_thread": False})
+    tuned_engine = make_engine(url)
+    populate(tuned_engine, args.users)
+
+    scenarios = [
+        ("avant (pool par défaut, sans cache)", baseline_engine, auth.UserCache(ttl=0)),
+        ("pool réglé, sans cache", tuned_engine, auth.UserCache(ttl=0)),
+        ("après (pool réglé + cache)", tuned_engine, auth.UserCache()),
+    ]
+    for name, engine, cache in scenarios:
+        rate = run(engine, cache, args.requests, args.concurrency, args.users)
+        print(f"{name:40s} {rate:8.0f} requêtes/s (cache : {cache.hits} hits, {cache.misses} miss)")
+        engine.dispose()
@@ -1,15 +1,19 @@
-from fastapi import FastAPI, Request, Form, Depends, UploadFile, File, Query
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, Depends, UploadFile, File, Query, WebSocket
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from starlette.middleware.sessions import SessionMiddleware
 import os
-import subprocess
 import json
 
-from IHM_.IHM.database import get_db, Base, engine
-from IHM_.IHM.auth import authenticate_user
+from IHM_.IHM.database import get_db, get_async_db, dispose_engines, Base, engine, USE_ASYNC_DB
+from IHM_.IHM.auth import authenticate_user, authenticate_user_async
+from IHM_.IHM.jobs import JobManager
+from IHM_.IHM.live import run_live_session
+from IHM_.IHM.uploads import UploadRegistry, UploadTooLarge, iter_upload_file
+
+METRICS_ENDPOINT = os.environ.get("IHM_METRICS", "0") == "1"  # /metrics au format Prometheus
 
 app = FastAPI()
 
@@ -21,14 +25,25 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 templates = Jinja2Templates(directory=templates_dir)
 app.add_middleware(SessionMiddleware, secret_key='secret_key')
 Base.metadata.create_all(bind=engine)
+jobs = JobManager()
+uploads = UploadRegistry()
+
+@app.on_event("shutdown")
+async def shutdown():
+    jobs.shutdown()
+    await dispose_engines()
 
 @app.get("/", response_class=HTMLResponse)
 async def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @app.post("/login", response_class=HTMLResponse)
-async def login(request: Request, username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
-    user = authenticate_user(db, username, password)
+async def login(request: Request, username: str = Form(...), password: str = Form(...),
+                db: Session = Depends(get_async_db if USE_ASYNC_DB else get_db)):
+    if USE_ASYNC_DB:
+        user = await authenticate_user_async(db, username, password)
+    else:
+        user = authenticate_user(db, username, password)
     if user:
         request.session['user'] = user.nom
         return RedirectResponse(url="/dashboard", status_code=302)
@@ -41,36 +56,78 @@ async def dashboard(request: Request):
         return RedirectResponse(url="/", status_code=302)
     return templates.TemplateResponse("dashboard.html", {"request": request, "user": user})
 
-@app.post("/upload-audio/")
-async def upload_audio(file: UploadFile = File(...)):
-    save_path = f"data/raw/{file.filename}"
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    with open(save_path, "wb") as f_out:
-        f_out.write(await file.read())
+async def store_upload(filename, chunks, analyze):
+    try:
+        upload = await uploads.receive(filename, chunks)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=415)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
 
-    # Écrire le nom du dernier fichier dans un fichier temporaire
+    # Conservé pour les scripts qui lisent encore le dernier fichier reçu
     with open("data/last_filename.txt", "w", encoding="utf-8") as f:
-        f.write(file.filename)
-    print(f"Fichier reçu : {file.filename} Taille : {file.size}")
-    return JSONResponse({"status": "Fichier reçu"})
+        f.write(os.path.basename(upload.path))
+    print(f"Fichier reçu : {upload.filename} Taille : {upload.size} (envoi {upload.id})")
+
+    payload = {"status": "Fichier reçu", "upload_id": upload.id}
+    if analyze:
+        # conversion et filtre qualité lancés dès la réception complète, avant l'étape
+        # transcription (pas pendant l'envoi : décodage et VAD portent sur le fichier entier)
+        payload["job_id"] = jobs.submit("prepare", upload.path).id
+    return JSONResponse(payload)
+
+@app.post("/upload-audio/")
+async def upload_audio(file: UploadFile = File(...), analyze: bool = Query(True)):
+    return await store_upload(file.filename, iter_upload_file(file), analyze)
+
+@app.put("/uploads/")
+async def stream_upload(request: Request, filename: str = Query(...), analyze: bool = Query(True)):
+    # corps brut écrit bloc par bloc, sans passer par le parseur multipart
+    return await store_upload(filename, request.stream(), analyze)
+
+@app.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    upload = uploads.get(upload_id)
+    if upload is None:
+        return JSONResponse({"error": f"Envoi inconnu : {upload_id}"}, status_code=404)
+    return JSONResponse(upload.to_dict())
 
 @app.post("/run-step/")
-async def run_step(step: str = Query(...)):
+async def run_step(step: str = Query(...), upload_id: str = Query(None)):
     print(f"➡️ Étape demandée : {step}")
+    audio_path = None
+    if upload_id is not None:
+        try:
+            audio_path = uploads.path(upload_id)
+        except KeyError:
+            return JSONResponse({"error": f"Envoi inconnu : {upload_id}"}, status_code=404)
     try:
-        if step == "transcription":
-            result = subprocess.run(["python", "models/transcribe_diarize.py"], capture_output=True, text=True, check=True)
-        elif step == "comprehension":
-            result = subprocess.run(["python", "models/comprehension.py"], capture_output=True, text=True, check=True)
-        elif step == "score":
-            result = subprocess.run(["python", "models/score.py"], capture_output=True, text=True, check=True)
-        else:
-            return JSONResponse({"error": f"Étape inconnue : {step}"})
-
-        return JSONResponse({"output": result.stdout})
-
-    except subprocess.CalledProcessError as e:
-        return JSONResponse({"error": e.stderr})
+        job = jobs.submit(step, audio_path)
+    except KeyError:
+        return JSONResponse({"error": f"Étape inconnue : {step}"})
+    # réponse immédiate : le client suit l'avancement via /jobs/{job_id}
+    return JSONResponse({"job_id": job.id, "status": job.status}, status_code=202)
+
+@app.get("/jobs/")
+async def list_jobs():
+    return JSONResponse(jobs.list())
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": f"Job inconnu : {job_id}"}, status_code=404)
+    return JSONResponse(job.to_dict())
+
+@app.websocket("/ws/live")
+async def live_transcription(websocket: WebSocket):
+    # même modèle Whisper (chargé une fois) que les jobs du dashboard
+    await run_live_session(websocket, jobs.models)
+
+if METRICS_ENDPOINT:
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return jobs.profiler.prometheus()
 
 @app.get("/get-score/")
 async def get_score():
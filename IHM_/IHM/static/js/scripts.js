@@ -8,6 +8,31 @@ document.addEventListener("DOMContentLoaded", () => {
     const btnScore = document.getElementById("btnScore");
     const pipelineSteps = document.getElementById("pipelineSteps");
 
+    const POLL_INTERVAL_MS = 1000;
+    let uploadId = null;
+
+    // Lance une étape en arrière-plan puis interroge /jobs/{id} jusqu'à la fin
+    async function runStep(step) {
+        const params = new URLSearchParams({ step });
+        if (uploadId) {
+            params.append("upload_id", uploadId);
+        }
+        const response = await fetch(`/run-step/?${params}`, {
+            method: "POST"
+        });
+        const job = await response.json();
+        if (!job.job_id) {
+            return job;
+        }
+        while (true) {
+            await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+            const status = await (await fetch(`/jobs/${job.job_id}`)).json();
+            if (status.status === "done" || status.status === "error") {
+                return status;
+            }
+        }
+    }
+
     uploadForm.addEventListener("submit", async (e) => {
         e.preventDefault();
         const fileInput = document.getElementById("audioFile");
@@ -17,15 +42,18 @@ document.addEventListener("DOMContentLoaded", () => {
             return;
         }
 
-        const formData = new FormData();
-        formData.append("file", file);
-
         try {
-            const response = await fetch("/upload-audio/", {
-                method: "POST",
-                body: formData
+            // Envoi en flux brut : le serveur écrit les blocs au fil de la réception
+            const response = await fetch(`/uploads/?filename=${encodeURIComponent(file.name)}`, {
+                method: "PUT",
+                body: file
             });
             const data = await response.json();
+            if (!response.ok) {
+                alert(data.error || "Une erreur est survenue lors de l'envoi.");
+                return;
+            }
+            uploadId = data.upload_id;
             alert(data.status || "Fichier envoyé.");
             pipelineSteps.style.display = "block";
         } catch (error) {
@@ -38,10 +66,7 @@ document.addEventListener("DOMContentLoaded", () => {
         resultContainer.style.display = "block";
 
         try {
-            const response = await fetch("/run-step/?step=transcription", {
-                method: "POST"
-            });
-            const data = await response.json();
+            const data = await runStep("transcription");
             outputText.textContent = data.output || "Erreur : " + data.error;
             btnComprehension.style.display = "inline-block";
         } catch (err) {
@@ -52,10 +77,7 @@ document.addEventListener("DOMContentLoaded", () => {
     btnComprehension.addEventListener("click", async () => {
         outputText.textContent = "Compréhension en cours...";
         try {
-            const response = await fetch("/run-step/?step=comprehension", {
-                method: "POST"
-            });
-            const data = await response.json();
+            const data = await runStep("comprehension");
             outputText.textContent = data.output || " Erreur : " + data.error;
             btnScore.style.display = "inline-block";
         } catch (err) {
@@ -66,10 +88,7 @@ document.addEventListener("DOMContentLoaded", () => {
     btnScore.addEventListener("click", async () => {
         outputText.textContent = "Calcul du score final...";
         try {
-            const response = await fetch("/run-step/?step=score", {
-                method: "POST"
-            });
-            const data = await response.json();
+            const data = await runStep("score");
             outputText.textContent = data.output || " Erreur : " + data.error;
         
             actionBtn.style.display = "inline-block";
@@ -79,6 +98,83 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     });
 
+    // Transcription en direct : micro -> WebSocket (float32 mono 16 kHz)
+    const btnLiveStart = document.getElementById("btnLiveStart");
+    const btnLiveStop = document.getElementById("btnLiveStop");
+    const liveText = document.getElementById("liveText");
+    let liveSocket = null;
+    let liveAudio = null;
+
+    function formatTime(seconds) {
+        const m = String(Math.floor(seconds / 60)).padStart(2, "0");
+        const s = String(Math.floor(seconds % 60)).padStart(2, "0");
+        return `${m}:${s}`;
+    }
+
+    function stopMicrophone() {
+        if (liveAudio) {
+            liveAudio.stream.getTracks().forEach((track) => track.stop());
+            liveAudio.context.close();
+            liveAudio = null;
+        }
+    }
+
+    btnLiveStart.addEventListener("click", async () => {
+        let stream;
+        try {
+            stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+        } catch (err) {
+            alert("Accès au microphone refusé.");
+            return;
+        }
+        const protocol = window.location.protocol === "https:" ? "wss" : "ws";
+        liveSocket = new WebSocket(`${protocol}://${window.location.host}/ws/live`);
+        liveSocket.binaryType = "arraybuffer";
+        liveText.textContent = "";
+        liveText.style.display = "block";
+
+        liveSocket.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.type === "utterance" && data.text) {
+                liveText.textContent += `[${formatTime(data.start)} - ${formatTime(data.end)}] : ${data.text}\n`;
+            } else if (data.type === "error") {
+                liveText.textContent += `[${formatTime(data.start)} - ${formatTime(data.end)}] : (erreur de transcription : ${data.error})\n`;
+            } else if (data.type === "done") {
+                liveSocket.close();
+            }
+        };
+        liveSocket.onclose = () => {
+            stopMicrophone();
+            btnLiveStart.style.display = "inline-block";
+            btnLiveStop.style.display = "none";
+        };
+
+        liveSocket.onopen = () => {
+            // le navigateur rééchantillonne le micro à 16 kHz
+            const context = new AudioContext({ sampleRate: 16000 });
+            const source = context.createMediaStreamSource(stream);
+            const processor = context.createScriptProcessor(4096, 1, 1);
+            processor.onaudioprocess = (e) => {
+                if (liveSocket && liveSocket.readyState === WebSocket.OPEN) {
+                    liveSocket.send(new Float32Array(e.inputBuffer.getChannelData(0)).buffer);
+                }
+            };
+            source.connect(processor);
+            processor.connect(context.destination);
+            liveAudio = { stream, context };
+            btnLiveStart.style.display = "none";
+            btnLiveStop.style.display = "inline-block";
+        };
+    });
+
+    btnLiveStop.addEventListener("click", () => {
+        stopMicrophone();
+        // le serveur transcrit le dernier énoncé puis répond "done"
+        if (liveSocket && liveSocket.readyState === WebSocket.OPEN) {
+            liveSocket.send("stop");
+        }
+    });
+
     const actionBtn = document.getElementById("actionBtn");
     const actionContainer = document.getElementById("actionContainer");
     const actionBox = document.getElementById("actionBox");
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+import uuid
+
+UPLOAD_DIR = "data/raw"
+CHUNK_SIZE = 1024 * 1024  # 1 Mo
+MAX_UPLOAD_BYTES = 500 * 1024 * 1024  # 500 Mo, au-delà l'envoi est interrompu
+ALLOWED_EXTENSIONS = (".m4a", ".mp3", ".wav")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class Upload:
+    def __init__(self, filename, upload_dir=UPLOAD_DIR):
+        self.id = uuid.uuid4().hex
+        self.filename = os.path.basename(filename)
+        ext = os.path.splitext(self.filename)[1].lower()
+        # nom unique sur disque : deux envois du même fichier ne s'écrasent pas
+        self.path = os.path.join(upload_dir, self.id + ext)
+        self.size = 0
+        self.status = "receiving"
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            "upload_id": self.id,
+            "filename": self.filename,
+            "path": self.path,
+            "size": self.size,
+            "status": self.status,
+        }
+
+
+class UploadRegistry:
+    """
+    Envois en cours et terminés, écrits sur disque bloc par bloc et repérés par un
+    identifiant unique (au lieu du seul dernier nom de fichier).
+    """
+
+    def __init__(self, upload_dir=UPLOAD_DIR, max_bytes=MAX_UPLOAD_BYTES):
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.uploads = {}
+        self._lock = threading.Lock()
+
+    def check_filename(self, filename):
+        if not filename or not filename.lower().endswith(ALLOWED_EXTENSIONS):
+            raise ValueError(f"Format non pris en charge : {filename} (attendu : {', '.join(ALLOWED_EXTENSIONS)})")
+
+    async def receive(self, filename, chunks):
+        """
+        Écrit un envoi sur disque à partir d'un itérateur asynchrone de blocs d'octets.
+        Le fichier partiel est supprimé si l'envoi échoue ou dépasse la taille maximale.
+        """
+        self.check_filename(filename)
+        os.makedirs(self.upload_dir, exist_ok=True)
+        upload = Upload(filename, self.upload_dir)
+        with self._lock:
+            self.uploads[upload.id] = upload
+
+        tmp_path = upload.path + ".part"
+        try:
+            with open(tmp_path, "wb") as f_out:
+                async for chunk in chunks:
+                    upload.size += len(chunk)
+                    if upload.size > self.max_bytes:
+                        raise UploadTooLarge(f"Fichier trop volumineux (max {self.max_bytes // (1024 * 1024)} Mo)")
+                    f_out.write(chunk)
+            os.replace(tmp_path, upload.path)
+        except BaseException:
+            upload.status = "failed"
+            with self._lock:
+                del self.uploads[upload.id]
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        upload.status = "done"
+        upload.finished_at = time.time()
+        return upload
+
+    def get(self, upload_id):
+        with self._lock:
+            upload = self.uploads.get(upload_id)
+        if upload is not None:
+            return upload
+        # envoi d'une session précédente du serveur : retrouvé par son nom sur disque
+        if os.path.isdir(self.upload_dir):
+            for name in os.listdir(self.upload_dir):
+                base, ext = os.path.splitext(name)
+                if base == upload_id and ext.lower() in ALLOWED_EXTENSIONS:
+                    upload = Upload(name, self.upload_dir)
+                    upload.id, upload.path = upload_id, os.path.join(self.upload_dir, name)
+                    upload.size = os.path.getsize(upload.path)
+                    upload.status = "done"
+                    return upload
+        return None
+
+    def path(self, upload_id):
+        upload = self.get(upload_id)
+        if upload is None or upload.status != "done":
+            raise KeyError(upload_id)
+        return upload.path
+
+
+async def iter_upload_file(file, chunk_size=CHUNK_SIZE):
+    """
+    Blocs d'un UploadFile multipart, sans le lire en entier.
+    """
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
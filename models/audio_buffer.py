@@ -0,0 +1,114 @@
+import os
+import struct
+import numpy as np
+
+BLOCK_FRAMES = 1 << 16  # trames converties en float32 à la fois
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+PCM_DTYPES = {(WAVE_FORMAT_PCM, 16): "<i2", (WAVE_FORMAT_PCM, 32): "<i4", (WAVE_FORMAT_IEEE_FLOAT, 32): "<f4"}
+PCM_SCALES = {"<i2": 32768.0, "<i4": 2147483648.0, "<f4": 1.0}
+
+
+def wav_layout(path):
+    """
+    Lit l'en-tête RIFF : (offset des données, trames, canaux, fréquence, dtype numpy)
+    ou None si le format ne peut pas être projeté tel quel (24 bits, compressé...),
+    si le fichier ne contient aucune trame ou si l'en-tête est invalide.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12:
+            return None
+        riff, _, wave_id = struct.unpack("<4sI4s", header)
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                data = f.read(size)
+                if len(data) < 16:
+                    return None
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", data[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                    tag = struct.unpack("<H", data[24:26])[0]  # sous-format
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                tag, channels, rate, bits = fmt
+                dtype = PCM_DTYPES.get((tag, bits))
+                if dtype is None or channels == 0 or rate == 0:
+                    return None
+                offset = f.tell()
+                # fichier tronqué (ou taille inconnue à l'écriture) : on s'arrête à la fin réelle
+                size = min(size, file_size - offset)
+                frames = size // (channels * np.dtype(dtype).itemsize)
+                if frames <= 0:
+                    return None
+                return offset, frames, channels, rate, dtype
+            else:
+                f.seek(size + (size & 1), 1)  # les chunks sont alignés sur 2 octets
+
+
+class AudioBuffer:
+    """
+    Accès en lecture seule aux échantillons d'un WAV projeté en mémoire (numpy.memmap) :
+    aucune copie à l'ouverture, les tranches sont des vues, et la conversion en
+    float32 se fait par blocs. Les formats non projetables sont lus avec soundfile.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        layout = wav_layout(path)
+        if layout is not None:
+            offset, frames, channels, rate, dtype = layout
+            self.pcm = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+            self.scale = PCM_SCALES[dtype]
+        else:
+            import soundfile as sf
+            data, rate = sf.read(path, dtype="float32", always_2d=True)
+            data.flags.writeable = False
+            self.pcm = data
+            self.scale = 1.0
+        self.sample_rate = int(rate)
+        self.frames, self.channels = self.pcm.shape
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    def view(self, start=0, end=None):
+        """
+        Trames [start, end) en vue (frames, canaux), dans le type du fichier.
+        """
+        return self.pcm[start:end]
+
+    def view_seconds(self, start_s, end_s):
+        return self.view(int(start_s * self.sample_rate), int(end_s * self.sample_rate))
+
+    def block_float32(self, start, end):
+        """
+        Bloc (canaux, trames) en float32 [-1, 1], au format attendu par Pedalboard.
+        """
+        block = self.pcm[start:end].T.astype(np.float32, order="C")
+        if self.scale != 1.0:
+            block *= 1.0 / self.scale
+        return block
+
+    def iter_blocks(self, block_frames=BLOCK_FRAMES):
+        for start in range(0, self.frames, block_frames):
+            end = min(start + block_frames, self.frames)
+            yield start, end, self.block_float32(start, end)
+
+    def close(self):
+        # libère la projection (le fichier peut alors être supprimé sous Windows)
+        mmap = getattr(self.pcm, "_mmap", None)
+        self.pcm = None
+        if mmap is not None:
+            mmap.close()
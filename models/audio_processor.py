@@ -1,17 +1,14 @@
 import os
 import csv
-import threading
-import uuid
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")
+from math import gcd
+from vad_pool import get_vad_model, get_remote_vad
+from profiling import StageTimer
+from audio_buffer import AudioBuffer
+from plot_renderer import decimate_spectrum, plot_payload, render_plot
 
-import matplotlib.pyplot as plt
-from scipy.fft import rfft, rfftfreq
-from pedalboard import Pedalboard, HighpassFilter, LowpassFilter, Compressor, NoiseGate, Reverb
-from pedalboard.io import AudioFile
-from pydub import AudioSegment, effects
-from silero_vad import load_silero_vad, read_audio, get_speech_timestamps
+# matplotlib, pedalboard, pydub, scipy, torch et silero_vad sont importés à leur
+# premier usage : importer ce module (pipeline, caches, base de métriques) reste rapide
 
 MIN_RMS = 2000
 MAX_RMS = 4000  
@@ -23,22 +20,186 @@ MIN_SPEECH_RATIO = 0.4
 MIN_SIGNAL_STD = 0.015
 MIN_SPECTRAL_ROLLOFF = 1700
 
-PLOT_LOCK = threading.Lock()
+VAD_SAMPLE_RATE = 16000
+VAD_THRESHOLD = 0.3
+VAD_MIN_SPEECH_MS = 100
+NORMALIZE_HEADROOM_DB = 6.0
+
+# évaluation par paliers (tiered) : "cheap" sur le signal brut décimé avant Pedalboard,
+# "vad" avant la FFT, "full" après toutes les métriques
+TIER_DECIMATION_RATE = 4000  # Hz visés pour le palier "cheap" (décimation par pas)
+TIER_MARGIN = 1.5  # le palier "cheap" ne rejette que si le seuil est dépassé de cette marge
+TIER_SATURATION_MARGIN = 10  # saturation plus incertaine avant filtrage : marge plus large
+# métriques non mesurées quand un palier rejette le fichier (0 dans metrics(), NULL en base)
+SPECTRAL_METRICS = ("dominant_freq", "mean_freq", "bandwidth", "spectral_centroid", "spectral_rolloff")
+TIER_SKIPPED_METRICS = {
+    "cheap": ("speech_ratio", "noise_level") + SPECTRAL_METRICS,
+    "vad": SPECTRAL_METRICS,
+}
+
+QUALITY_CSV = "data/audio_quality_log.csv"
+QUALITY_CSV_HEADER = [
+    "file", "duration", "rms", "saturation_count", 
+    # "dominant_freq", "mean_freq", "bandwidth", 
+    "speech_ratio", "noise_level", "spectral_centroid", 
+    "spectral_rolloff", "signal_std",
+    "rejected", "rejection_reasons"
+]
+
+def log_records_to_csv(records, output_csv=QUALITY_CSV):
+    """
+    Ajoute des enregistrements produits par AudioProcessor.metrics() au CSV qualité.
+    """
+    file_exists = os.path.isfile(output_csv)
+    with open(output_csv, mode="a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if not file_exists:
+            writer.writerow(QUALITY_CSV_HEADER)
+
+        for record in records:
+            writer.writerow(quality_csv_row(record))
+
+def _rounded(value, digits):
+    # métrique non mesurée (palier de rejet, relue depuis MetricsStore) : cellule vide
+    return "" if value is None else round(value, digits)
+
+def quality_csv_row(record):
+    return [
+        record["file"],
+        round(record["duration"], 2),
+        record["rms"],
+        record["saturation_count"],
+        # round(record["dominant_freq"], 2),
+        # round(record["mean_freq"], 2),
+        # round(record["bandwidth"], 2),
+        _rounded(record["speech_ratio"], 3),
+        _rounded(record["noise_level"], 3),
+        _rounded(record["spectral_centroid"], 2),
+        _rounded(record["spectral_rolloff"], 2),
+        round(record["signal_std"], 3),
+        record["rejected"],
+        "; ".join(record["rejection_reasons"]) if record["rejection_reasons"] else ""
+    ]
+
+# options d'AudioProcessor sans effet sur les métriques (hors clé de cache) ;
+# mmap donne les mêmes échantillons que in_memory, seule l'empreinte mémoire change ;
+# vad_server exécute le même modèle Silero dans le serveur de modèles
+RUNTIME_OPTIONS = ("trace_memory", "mmap", "plots", "vad_server")
+
+# chaîne de prétraitement Pedalboard appliquée à chaque fichier
+PEDALBOARD_CHAIN = [
+    ("HighpassFilter", {"cutoff_frequency_hz": 100}),
+    ("LowpassFilter", {"cutoff_frequency_hz": 4000}),
+    ("Compressor", {"threshold_db": -20, "ratio": 3.0}),
+    ("NoiseGate", {"threshold_db": -45, "ratio": 3.0}),
+    ("Reverb", {"room_size": 0.1, "damping": 0.8, "wet_level": 0.05, "dry_level": 0.95}),
+]
+
+def build_board():
+    import pedalboard
+    return pedalboard.Pedalboard([getattr(pedalboard, plugin)(**params) for plugin, params in PEDALBOARD_CHAIN])
+
+def processing_params(options=None):
+    """
+    Tous les réglages qui influencent les métriques ou le fichier nettoyé
+    (sert de clé de cache avec le hash du contenu audio).
+    """
+    params = {
+        "pedalboard": [(plugin, params) for plugin, params in PEDALBOARD_CHAIN],
+        "normalize_headroom_db": NORMALIZE_HEADROOM_DB,
+        "vad": {
+            "sample_rate": VAD_SAMPLE_RATE,
+            "threshold": VAD_THRESHOLD,
+            "min_speech_duration_ms": VAD_MIN_SPEECH_MS,
+        },
+        "rejection": {
+            "MIN_RMS": MIN_RMS,
+            "MAX_RMS": MAX_RMS,
+            "MAX_SATURATION_FRAMES": MAX_SATURATION_FRAMES,
+            "MAX_NOISE_LEVEL": MAX_NOISE_LEVEL,
+            "MIN_SPECTRAL_CENTROID": MIN_SPECTRAL_CENTROID,
+            "MAX_SPECTRAL_CENTROID": MAX_SPECTRAL_CENTROID,
+            "MIN_SPEECH_RATIO": MIN_SPEECH_RATIO,
+            "MIN_SIGNAL_STD": MIN_SIGNAL_STD,
+            "MIN_SPECTRAL_ROLLOFF": MIN_SPECTRAL_ROLLOFF,
+        },
+        "options": {k: v for k, v in sorted((options or {}).items()) if k not in RUNTIME_OPTIONS},
+    }
+    if (options or {}).get("tiered"):
+        # critères et marges du palier "cheap" : ils décident seuls du rejet
+        params["tiers"] = {
+            "cheap": ["MAX_RMS", "MAX_SATURATION_FRAMES"],
+            "margin": TIER_MARGIN,
+            "saturation_margin": TIER_SATURATION_MARGIN,
+        }
+    return params
+
+def resample(samples, orig_sr, target_sr):
+    """
+    Rééchantillonne un signal float32 mono sans passer par pydub.
+    """
+    if orig_sr == target_sr:
+        return samples.astype(np.float32, copy=False)
+    from scipy.signal import resample_poly
+    g = gcd(int(orig_sr), int(target_sr))
+    return resample_poly(samples, int(target_sr) // g, int(orig_sr) // g).astype(np.float32)
 
 class AudioProcessor:
-    def __init__(self, audio_path, verbose=True):
+    def __init__(self, audio_path, verbose=True, vad_model=None, in_memory=False,
+                 windowed_spectrum=False, keep_windows=False, export_cleaned=True, trace_memory=False,
+                 mmap=False, tiered=False, plots=False, vad_server=None):
+        # temps par étape (decode, pedalboard, normalize, resample, vad, fft, export)
+        self.timer = StageTimer(trace_memory)
         self.audio_path = audio_path
         self.cleaned_path = audio_path.replace(".wav", "_cleaned.wav")
-        self.original_audio = AudioSegment.from_wav(audio_path)
+        # in_memory : le fichier est décodé une seule fois en float32 et reste
+        # en numpy jusqu'à l'export du fichier nettoyé (pas de pydub ni de fichier temporaire)
+        # mmap : variante de in_memory où le WAV est projeté en mémoire (AudioBuffer)
+        # et converti par blocs ; une seule copie float32 mono est allouée par fichier
+        self.in_memory = in_memory or mmap
+        self.audio_buffer = None
         self.preprocessed_audio = None
-        self.val_model = load_silero_vad()
+        self.preprocessed_samples = None
+        self.vad_samples = None
+        if mmap:
+            self.original_audio = None
+            self.buffer = None
+            with self.timer.stage("decode"):
+                self.audio_buffer = AudioBuffer(audio_path)
+            self.sample_rate = self.audio_buffer.sample_rate
+            self.channels = self.audio_buffer.channels
+            duration_sec = self.audio_buffer.duration
+        elif in_memory:
+            from pedalboard.io import AudioFile
+            self.original_audio = None
+            with self.timer.stage("decode"), AudioFile(audio_path) as f:
+                self.buffer = f.read(f.frames)
+                self.sample_rate = int(f.samplerate)
+            self.channels = self.buffer.shape[0]
+            duration_sec = self.buffer.shape[1] / self.sample_rate
+        else:
+            from pydub import AudioSegment
+            with self.timer.stage("decode"):
+                self.original_audio = AudioSegment.from_wav(audio_path)
+            self.buffer = None
+            self.sample_rate = self.original_audio.frame_rate
+            self.channels = self.original_audio.channels
+            duration_sec = len(self.original_audio) / 1000
+        # modèle VAD partagé par thread, sauf si un modèle est injecté explicitement ;
+        # vad_server (URL du serveur de modèles) : le VAD est exécuté par le serveur
+        if vad_model is None and vad_server:
+            vad_model = get_remote_vad(vad_server)
+        self.val_model = vad_model if vad_model is not None else get_vad_model()
         self.should_reject = False
         self.rejection_reasons = []
+        # tiered : rejet dès qu'un palier suffit, les métriques des paliers suivants restent à 0
+        self.tiered = tiered
+        self.rejected_tier = None
 
         # metrics
         self.rms = 0
         self.saturation_count = 0
-        self.duration_sec = len(self.original_audio) / 1000
+        self.duration_sec = duration_sec
         self.dominant_freq = 0
         self.mean_freq = 0
         self.bandwidth = 0
@@ -48,24 +209,90 @@ class AudioProcessor:
         self.speech_ratio = 0
         self.signal_std = 0
         self.speech_segments = []
+        self.window_metrics = []
+
+        # windowed_spectrum : analyse spectrale par fenêtres (enregistrements longs) ;
+        # seule la FFT est bornée, le signal prétraité reste en mémoire pour le VAD et l'export
+        self.windowed_spectrum = windowed_spectrum
+        self.keep_windows = keep_windows
+        # export_cleaned=False : pas de _cleaned.wav, les segments de parole
+        # sont transmis en mémoire au Transcriber (speech_clips)
+        self.export_cleaned = export_cleaned
 
         self.verbose = verbose
         self.enhanced_samples = None
 
-        self.plot_id = str(uuid.uuid4())[:8]
+        # plots : données de la figure de diagnostic (enveloppe, spectre décimé) jointes
+        # aux métriques ; le rendu est fait ailleurs (PlotRenderer) pour ne pas ralentir l'analyse
+        self.plots = plots
+        self.plot_spectrum = None
+        self.plot_payload = None
+
+    def decimated_mono(self):
+        """
+        Signal brut mono décimé par pas (sans filtre) pour le palier "cheap" :
+        une vue du fichier projeté ou du buffer, seule la moyenne des canaux est copiée.
+        Retourne (échantillons, fréquence après décimation).
+        """
+        step = max(1, self.sample_rate // TIER_DECIMATION_RATE)
+        if self.audio_buffer is not None:
+            frames = self.audio_buffer.view()[::step]
+            samples = frames.mean(axis=1, dtype=np.float32)
+        elif self.buffer is not None:
+            samples = self.buffer[:, ::step].mean(axis=0, dtype=np.float32)
+        else:
+            audio = self.original_audio
+            raw = np.array(audio.get_array_of_samples()).reshape(-1, audio.channels)
+            samples = raw[::step].mean(axis=1, dtype=np.float32)
+        return samples, self.sample_rate / step
+
+    def check_cheap_rejection(self):
+        """
+        Palier "cheap" : RMS après normalisation, écart type et saturation estimés sur
+        le signal décimé, avant la chaîne Pedalboard. Le Compressor agit au-dessus d'un
+        seuil absolu : un enregistrement faible ou plat peut en sortir accepté, alors
+        qu'il ne fait que rapprocher le RMS du pic. Seuls un RMS trop élevé et la
+        saturation, que la chaîne aggrave, rejettent donc ici, avec une marge pour
+        l'énergie retirée par les filtres (TIER_MARGIN, TIER_SATURATION_MARGIN).
+        """
+        samples, sr = self.decimated_mono()
+        peak = float(np.max(np.abs(samples))) if len(samples) > 0 else 0.0
+        if peak > 0:
+            samples = samples / peak
+            rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64)))
+            self.rms = int(rms * 10 ** (-NORMALIZE_HEADROOM_DB / 20) * 32767)
+            self.signal_std = float(np.std(samples))
+            # nombre d'échantillons saturés ramené à la fréquence du VAD
+            self.saturation_count = int(np.count_nonzero(np.abs(samples) >= 0.95) * VAD_SAMPLE_RATE / sr)
+
+        reasons = []
+        if self.rms > MAX_RMS * TIER_MARGIN:
+            reasons.append(f"RMS trop élevé (estimé): {self.rms}")
+        if self.saturation_count > MAX_SATURATION_FRAMES * TIER_SATURATION_MARGIN:
+            reasons.append(f"Saturation excessive (estimée): {self.saturation_count}")
+
+        if reasons:
+            self.should_reject = True
+            self.rejection_reasons = reasons
+            self.rejected_tier = "cheap"
+            if self.verbose:
+                print(f"Audio rejeté (palier cheap) - Raisons: {', '.join(reasons)}")
+        return self.should_reject
 
     def preprocess(self):
-        with AudioFile(self.audio_path) as f:
+        if self.in_memory:
+            self.preprocess_in_memory()
+            return
+
+        from pedalboard.io import AudioFile
+        from pydub import AudioSegment, effects
+
+        with self.timer.stage("decode"), AudioFile(self.audio_path) as f:
             audio = f.read(f.frames) 
             sr = f.samplerate
 
-            board = Pedalboard([
-                HighpassFilter(cutoff_frequency_hz=100),
-                LowpassFilter(cutoff_frequency_hz=4000),
-                Compressor(threshold_db=-20, ratio=3.0),
-                NoiseGate(threshold_db=-45, ratio=3.0),
-                Reverb(room_size=0.1, damping=0.8, wet_level=0.05, dry_level=0.95),
-            ])
+        with self.timer.stage("pedalboard"):
+            board = build_board()
             effected = board(audio, sample_rate=sr)
 
         # Convertir les données audio en AudioSegment directement
@@ -77,37 +304,106 @@ class AudioProcessor:
         effected_clipped = np.clip(effected * 32767, -32767, 32767).astype(np.int16)
         
         # Créer un AudioSegment à partir des données
-        audio_segment = AudioSegment(
-            effected_clipped.tobytes(),
-            frame_rate=int(sr),
-            sample_width=2,  # 16-bit = 2 bytes
-            channels=1
-        )
-        
-        self.preprocessed_audio = effects.normalize(audio_segment, headroom=6.0)
+        with self.timer.stage("normalize"):
+            audio_segment = AudioSegment(
+                effected_clipped.tobytes(),
+                frame_rate=int(sr),
+                sample_width=2,  # 16-bit = 2 bytes
+                channels=1
+            )
 
-    def analyze_quality(self):
-        audio = self.preprocessed_audio
-        self.rms = audio.rms
+            self.preprocessed_audio = effects.normalize(audio_segment, headroom=NORMALIZE_HEADROOM_DB)
 
-        if self.original_audio.channels > 1:
-            audio = audio.set_channels(1) # conversion en mono
-            
-        audio = audio.set_frame_rate(16000)
-        samples = np.array(audio.get_array_of_samples()).astype(np.float32) # permet d'avoir et d'analyser la courbe du signal
+    def preprocess_in_memory(self):
+        if self.audio_buffer is not None:
+            self.preprocess_mapped()
+            return
+        with self.timer.stage("pedalboard"):
+            effected = build_board()(self.buffer, sample_rate=self.sample_rate)
+        self.buffer = None
+        with self.timer.stage("normalize"):
+            self.normalize_in_memory(effected)
 
-        if len(samples) > 0:
-            samples /= np.max(np.abs(samples)) if np.max(np.abs(samples)) > 0 else samples # on normalise le signal entre [-1, 1]
+    def preprocess_mapped(self):
+        """
+        Pedalboard appliqué bloc par bloc sur les vues du fichier projeté : l'état
+        des effets est conservé entre les blocs (reset=False), la sortie mono est
+        écrite dans un seul tableau préalloué.
+        """
+        audio = self.audio_buffer
+        mono = np.empty(audio.frames, dtype=np.float32)
+        with self.timer.stage("pedalboard"):
+            board = build_board()
+            for start, end, block in audio.iter_blocks():
+                effected = board(block, sample_rate=self.sample_rate, reset=start == 0)
+                if effected.shape[0] > 1:
+                    effected.mean(axis=0, out=mono[start:end])
+                else:
+                    mono[start:end] = effected[0]
+        audio.close()
+        self.audio_buffer = None
+        with self.timer.stage("normalize"):
+            self.normalize_in_memory(mono)
+
+    def normalize_in_memory(self, effected):
+        # conversion en mono puis même écrêtage que la conversion int16 du mode pydub
+        if effected.ndim > 1 and effected.shape[0] > 1:
+            mono = effected.mean(axis=0)
+        else:
+            mono = effected.reshape(-1)
+        np.clip(mono, -1.0, 1.0, out=mono)
 
-        max_sample = np.max(np.abs(samples))
-        sample_rate = audio.frame_rate
+        # équivalent de effects.normalize(headroom=6.0)
+        peak = np.max(np.abs(mono)) if len(mono) > 0 else 0
+        if peak > 0:
+            mono *= 10 ** (-NORMALIZE_HEADROOM_DB / 20) / peak
+
+        self.preprocessed_samples = mono.astype(np.float32, copy=False)
+
+    def analyze_quality(self):
+        if self.in_memory:
+            mono = self.preprocessed_samples
+            # même échelle que AudioSegment.rms (échantillons int16)
+            self.rms = int(np.sqrt(np.mean(np.square(mono, dtype=np.float64))) * 32767) if len(mono) > 0 else 0
+            with self.timer.stage("resample"):
+                samples = resample(mono, self.sample_rate, VAD_SAMPLE_RATE)
+            self.vad_samples = samples
+            sample_rate = VAD_SAMPLE_RATE
+        else:
+            audio = self.preprocessed_audio
+            self.rms = audio.rms
+
+            with self.timer.stage("resample"):
+                if self.channels > 1:
+                    audio = audio.set_channels(1) # conversion en mono
+
+                audio = audio.set_frame_rate(VAD_SAMPLE_RATE)
+                samples = np.array(audio.get_array_of_samples()).astype(np.float32) # permet d'avoir et d'analyser la courbe du signal
+            sample_rate = audio.frame_rate
+
+        # une seule valeur absolue : le seuil de saturation (95 % du pic) est le même
+        # avant et après normalisation
+        abs_samples = np.abs(samples)
+        max_sample = abs_samples.max() if len(samples) > 0 else 0
+        self.saturation_count = int(np.count_nonzero(abs_samples >= max_sample * 0.95))
+        del abs_samples
+
+        if max_sample > 0:
+            samples = samples / max_sample # on normalise le signal entre [-1, 1]
         # print(f"Sample rate: {sample_rate} Hz")
-        self.saturation_count = np.sum(np.abs(samples) >= max_sample * 0.95)
 
         self.analyze_speech_quality(samples, sample_rate)
-        self.analyze_frequency(samples, sample_rate)
+        # palier "vad" : toutes les métriques hors spectre sont définitives, la FFT est évitée
+        if self.tiered and self.check_rejection_criteria(spectral=False):
+            self.rejected_tier = "vad"
+        else:
+            with self.timer.stage("fft"):
+                self.analyze_frequency(samples, sample_rate)
+            if self.check_rejection_criteria():
+                self.rejected_tier = "full"
 
-        self.check_rejection_criteria()
+        if self.plots:
+            self.plot_payload = self.build_plot_payload(samples, sample_rate, self.plot_spectrum)
 
     def analyze_speech_quality(self, samples, sr):
         """
@@ -124,16 +420,21 @@ class AudioProcessor:
         
         """
         try:
-            tmp_path = self.audio_path.replace(".wav", "_noise_tmp.wav")
-            self.preprocessed_audio.export(tmp_path, format="wav")
-
-            wav = read_audio(tmp_path, sampling_rate=16000)
-            speech_segments = get_speech_timestamps(
-                wav, self.val_model, sampling_rate=16000,
-                threshold=0.3, min_speech_duration_ms=100
-            )
+            with self.timer.stage("vad"):
+                if hasattr(self.val_model, "speech_timestamps"):
+                    # RemoteBackend : même appel côté serveur, indices d'échantillons à 16 kHz
+                    wav = self.vad_samples if self.in_memory else self.load_vad_input().numpy()
+                    speech_segments = self.val_model.speech_timestamps(
+                        wav, threshold=VAD_THRESHOLD, min_speech_duration_ms=VAD_MIN_SPEECH_MS
+                    )
+                else:
+                    from silero_vad import get_speech_timestamps
 
-            os.remove(tmp_path)
+                    wav = self.load_vad_input()
+                    speech_segments = get_speech_timestamps(
+                        wav, self.val_model, sampling_rate=VAD_SAMPLE_RATE,
+                        threshold=VAD_THRESHOLD, min_speech_duration_ms=VAD_MIN_SPEECH_MS
+                    )
 
             # Calculer le ratio de parole
             total_speech_samples = sum(seg['end'] - seg['start'] for seg in speech_segments)
@@ -161,7 +462,30 @@ class AudioProcessor:
             self.speech_ratio = 0
             self.noise_level = 1.0
 
+    def load_vad_input(self):
+        """
+        Signal 16 kHz donné au VAD : directement depuis le buffer en mode in_memory,
+        sinon via un export/relecture d'un fichier temporaire.
+        """
+        if self.in_memory:
+            import torch
+            return torch.from_numpy(self.vad_samples)
+
+        from silero_vad import read_audio
+
+        tmp_path = self.audio_path.replace(".wav", "_noise_tmp.wav")
+        self.preprocessed_audio.export(tmp_path, format="wav")
+        wav = read_audio(tmp_path, sampling_rate=VAD_SAMPLE_RATE)
+        os.remove(tmp_path)
+        return wav
+
     def analyze_frequency(self, samples, sr):
+        if self.windowed_spectrum:
+            self.analyze_frequency_windowed(samples, sr)
+            return
+
+        from scipy.fft import rfft, rfftfreq
+
         samples = samples - np.mean(samples)
         n = len(samples)
         yf = np.abs(rfft(samples))/ n
@@ -185,10 +509,38 @@ class AudioProcessor:
             self.spectral_centroid = 0
             self.spectral_rolloff = 0
 
-        # self.save_plot(samples, sr, xf, yf)
+        if self.plots:
+            self.plot_spectrum = decimate_spectrum(xf, yf)
 
-    def check_rejection_criteria(self):
+    def analyze_frequency_windowed(self, samples, sr):
+        """
+        Spectre moyen par fenêtres (Welch) au lieu d'une FFT sur tout l'enregistrement :
+        la mémoire de la FFT reste bornée quelle que soit la durée. Le signal complet est
+        déjà en mémoire (VAD, bruit, segments de parole) ; pour une analyse spectrale en
+        flux depuis le disque, voir spectral_stream.analyze_file.
         """
+        from spectral_stream import StreamingSpectralAnalyzer, BLOCK_SECONDS
+
+        analyzer = StreamingSpectralAnalyzer(sample_rate=sr, keep_windows=self.keep_windows)
+        block = int(sr * BLOCK_SECONDS)
+        for start in range(0, len(samples), block):
+            analyzer.update(samples[start:start + block])
+        metrics = analyzer.finalize()
+
+        self.dominant_freq = metrics["dominant_freq"]
+        self.mean_freq = metrics["mean_freq"]
+        self.bandwidth = metrics["bandwidth"]
+        self.spectral_centroid = metrics["spectral_centroid"]
+        self.spectral_rolloff = metrics["spectral_rolloff"]
+        if self.keep_windows:
+            self.window_metrics = analyzer.window_metrics
+        if self.plots and analyzer.num_windows:
+            self.plot_spectrum = decimate_spectrum(analyzer.freqs, analyzer.magnitude_sum / analyzer.num_windows)
+
+    def check_rejection_criteria(self, spectral=True):
+        """
+        spectral=False : critères de centroïde et de rolloff ignorés (FFT pas encore faite).
+        Retourne should_reject.
         """
         self.should_reject = False
         self.rejection_reasons = []
@@ -212,7 +564,7 @@ class AudioProcessor:
             self.should_reject = True
             self.rejection_reasons.append(f"Bruit excessif: {self.noise_level:.2f}")
 
-        if not (MIN_SPECTRAL_CENTROID <= self.spectral_centroid <= MAX_SPECTRAL_CENTROID):
+        if spectral and not (MIN_SPECTRAL_CENTROID <= self.spectral_centroid <= MAX_SPECTRAL_CENTROID):
             self.should_reject = True
             self.rejection_reasons.append(f"Centroïde spectral hors limites: {self.spectral_centroid:.0f}Hz")
 
@@ -220,114 +572,130 @@ class AudioProcessor:
             self.should_reject = True
             self.rejection_reasons.append(f"Signal trop plat: {self.signal_std:.4f}")
         
-        if self.spectral_rolloff < MIN_SPECTRAL_ROLLOFF:
+        if spectral and self.spectral_rolloff < MIN_SPECTRAL_ROLLOFF:
             self.should_reject = True
             self.rejection_reasons.append(f"Faible articulation: {self.spectral_rolloff:.0f}")
 
         if self.verbose and self.should_reject:
             print(f"Audio rejeté - Raisons: {', '.join(self.rejection_reasons)}")
+        return self.should_reject
 
-    def save_plot(self, samples, sr, xf, yf):
+    def build_plot_payload(self, samples, sr, spectrum):
         base = os.path.splitext(os.path.basename(self.audio_path))[0]
+        return plot_payload(base, samples, sr, spectrum, {
+            "rms": int(self.rms),
+            "noise_level": float(self.noise_level),
+            "spectral_centroid": float(self.spectral_centroid),
+            "rejection_reasons": list(self.rejection_reasons),
+        })
 
-        with PLOT_LOCK:
-            fig = plt.figure(figsize=(12, 8))
-
-            try:
-                # Signal temporel
-                plt.subplot(2, 2, 1)
-                t = np.arange(len(samples)) / sr
-                plt.plot(t, samples, color='gray', alpha=0.7)
-                plt.title(f"{base} - Signal temporel")
-                plt.xlabel("Temps (s)")
-                plt.ylabel("Amplitude")
-
-                # Spectre fréquentiel
-                plt.subplot(2, 2, 2)
-                plt.plot(xf, yf, color='blue')
-                plt.axvline(self.spectral_centroid, color='red', linestyle='--', label=f'Centroïde: {self.spectral_centroid:.0f}Hz')
-                plt.title("Spectre fréquentiel")
-                plt.xlabel("Fréquence (Hz)")
-                plt.ylabel("Magnitude")
-                plt.legend()
-
-                # Métriques de qualité
-                plt.subplot(2, 2, 3)
-                metrics = [
-                    f"RMS: {self.rms}",
-                    f"Bruit: {self.noise_level:.2f}",
-                    f"Centroïde: {self.spectral_centroid:.0f}Hz"
-                ]
-                for i, metric in enumerate(metrics):
-                    plt.text(0.1, 0.9 - i*0.15, metric, transform=plt.gca().transAxes)
-                plt.title("Métriques de qualité")
-                plt.axis('off')
-
-                plt.tight_layout()
-                os.makedirs("plots", exist_ok=True)
-                temp_path = f"plots/{base}_{self.plot_id}.png"
-                final_path = f"plots/{base}.png"
-                
-                plt.savefig(temp_path, dpi=150, bbox_inches='tight')
-                
-                # Renommer le fichier temporaire vers le nom final
-                if os.path.exists(temp_path):
-                    if os.path.exists(final_path):
-                        os.remove(final_path)
-                    os.rename(temp_path, final_path)
-                
-            finally:
-                # Nettoyer la figure pour éviter les fuites mémoire
-                plt.close(fig)
-                plt.clf()  # Clear current figure
-                plt.cla()  # Clear current axes
+    def save_plot(self, samples, sr, xf, yf):
+        """
+        Rendu immédiat de la figure (débogage) ; en production, passer plots=True
+        et confier les payloads à un PlotRenderer.
+        """
+        return render_plot(self.build_plot_payload(samples, sr, decimate_spectrum(xf, yf)))
 
     def apply_vad(self):
         speech_segments = self.speech_segments
 
-        cleaned = AudioSegment.empty()
+        if self.in_memory:
+            self.apply_vad_in_memory()
+            return
+
+        # concaténation des octets en une fois (les += successifs recopient tout le segment)
+        chunks = []
         for seg in speech_segments:
-            start_ms = seg['start'] * 1000 // 16000
-            end_ms = seg['end'] * 1000 // 16000
+            start_ms = seg['start'] * 1000 // VAD_SAMPLE_RATE
+            end_ms = seg['end'] * 1000 // VAD_SAMPLE_RATE
             if (end_ms - start_ms) >= 100:
-                cleaned += self.preprocessed_audio[start_ms:end_ms]
-            
+                chunks.append(self.preprocessed_audio[start_ms:end_ms].raw_data)
+
+        cleaned = self.preprocessed_audio._spawn(b"".join(chunks))
         cleaned.export(self.cleaned_path, format="wav")
 
-    def log_to_csv(self, output_csv="data/audio_quality_log.csv"):
-        file_exists = os.path.isfile(output_csv)
-        with open(output_csv, mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow([
-                    "file", "duration", "rms", "saturation_count", 
-                    # "dominant_freq", "mean_freq", "bandwidth", 
-                    "speech_ratio", "noise_level", "spectral_centroid", 
-                    "spectral_rolloff", "signal_std",
-                    "rejected", "rejection_reasons"
-                ])
-
-            writer.writerow([
-                os.path.basename(self.audio_path),
-                round(self.duration_sec, 2),
-                self.rms,
-                self.saturation_count,
-                # round(self.dominant_freq, 2),
-                # round(self.mean_freq, 2),
-                # round(self.bandwidth, 2),
-                round(self.speech_ratio, 3),
-                round(self.noise_level, 3),
-                round(self.spectral_centroid, 2),
-                round(self.spectral_rolloff, 2),
-                round(self.signal_std, 3),
-                self.should_reject,
-                "; ".join(self.rejection_reasons) if self.rejection_reasons else ""
-            ])
-
-    def process(self):
-        self.preprocess()
-        self.analyze_quality()
-        if not self.should_reject:
-            self.apply_vad()
-        self.log_to_csv()
-        return not self.should_reject
\ No newline at end of file
+    def apply_vad_in_memory(self):
+        from pedalboard.io import AudioFile
+
+        sr = self.sample_rate
+        # chaque segment est écrit depuis une vue de preprocessed_samples, sans concaténation
+        with AudioFile(self.cleaned_path, "w", samplerate=sr, num_channels=1, bit_depth=16) as f:
+            for seg in self.speech_segments:
+                start_ms = seg['start'] * 1000 // VAD_SAMPLE_RATE
+                end_ms = seg['end'] * 1000 // VAD_SAMPLE_RATE
+                if (end_ms - start_ms) >= 100:
+                    f.write(self.preprocessed_samples[start_ms * sr // 1000:end_ms * sr // 1000].reshape(1, -1))
+
+    def speech_clips(self, min_duration_ms=100):
+        """
+        Segments de parole en mémoire (float32 mono 16 kHz) avec leurs temps dans
+        l'enregistrement d'origine, pour une transcription sans _cleaned.wav.
+        """
+        if self.in_memory:
+            wav = self.vad_samples
+        else:
+            audio = self.preprocessed_audio.set_channels(1).set_frame_rate(VAD_SAMPLE_RATE)
+            wav = np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+
+        clips = []
+        for seg in self.speech_segments:
+            if (seg['end'] - seg['start']) * 1000 // VAD_SAMPLE_RATE < min_duration_ms:
+                continue
+            clips.append({
+                "start": seg['start'] / VAD_SAMPLE_RATE,
+                "end": seg['end'] / VAD_SAMPLE_RATE,
+                "audio": wav[seg['start']:seg['end']],
+            })
+        return clips
+
+    def metrics(self):
+        """
+        Enregistrement compact des métriques (dict picklable, sans les buffers audio).
+        """
+        record = {
+            "file": os.path.basename(self.audio_path),
+            "audio_path": self.audio_path,
+            "cleaned_path": None if self.should_reject or not self.export_cleaned else self.cleaned_path,
+            "duration": float(self.duration_sec),
+            "rms": int(self.rms),
+            "saturation_count": int(self.saturation_count),
+            "dominant_freq": float(self.dominant_freq),
+            "mean_freq": float(self.mean_freq),
+            "bandwidth": float(self.bandwidth),
+            "speech_ratio": float(self.speech_ratio),
+            "noise_level": float(self.noise_level),
+            "spectral_centroid": float(self.spectral_centroid),
+            "spectral_rolloff": float(self.spectral_rolloff),
+            "signal_std": float(self.signal_std),
+            "rejected": bool(self.should_reject),
+            "rejection_reasons": list(self.rejection_reasons),
+            "rejected_tier": self.rejected_tier,
+            "timings": dict(self.timer.timings),
+            "peak_memory": self.timer.peak_memory,
+        }
+        if self.plot_payload is not None:
+            record["plot"] = self.plot_payload
+        return record
+
+    def log_to_csv(self, output_csv=QUALITY_CSV):
+        log_records_to_csv([self.metrics()], output_csv)
+
+    def process(self, log=True):
+        if self.tiered:
+            with self.timer.stage("tier_cheap"):
+                self.check_cheap_rejection()
+        if self.rejected_tier == "cheap":
+            if self.audio_buffer is not None:
+                self.audio_buffer.close()
+                self.audio_buffer = None
+            self.buffer = None
+        else:
+            self.preprocess()
+            self.analyze_quality()
+        if not self.should_reject and self.export_cleaned:
+            with self.timer.stage("export"):
+                self.apply_vad()
+        self.timer.stop()
+        if log:
+            self.log_to_csv()
+        return not self.should_reject
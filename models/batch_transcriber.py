@@ -0,0 +1,107 @@
+import time
+from collections import defaultdict
+
+from transcriber import Transcriber
+from transcription_backends import MAX_CLIP_SECONDS
+
+DURATION_BUCKETS = [5, 10, 20, MAX_CLIP_SECONDS]  # bornes supérieures en secondes
+BATCH_SIZE = 16
+
+
+def clip_duration(audio_path):
+    from pedalboard.io import AudioFile
+
+    with AudioFile(audio_path) as f:
+        return f.frames / f.samplerate
+
+
+def bucket_by_duration(audio_paths, buckets=DURATION_BUCKETS):
+    """
+    Regroupe les clips par tranche de durée (les clips d'un même lot sont paddés
+    à 30 s par Whisper : des durées proches limitent le calcul perdu).
+    Les clips plus longs que la dernière tranche (ou illisibles) sont renvoyés à part.
+    """
+    grouped = defaultdict(list)
+    too_long = []
+    for audio_path in audio_paths:
+        try:
+            duration = clip_duration(audio_path)
+        except Exception:
+            too_long.append(audio_path)  # illisible : l'erreur sera rapportée par la transcription seule
+            continue
+        for limit in buckets:
+            if duration <= limit:
+                grouped[limit].append(audio_path)
+                break
+        else:
+            too_long.append(audio_path)
+    return grouped, too_long
+
+
+def transcribe_batched(audio_paths, backend, batch_size=BATCH_SIZE, cache=None, decode_options=None, verbose=True, sink=None):
+    """
+    Transcrit des clips courts par lots puis écrit les sorties habituelles de
+    Transcriber (save_transcript / save_csv) pour chaque fichier.
+    Retourne la liste des Transcriber traités.
+    """
+    transcribers = [
+        Transcriber(path, backend=backend, decode_options=decode_options, cache=cache, verbose=False, sink=sink)
+        for path in audio_paths
+    ]
+    # les transcriptions déjà en cache ne passent pas par le modèle
+    pending = [t for t in transcribers if not t.load_from_cache()]
+    tag = getattr(backend, "batch_cache_tag", None) if pending else None
+    if tag:
+        # décodage par lot différent du décodage classique : clé de cache distincte
+        for transcriber in pending:
+            transcriber.cache_options = dict(transcriber.decode_options, batch=tag)
+        pending = [t for t in pending if not t.load_from_cache()]
+    by_path = {t.audio_path: t for t in pending}
+
+    def transcribe_each(paths):
+        # transcription classique, complète : rangée sous la clé sans mode lot ;
+        # les deux clés ont déjà été consultées plus haut
+        for path in paths:
+            transcriber = by_path[path]
+            transcriber.cache_options = transcriber.decode_options
+            try:
+                transcriber.run_transcription(check_cache=False)
+            except Exception as e:
+                print(f"Erreur lors de la transcription de ({path}) : {e}")
+                by_path.pop(path)
+
+    grouped, too_long = bucket_by_duration(list(by_path))
+    for limit in sorted(grouped):
+        paths = grouped[limit]
+        for start in range(0, len(paths), batch_size):
+            batch = paths[start:start + batch_size]
+            if verbose:
+                print(f"Lot de {len(batch)} clips (<= {limit}s) en cours de transcription...")
+            start_time = time.perf_counter()
+            try:
+                audios = [backend.load_audio(path) for path in batch]
+                results = backend.transcribe_batch(audios, **(decode_options or {}))
+            except Exception as e:
+                # un clip illisible ou un lot en échec : repli fichier par fichier
+                print(f"Erreur sur un lot de {len(batch)} clips ({e}) : transcription clip par clip.")
+                transcribe_each(batch)
+                continue
+            # temps du lot réparti entre ses clips
+            per_clip = (time.perf_counter() - start_time) / len(batch)
+            for path, result in zip(batch, results):
+                try:
+                    by_path[path].timer.timings["transcribe"] = per_clip
+                    by_path[path].apply_result(result)
+                except Exception as e:
+                    print(f"Erreur lors de la transcription de ({path}) : {e}")
+                    by_path.pop(path)
+
+    # clips trop longs pour un lot : transcription classique
+    transcribe_each(too_long)
+
+    done = [t for t in transcribers if t.from_cache or t.audio_path in by_path]
+    for transcriber in done:
+        transcriber.save_results()
+    if verbose:
+        print(f"{len(done)} / {len(audio_paths)} clips transcrits ({len(audio_paths) - len(pending)} depuis le cache).")
+    return done
@@ -0,0 +1,230 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from synthetic_corpus import CORPUS_DIR, MANIFEST_NAME, generate_corpus
+
+BASELINE_PATH = "data/bench/baseline.json"
+RESULTS_PATH = "data/bench/latest.json"
+NUM_FILES = 24
+NUM_WORKERS = 4  # fixe : les résultats restent comparables d'une machine à l'autre
+REGRESSION_THRESHOLD = 0.15  # 15 % de dégradation tolérée
+# métrique -> sens favorable ; p99 trop bruité sur un petit corpus pour servir de garde-fou
+COMPARED_METRICS = {"files_per_s": "higher", "p50_ms": "lower", "p95_ms": "lower", "peak_rss_mb": "lower"}
+QUALITY_STAGES = ["quality_in_memory", "quality_mmap", "quality_tiered", "quality_pydub", "quality_threads", "quality_processes"]
+TRANSCRIPTION_STAGES = ["transcription", "full_pipeline"]
+
+
+def load_manifest(corpus_dir):
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)["files"]
+
+
+def latency_stats(latencies):
+    ms = np.asarray(latencies) * 1000
+    if len(ms) == 0:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    return {f"p{p}_ms": float(np.percentile(ms, p)) for p in (50, 95, 99)}
+
+
+def peak_rss_mb():
+    # ru_maxrss en Ko sous Linux, en octets sous macOS ; enfants compris (pools de processus)
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale / (1024 * 1024)
+
+
+def bench_quality_sequential(paths, **options):
+    from audio_processor import AudioProcessor
+    from vad_pool import get_vad_model
+
+    get_vad_model()  # chargement du VAD hors mesure
+    latencies, stages = [], {}
+    for path in paths:
+        start = time.perf_counter()
+        processor = AudioProcessor(path, verbose=False, **options)
+        processor.process(log=False)
+        latencies.append(time.perf_counter() - start)
+        for stage, seconds in processor.timer.timings.items():
+            stages.setdefault(stage, []).append(seconds)
+    return latencies, {stage: latency_stats(values)["p50_ms"] for stage, values in stages.items()}
+
+
+def bench_quality_parallel(paths, mode, workers):
+    from pipeline import iter_quality_records, processor_options
+
+    options = processor_options(in_memory=True)
+    records = [r for r in iter_quality_records(paths, mode, workers, options=options) if r is not None]
+    return [r["processing_s"] for r in records], {}
+
+
+def bench_transcription(paths, backend_name, model_name):
+    from audio_processor import AudioProcessor
+    from transcriber import Transcriber
+    from pipeline import build_backend
+
+    backend = build_backend(backend_name, model_name, lazy=False)
+    accepted = []
+    for path in paths:
+        processor = AudioProcessor(path, verbose=False, in_memory=True)
+        if processor.process(log=False):
+            accepted.append(processor.cleaned_path)
+
+    latencies = []
+    for path in accepted:
+        start = time.perf_counter()
+        Transcriber(path, backend=backend, verbose=False).run_transcription()
+        latencies.append(time.perf_counter() - start)
+    return latencies, {}
+
+
+def bench_full_pipeline(paths, backend_name, model_name, workers):
+    from pipeline import build_backend, parse_args, processor_options, run_sequential_stages
+    from metrics_store import MetricsStore
+
+    backend = build_backend(backend_name, model_name, lazy=False)
+    args = parse_args(["--workers", str(workers), "--no-cache", "--no-transcript-cache"])
+    sink = MetricsStore("data/bench/metrics.db")
+    start = time.perf_counter()
+    try:
+        run_sequential_stages(paths, backend, args, processor_options(in_memory=True), sink=sink)
+    finally:
+        sink.close()
+    # pas de latence par fichier pour l'ensemble : une seule mesure de bout en bout
+    return [time.perf_counter() - start], {}
+
+
+def run_stage(stage, paths, workers, backend_name, model_name):
+    """
+    Exécuté dans un processus neuf : le pic RSS mesuré est celui de l'étape seule.
+    """
+    start = time.perf_counter()
+    if stage == "quality_in_memory":
+        latencies, stages = bench_quality_sequential(paths, in_memory=True)
+    elif stage == "quality_mmap":
+        latencies, stages = bench_quality_sequential(paths, mmap=True)
+    elif stage == "quality_tiered":
+        latencies, stages = bench_quality_sequential(paths, mmap=True, tiered=True)
+    elif stage == "quality_pydub":
+        latencies, stages = bench_quality_sequential(paths)
+    elif stage == "quality_threads":
+        latencies, stages = bench_quality_parallel(paths, "thread", workers)
+    elif stage == "quality_processes":
+        latencies, stages = bench_quality_parallel(paths, "process", workers)
+    elif stage == "transcription":
+        latencies, stages = bench_transcription(paths, backend_name, model_name)
+    elif stage == "full_pipeline":
+        latencies, stages = bench_full_pipeline(paths, backend_name, model_name, workers)
+    else:
+        raise ValueError(f"Étape inconnue : {stage}")
+    wall = time.perf_counter() - start
+    return {"wall_s": wall, "latencies": latencies, "stages": stages, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_suite(corpus_dir=CORPUS_DIR, n_files=NUM_FILES, seed=0, workers=NUM_WORKERS, stages=QUALITY_STAGES,
+              backend_name="faster-whisper", model_name="tiny"):
+    paths = generate_corpus(corpus_dir, n_files, seed)
+    audio_s = sum(spec["duration"] for spec in load_manifest(corpus_dir))
+    ctx = multiprocessing.get_context("spawn")
+
+    results = {
+        "meta": {
+            "files": len(paths), "audio_s": audio_s, "seed": seed, "workers": workers,
+            "python": platform.python_version(), "machine": platform.machine(),
+            "cpu_count": os.cpu_count(), "created_at": time.time(),
+        },
+        "stages": {},
+    }
+    for stage in stages:
+        print(f"[{stage}] en cours...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            raw = executor.submit(run_stage, stage, paths, workers, backend_name, model_name).result()
+        entry = {
+            "wall_s": raw["wall_s"],
+            "files_per_s": len(paths) / raw["wall_s"] if raw["wall_s"] > 0 else 0.0,
+            "audio_s_per_s": audio_s / raw["wall_s"] if raw["wall_s"] > 0 else 0.0,
+            "peak_rss_mb": raw["peak_rss_mb"],
+        }
+        entry.update(latency_stats(raw["latencies"]))
+        if raw["stages"]:
+            entry["stage_p50_ms"] = raw["stages"]
+        results["stages"][stage] = entry
+        print(f"[{stage}] {entry['files_per_s']:.2f} fichiers/s, x{entry['audio_s_per_s']:.1f} temps réel, "
+              f"p50 {entry['p50_ms']:.0f} ms, p95 {entry['p95_ms']:.0f} ms, RSS {entry['peak_rss_mb']:.0f} Mo")
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Liste des régressions (étape, métrique, référence, mesure, écart relatif)
+    au-delà du seuil, pour les étapes présentes dans les deux résultats.
+    """
+    if baseline["meta"]["files"] != results["meta"]["files"] or baseline["meta"]["seed"] != results["meta"]["seed"]:
+        raise ValueError("Corpus différent de celui de la référence (nombre de fichiers ou graine).")
+
+    regressions = []
+    for stage, entry in results["stages"].items():
+        reference = baseline["stages"].get(stage)
+        if reference is None:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            expected, actual = reference.get(metric, 0), entry.get(metric, 0)
+            if expected <= 0:
+                continue
+            change = (actual - expected) / expected
+            worse = -change if direction == "higher" else change
+            if worse > threshold:
+                regressions.append((stage, metric, expected, actual, worse))
+    return regressions
+
+
+def save_json(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+# script principal : exécution du banc d'essai et comparaison à la référence
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc d'essai reproductible sur corpus synthétique")
+    parser.add_argument("--corpus-dir", default=CORPUS_DIR)
+    parser.add_argument("--files", type=int, default=NUM_FILES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    parser.add_argument("--stages", nargs="+", default=QUALITY_STAGES,
+                        choices=QUALITY_STAGES + TRANSCRIPTION_STAGES)
+    parser.add_argument("--backend", default="faster-whisper", help="étapes de transcription")
+    parser.add_argument("--model", default="tiny", help="modèle déjà présent en local")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre ces résultats comme référence")
+    args = parser.parse_args()
+
+    results = run_suite(args.corpus_dir, args.files, args.seed, args.workers, args.stages, args.backend, args.model)
+    save_json(results, args.output)
+    print(f"Résultats : {args.output}")
+
+    if args.save_baseline:
+        save_json(results, args.baseline)
+        print(f"Référence enregistrée : {args.baseline}")
+    elif os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for stage, metric, expected, actual, worse in regressions:
+            print(f"RÉGRESSION [{stage}] {metric} : {expected:.2f} -> {actual:.2f} ({worse:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"Aucune régression au-delà de {args.threshold:.0%} par rapport à {args.baseline}.")
+    else:
+        print(f"Pas de référence ({args.baseline}) : relancer avec --save-baseline pour en créer une.")
@@ -0,0 +1,294 @@
+import argparse
+import os
+import sys
+import time
+
+from silero_vad import load_silero_vad
+from pedalboard.io import AudioFile
+from audio_processor import AudioProcessor
+from vad_pool import get_vad_model, reset_vad_model
+from transcription_backends import load_backend, DEFAULT_MODEL
+from batch_transcriber import bucket_by_duration, BATCH_SIZE
+from startup_profile import check_budget, ENTRY_POINTS, IMPORT_BUDGET_S
+
+AUDIO_DIR = "data/audio/hospital"
+
+# tolérances (absolue, relative) entre le mode pydub et les modes en mémoire (in_memory, mmap)
+METRIC_TOLERANCES = {
+    "duration_sec": (0.01, 0.0),
+    "rms": (0, 0.02),
+    "speech_ratio": (0.05, 0.0),
+    "noise_level": (0.02, 0.1),
+    "signal_std": (0.005, 0.05),
+    "spectral_centroid": (0, 0.05),
+    "spectral_rolloff": (0, 0.05),
+    "saturation_count": (5, 0.1),
+}
+
+
+def list_wavs(audio_dir):
+    return sorted(
+        os.path.join(audio_dir, f)
+        for f in os.listdir(audio_dir)
+        if f.endswith(".wav") and not f.endswith("_cleaned.wav")
+    )
+
+
+def bench_vad_setup(audio_dir=AUDIO_DIR):
+    """
+    Compare le coût d'initialisation d'un AudioProcessor par fichier :
+    chargement du VAD à chaque fichier (avant) contre modèle partagé (après).
+    """
+    audio_files = list_wavs(audio_dir)
+    if not audio_files:
+        print(f"Aucun fichier audio dans {audio_dir}.")
+        return None
+
+    # avant : un load_silero_vad() par fichier
+    before = []
+    for audio_path in audio_files:
+        start = time.perf_counter()
+        AudioProcessor(audio_path, verbose=False, vad_model=load_silero_vad())
+        before.append(time.perf_counter() - start)
+
+    # après : modèle chargé une fois par thread puis réutilisé
+    reset_vad_model()
+    after = []
+    for audio_path in audio_files:
+        start = time.perf_counter()
+        AudioProcessor(audio_path, verbose=False, vad_model=get_vad_model())
+        after.append(time.perf_counter() - start)
+
+    n = len(audio_files)
+    print(f"{n} fichiers dans {audio_dir}")
+    print(f"Avant  : {sum(before):.3f}s au total, {1000 * sum(before) / n:.1f} ms/fichier")
+    print(f"Après  : {sum(after):.3f}s au total, {1000 * sum(after) / n:.1f} ms/fichier")
+    if sum(after) > 0:
+        print(f"Gain   : x{sum(before) / sum(after):.1f}")
+    return {"files": n, "before_s": sum(before), "after_s": sum(after)}
+
+
+# modes de lecture comparés au mode pydub (référence)
+MODE_OPTIONS = {"pydub": {}, "in_memory": {"in_memory": True}, "mmap": {"mmap": True}}
+
+
+def compare_modes(audio_path, trace_memory=False):
+    """
+    Traite un fichier dans chaque mode de MODE_OPTIONS. Retourne (écarts au mode
+    pydub hors METRIC_TOLERANCES ou sur should_reject, processeurs, temps par mode).
+    """
+    timings = {}
+    processors = {}
+    for name, options in MODE_OPTIONS.items():
+        start = time.perf_counter()
+        processor = AudioProcessor(audio_path, verbose=False, trace_memory=trace_memory, **options)
+        processor.preprocess()
+        processor.analyze_quality()
+        processor.timer.stop()
+        timings[name] = time.perf_counter() - start
+        processors[name] = processor
+
+    mismatches = []
+    ref = processors["pydub"]
+    for variant in MODE_OPTIONS:
+        if variant == "pydub":
+            continue
+        new = processors[variant]
+        for name, (atol, rtol) in METRIC_TOLERANCES.items():
+            expected, actual = float(getattr(ref, name)), float(getattr(new, name))
+            if abs(actual - expected) > atol + rtol * abs(expected):
+                mismatches.append((audio_path, f"{variant}.{name}", expected, actual))
+        if ref.should_reject != new.should_reject:
+            mismatches.append((audio_path, f"{variant}.should_reject", ref.should_reject, new.should_reject))
+    return mismatches, processors, timings
+
+
+def check_in_memory(audio_dir=AUDIO_DIR):
+    """
+    Vérifie que les modes in_memory et mmap donnent les mêmes métriques que le
+    mode pydub, aux tolérances de METRIC_TOLERANCES près, et affiche le pic
+    mémoire de chaque mode. Retourne la liste des écarts.
+    """
+    mismatches = []
+    for audio_path in list_wavs(audio_dir):
+        found, processors, timings = compare_modes(audio_path, trace_memory=True)
+        mismatches.extend(found)
+        print(f"{os.path.basename(audio_path)} : " + ", ".join(
+            f"{name} {timings[name]:.3f}s / {processors[name].timer.peak_memory / (1024 * 1024):.1f} Mo"
+            for name in MODE_OPTIONS
+        ))
+
+    for audio_path, name, expected, actual in mismatches:
+        print(f"ÉCART {os.path.basename(audio_path)} {name} : {expected} != {actual}")
+    if not mismatches:
+        print("Métriques identiques aux tolérances près.")
+    return mismatches
+
+
+def check_tiered(audio_dir=AUDIO_DIR):
+    """
+    Compare l'évaluation par paliers à l'évaluation complète : un fichier accepté
+    par l'évaluation complète ne doit jamais être rejeté par un palier.
+    Retourne la liste des rejets à tort.
+    """
+    false_rejects = []
+    totals = {False: 0.0, True: 0.0}
+    tiers = {}
+    for audio_path in list_wavs(audio_dir):
+        results = {}
+        for tiered in (False, True):
+            start = time.perf_counter()
+            processor = AudioProcessor(audio_path, verbose=False, in_memory=True, tiered=tiered,
+                                       export_cleaned=False)
+            results[tiered] = processor.process(log=False), processor.rejected_tier
+            totals[tiered] += time.perf_counter() - start
+
+        (full_ok, _), (tiered_ok, tier) = results[False], results[True]
+        tiers[tier] = tiers.get(tier, 0) + 1
+        if full_ok and not tiered_ok:
+            false_rejects.append((audio_path, tier))
+        elif tiered_ok != full_ok:
+            print(f"Incohérent {os.path.basename(audio_path)} : complet {full_ok}, paliers {tiered_ok}")
+
+    print(f"Complet : {totals[False]:.2f}s, par paliers : {totals[True]:.2f}s")
+    print("Rejets par palier : " + ", ".join(f"{tier} {n}" for tier, n in tiers.items() if tier is not None))
+    for audio_path, tier in false_rejects:
+        print(f"REJET À TORT {os.path.basename(audio_path)} (palier {tier})")
+    if not false_rejects:
+        print("Aucun fichier accepté n'est rejeté par un palier.")
+    return false_rejects
+
+
+def audio_duration(audio_path):
+    with AudioFile(audio_path) as f:
+        return f.frames / f.samplerate
+
+
+def list_cleaned_wavs(audio_dir):
+    return sorted(
+        os.path.join(audio_dir, f)
+        for f in os.listdir(audio_dir)
+        if f.endswith("_cleaned.wav")
+    )
+
+
+def bench_backends(audio_dir=AUDIO_DIR, model_name=DEFAULT_MODEL, compute_types=("int8",), cpu_threads=0, limit=None):
+    """
+    Real-time factor (temps de calcul / durée audio) des backends de transcription sur CPU.
+    """
+    audio_files = list_cleaned_wavs(audio_dir)[:limit]
+    if not audio_files:
+        print(f"Aucun fichier _cleaned.wav dans {audio_dir}.")
+        return None
+    total_audio = sum(audio_duration(path) for path in audio_files)
+
+    configs = [("whisper", {"device": "cpu"})]
+    configs += [("faster-whisper", {"device": "cpu", "compute_type": ct, "cpu_threads": cpu_threads})
+                for ct in compute_types]
+
+    results = {}
+    for name, kwargs in configs:
+        start = time.perf_counter()
+        backend = load_backend(name, model_name, **kwargs)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for audio_path in audio_files:
+            backend.transcribe(audio_path)
+        elapsed = time.perf_counter() - start
+
+        label = backend.cache_name
+        results[label] = {"load_s": load_time, "elapsed_s": elapsed, "rtf": elapsed / total_audio}
+        print(f"{label:40s} chargement {load_time:6.1f}s  transcription {elapsed:7.1f}s  RTF {elapsed / total_audio:.3f}")
+        del backend
+
+    print(f"{len(audio_files)} fichiers, {total_audio:.1f}s d'audio")
+    return results
+
+
+def bench_batch(audio_dir=AUDIO_DIR, backend_name="whisper", model_name=DEFAULT_MODEL, batch_size=BATCH_SIZE, device=None, limit=None):
+    """
+    Débit (clips/s) de la transcription clip par clip contre la transcription par lots,
+    sur les clips nettoyés de moins de 30 s. Aucun fichier de sortie n'est écrit.
+    """
+    grouped, _ = bucket_by_duration(list_cleaned_wavs(audio_dir)[:limit])
+    if not grouped:
+        print(f"Aucun clip court dans {audio_dir}.")
+        return None
+
+    kwargs = {"device": device} if device else {}
+    backend = load_backend(backend_name, model_name, **kwargs)
+    buckets = {limit: [backend.load_audio(path) for path in paths] for limit, paths in grouped.items()}
+    n = sum(len(audios) for audios in buckets.values())
+    total_audio = sum(len(audio) for audios in buckets.values() for audio in audios) / 16000
+
+    start = time.perf_counter()
+    for audios in buckets.values():
+        for audio in audios:
+            backend.transcribe(audio)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for audios in buckets.values():
+        for i in range(0, len(audios), batch_size):
+            backend.transcribe_batch(audios[i:i + batch_size])
+    batched = time.perf_counter() - start
+
+    print(f"{n} clips, {total_audio:.1f}s d'audio ({backend.cache_name})")
+    print(f"Séquentiel  : {sequential:7.1f}s  {n / sequential:.2f} clips/s  RTF {sequential / total_audio:.3f}")
+    print(f"Lots de {batch_size:<3d} : {batched:7.1f}s  {n / batched:.2f} clips/s  RTF {batched / total_audio:.3f}")
+    print(f"Gain        : x{sequential / batched:.2f}")
+    return {"clips": n, "sequential_s": sequential, "batched_s": batched}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline audio")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_vad = sub.add_parser("vad", help="coût d'initialisation du VAD par fichier")
+    p_vad.add_argument("--audio-dir", default=AUDIO_DIR)
+
+    p_mem = sub.add_parser("in-memory", help="compare les métriques pydub / in_memory / mmap")
+    p_mem.add_argument("--audio-dir", default=AUDIO_DIR)
+
+    p_tier = sub.add_parser("tiered", help="rejet par paliers contre évaluation complète")
+    p_tier.add_argument("--audio-dir", default=AUDIO_DIR)
+
+    p_back = sub.add_parser("backends", help="RTF des backends de transcription sur CPU")
+    p_back.add_argument("--audio-dir", default=AUDIO_DIR)
+    p_back.add_argument("--model", default=DEFAULT_MODEL)
+    p_back.add_argument("--compute-types", nargs="+", default=["int8"])
+    p_back.add_argument("--cpu-threads", type=int, default=0)
+    p_back.add_argument("--limit", type=int, default=None, help="nombre maximal de fichiers")
+
+    p_batch = sub.add_parser("batch", help="débit séquentiel contre transcription par lots")
+    p_batch.add_argument("--audio-dir", default=AUDIO_DIR)
+    p_batch.add_argument("--backend", default="whisper")
+    p_batch.add_argument("--model", default=DEFAULT_MODEL)
+    p_batch.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    p_batch.add_argument("--device", default=None)
+    p_batch.add_argument("--limit", type=int, default=None, help="nombre maximal de fichiers")
+
+    p_start = sub.add_parser("startup", help="budget de temps d'import des points d'entrée")
+    p_start.add_argument("--budget", type=float, default=IMPORT_BUDGET_S, help="secondes par import")
+
+    args = parser.parse_args(argv)
+    if args.bench == "vad":
+        bench_vad_setup(args.audio_dir)
+    elif args.bench == "in-memory":
+        if check_in_memory(args.audio_dir):
+            sys.exit(1)
+    elif args.bench == "tiered":
+        if check_tiered(args.audio_dir):
+            sys.exit(1)
+    elif args.bench == "backends":
+        bench_backends(args.audio_dir, args.model, args.compute_types, args.cpu_threads, args.limit)
+    elif args.bench == "batch":
+        bench_batch(args.audio_dir, args.backend, args.model, args.batch_size, args.device, args.limit)
+    elif args.bench == "startup":
+        if not check_budget(ENTRY_POINTS, args.budget):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
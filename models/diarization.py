@@ -0,0 +1,225 @@
+import argparse
+import os
+import threading
+import time
+import numpy as np
+
+from embedding_cache import EmbeddingCache, segment_hash
+from profiling import StageTimer
+
+EMBEDDING_MODEL = "speechbrain/spkrec-ecapa-voxceleb"
+EMBEDDING_DIR = "pretrained_models/spkrec-ecapa-voxceleb"
+SAMPLE_RATE = 16000  # segments VAD d'AudioProcessor (speech_clips)
+WINDOW_SECONDS = 1.5  # un embedding par fenêtre : un segment VAD peut contenir plusieurs locuteurs
+MIN_WINDOW_SECONDS = 0.5  # en dessous, pas d'embedding fiable : locuteur de la fenêtre la plus proche
+EMBEDDING_BATCH_SIZE = 32
+DISTANCE_THRESHOLD = 0.7  # distance cosinus maximale entre deux groupes d'un même locuteur
+AUDIO_DIR = "data/audio/hospital"
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def get_encoder():
+    """
+    Modèle ECAPA de speechbrain sur CPU, chargé au premier appel et partagé par
+    tous les threads (l'inférence ne garde pas d'état entre deux lots).
+    """
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            from speechbrain.inference.speaker import EncoderClassifier
+            _encoder = EncoderClassifier.from_hparams(
+                source=EMBEDDING_MODEL, savedir=EMBEDDING_DIR, run_opts={"device": "cpu"}
+            )
+        return _encoder
+
+
+def split_windows(clips, window_s=WINDOW_SECONDS, min_s=MIN_WINDOW_SECONDS, sample_rate=SAMPLE_RATE):
+    """
+    Découpe les segments de parole en fenêtres (vues, pas de copie) ; un reste plus
+    court que min_s est rattaché à la fenêtre précédente du même segment.
+    """
+    window = int(window_s * sample_rate)
+    minimum = int(min_s * sample_rate)
+    windows = []
+    for clip in clips:
+        audio = clip["audio"]
+        bounds = list(range(0, len(audio), window)) + [len(audio)]
+        if len(bounds) > 2 and bounds[-1] - bounds[-2] < minimum:
+            del bounds[-2]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            windows.append({
+                "start": clip["start"] + start / sample_rate,
+                "end": clip["start"] + end / sample_rate,
+                "audio": audio[start:end],
+            })
+    return windows
+
+
+class Diarizer:
+    """
+    Diarisation à partir des segments VAD d'AudioProcessor : embeddings de locuteur
+    par fenêtre (par lots, sur CPU, mis en cache par hash de fenêtre), regroupement
+    hiérarchique, puis tours de parole étiquetés SPEAKER_00, SPEAKER_01...
+    """
+
+    def __init__(self, encoder=None, cache=None, batch_size=EMBEDDING_BATCH_SIZE,
+                 threshold=DISTANCE_THRESHOLD, num_speakers=None):
+        self.encoder = encoder
+        self.cache = cache
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.num_speakers = num_speakers
+        self.timer = StageTimer()
+        self.audio_s = 0.0
+        self.processing_s = 0.0
+
+    @property
+    def rtf(self):
+        """
+        Facteur temps réel cumulé : temps de calcul / durée d'audio traitée.
+        """
+        return self.processing_s / self.audio_s if self.audio_s else 0.0
+
+    def embed(self, windows):
+        """
+        Embeddings normalisés (n, d) : lecture du cache puis calcul des fenêtres
+        manquantes, triées par longueur pour limiter le padding d'un lot.
+        """
+        keys = [segment_hash(w["audio"], SAMPLE_RATE, EMBEDDING_MODEL) for w in windows]
+        embeddings = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        missing = sorted((i for i, e in enumerate(embeddings) if e is None), key=lambda i: len(windows[i]["audio"]))
+        if missing:
+            import torch
+
+            encoder = self.encoder or get_encoder()
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                longest = max(len(windows[i]["audio"]) for i in batch)
+                wavs = torch.zeros(len(batch), longest)
+                lengths = torch.zeros(len(batch))
+                for row, i in enumerate(batch):
+                    audio = windows[i]["audio"]
+                    wavs[row, :len(audio)] = torch.from_numpy(np.asarray(audio, dtype=np.float32))
+                    lengths[row] = len(audio) / longest
+                with torch.inference_mode():
+                    vectors = encoder.encode_batch(wavs, lengths).squeeze(1).numpy()
+                for row, i in enumerate(batch):
+                    embeddings[i] = vectors[row]
+                    if self.cache is not None:
+                        self.cache.put(keys[i], vectors[row])
+
+        matrix = np.vstack(embeddings).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-8)
+
+    def cluster(self, embeddings):
+        """
+        Étiquettes entières, numérotées dans l'ordre de première apparition.
+        """
+        if len(embeddings) < 2:
+            return np.zeros(len(embeddings), dtype=int)
+        from sklearn.cluster import AgglomerativeClustering
+
+        if self.num_speakers:
+            model = AgglomerativeClustering(n_clusters=min(self.num_speakers, len(embeddings)),
+                                            metric="cosine", linkage="average")
+        else:
+            model = AgglomerativeClustering(n_clusters=None, distance_threshold=self.threshold,
+                                            metric="cosine", linkage="average")
+        labels = model.fit_predict(embeddings)
+        order = {}
+        for label in labels:
+            order.setdefault(label, len(order))
+        return np.array([order[label] for label in labels])
+
+    def diarize(self, clips, duration=None):
+        """
+        clips : AudioProcessor.speech_clips() (temps dans l'enregistrement d'origine).
+        Retourne les tours de parole [{"start", "end", "speaker"}] triés par début.
+        duration : durée de l'enregistrement pour le RTF (défaut : fin du dernier segment).
+        """
+        start_time = time.perf_counter()
+        windows = split_windows(clips)
+        usable = [w for w in windows if w["end"] - w["start"] >= MIN_WINDOW_SECONDS]
+        labels = np.zeros(0, dtype=int)
+        if usable:
+            with self.timer.stage("embed"):
+                embeddings = self.embed(usable)
+            with self.timer.stage("cluster"):
+                labels = self.cluster(embeddings)
+
+        for w, label in zip(usable, labels):
+            w["speaker"] = f"SPEAKER_{label:02d}"
+        # fenêtres trop courtes : locuteur de la fenêtre utilisable la plus proche
+        for w in windows:
+            if "speaker" not in w:
+                nearest = min(usable, key=lambda u: abs(u["start"] - w["start"]), default=None)
+                w["speaker"] = nearest["speaker"] if nearest is not None else "SPEAKER_00"
+
+        turns = []
+        for w in sorted(windows, key=lambda w: w["start"]):
+            if turns and turns[-1]["speaker"] == w["speaker"]:
+                turns[-1]["end"] = w["end"]
+            else:
+                turns.append({"start": w["start"], "end": w["end"], "speaker": w["speaker"]})
+
+        self.processing_s += time.perf_counter() - start_time
+        self.audio_s += duration if duration is not None else (clips[-1]["end"] if clips else 0.0)
+        return turns
+
+
+def assign_speakers(segments, turns):
+    """
+    Ajoute "speaker" à chaque segment de Transcriber : le tour de parole qui le
+    recouvre le plus, sinon le plus proche. Les segments sont modifiés sur place.
+    """
+    for seg in segments:
+        best, best_overlap = None, 0.0
+        for turn in turns:
+            overlap = min(seg["end"], turn["end"]) - max(seg["start"], turn["start"])
+            if overlap > best_overlap:
+                best, best_overlap = turn, overlap
+        if best is None and turns:
+            middle = (seg["start"] + seg["end"]) / 2
+            best = min(turns, key=lambda t: min(abs(middle - t["start"]), abs(middle - t["end"])))
+        if best is not None:
+            seg["speaker"] = best["speaker"]
+    return segments
+
+
+# script principal : diarisation d'un dossier et mesure du facteur temps réel
+if __name__ == "__main__":
+    from audio_processor import AudioProcessor
+
+    parser = argparse.ArgumentParser(description="Diarisation des segments VAD et RTF sur CPU")
+    parser.add_argument("audio_dir", nargs="?", default=AUDIO_DIR)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--threshold", type=float, default=DISTANCE_THRESHOLD)
+    parser.add_argument("--speakers", type=int, default=None, help="nombre de locuteurs s'il est connu")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="désactive le cache des embeddings")
+    args = parser.parse_args()
+
+    cache = EmbeddingCache() if args.cache else None
+    diarizer = Diarizer(cache=cache, batch_size=args.batch_size, threshold=args.threshold,
+                        num_speakers=args.speakers)
+    get_encoder()  # chargement du modèle hors mesure
+    try:
+        for f in sorted(os.listdir(args.audio_dir)):
+            if not f.endswith(".wav") or f.endswith("_cleaned.wav"):
+                continue
+            processor = AudioProcessor(os.path.join(args.audio_dir, f), verbose=False, in_memory=True,
+                                       export_cleaned=False)
+            processor.process(log=False)
+            before_s, before_audio = diarizer.processing_s, diarizer.audio_s
+            turns = diarizer.diarize(processor.speech_clips(), duration=processor.duration_sec)
+            rtf = (diarizer.processing_s - before_s) / max(diarizer.audio_s - before_audio, 1e-9)
+            speakers = sorted({turn["speaker"] for turn in turns})
+            print(f"{f} : {len(speakers)} locuteur(s), {len(turns)} tours, RTF {rtf:.3f}")
+    finally:
+        if cache is not None:
+            cache.report()
+            cache.close()
+    print(f"RTF global : {diarizer.rtf:.3f} ({diarizer.audio_s:.0f}s d'audio, "
+          f"embed {diarizer.timer.timings.get('embed', 0):.1f}s, cluster {diarizer.timer.timings.get('cluster', 0):.1f}s)")
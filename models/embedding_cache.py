@@ -0,0 +1,52 @@
+import hashlib
+import threading
+import diskcache
+import numpy as np
+
+CACHE_DIR = "data/cache/embeddings"
+CACHE_SIZE_LIMIT = 256 * 1024 ** 2  # 256 Mo, éviction LRU au-delà
+CACHE_VERSION = 1
+
+
+def segment_hash(samples, sample_rate, model_name):
+    """
+    Hash d'un segment de parole (échantillons float32) pour un modèle d'embedding donné.
+    """
+    h = hashlib.sha256(f"{CACHE_VERSION}:{model_name}:{sample_rate}:".encode("utf-8"))
+    h.update(np.ascontiguousarray(samples, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache persistant des embeddings de locuteur (diskcache), indexé par hash du
+    segment : un enregistrement retraité ne repasse pas par le modèle.
+    """
+
+    def __init__(self, directory=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT):
+        self.directory = directory
+        self.cache = diskcache.Cache(directory, size_limit=size_limit, eviction_policy="least-recently-used")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        embedding = self.cache.get(key)
+        with self._lock:
+            if embedding is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return embedding
+
+    def put(self, key, embedding):
+        self.cache.set(key, np.asarray(embedding, dtype=np.float32))
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        print(f"Cache embeddings : {self.hits} hits, {self.misses} miss ({rate:.0f}% de hits), "
+              f"{len(self.cache)} entrées ({self.directory})")
+
+    def close(self):
+        self.cache.close()
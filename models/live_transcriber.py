@@ -0,0 +1,109 @@
+import time
+import numpy as np
+
+from audio_processor import VAD_SAMPLE_RATE, VAD_THRESHOLD, VAD_MIN_SPEECH_MS
+from transcription_backends import MAX_CLIP_SECONDS
+
+VAD_WINDOW = 512  # taille de fenêtre attendue par Silero VAD à 16 kHz
+MIN_SILENCE_MS = 500  # silence qui clôt un énoncé
+SPEECH_PAD_MS = 100
+MAX_UTTERANCE_SECONDS = MAX_CLIP_SECONDS  # énoncé coupé au-delà : latence bornée
+
+
+class LiveSegmenter:
+    """
+    Découpe un flux audio (float32 mono 16 kHz, reçu par morceaux) en énoncés avec
+    Silero VAD, mêmes seuils que AudioProcessor. Seul l'énoncé en cours est gardé
+    en mémoire.
+    """
+
+    def __init__(self, vad_model=None, threshold=VAD_THRESHOLD, min_silence_ms=MIN_SILENCE_MS,
+                 min_speech_ms=VAD_MIN_SPEECH_MS, max_utterance_s=MAX_UTTERANCE_SECONDS):
+        from silero_vad import VADIterator, load_silero_vad
+
+        # modèle propre à la session : VADIterator garde un état entre deux fenêtres,
+        # le modèle ne peut donc pas venir de vad_pool (partagé par thread)
+        self.iterator = VADIterator(
+            vad_model or load_silero_vad(), threshold=threshold, sampling_rate=VAD_SAMPLE_RATE,
+            min_silence_duration_ms=min_silence_ms, speech_pad_ms=SPEECH_PAD_MS,
+        )
+        self.min_speech = min_speech_ms * VAD_SAMPLE_RATE // 1000
+        self.max_utterance = int(max_utterance_s * VAD_SAMPLE_RATE)
+        self.pad = SPEECH_PAD_MS * VAD_SAMPLE_RATE // 1000
+        self.pending = np.zeros(0, dtype=np.float32)  # reste < une fenêtre
+        self.audio = np.zeros(0, dtype=np.float32)  # tampon glissant
+        self.base = 0  # indice absolu du premier échantillon de self.audio
+        self.position = 0  # échantillons passés au VAD
+        self.speech_start = None
+
+    def feed(self, samples):
+        """
+        Ajoute des échantillons ; retourne les énoncés terminés
+        ({"start", "end"} en secondes depuis le début du flux, "audio").
+        """
+        import torch
+
+        samples = np.concatenate([self.pending, np.asarray(samples, dtype=np.float32)])
+        n_windows = len(samples) // VAD_WINDOW
+        self.pending = samples[n_windows * VAD_WINDOW:]
+        self.audio = np.concatenate([self.audio, samples[:n_windows * VAD_WINDOW]])
+
+        utterances = []
+        for i in range(n_windows):
+            window = samples[i * VAD_WINDOW:(i + 1) * VAD_WINDOW]
+            self.position += VAD_WINDOW
+            event = self.iterator(torch.from_numpy(window))
+            if event and "start" in event:
+                self.speech_start = max(event["start"], self.base)
+            elif event and "end" in event and self.speech_start is not None:
+                utterances.append(self._cut(min(event["end"], self.position)))
+                self.speech_start = None
+            elif self.speech_start is not None and self.position - self.speech_start >= self.max_utterance:
+                # parole continue trop longue : on coupe sans attendre le silence
+                utterances.append(self._cut(self.position))
+                self.speech_start = self.position
+
+        self._trim()
+        return [u for u in utterances if len(u["audio"]) >= self.min_speech]
+
+    def flush(self):
+        """
+        Fin du flux : retourne l'énoncé en cours s'il y en a un.
+        """
+        utterances = []
+        if self.speech_start is not None and self.position - self.speech_start >= self.min_speech:
+            utterances.append(self._cut(self.position))
+        self.speech_start = None
+        self.iterator.reset_states()
+        return utterances
+
+    def _cut(self, end):
+        start = self.speech_start
+        return {
+            "start": start / VAD_SAMPLE_RATE,
+            "end": end / VAD_SAMPLE_RATE,
+            "audio": self.audio[start - self.base:end - self.base].copy(),
+        }
+
+    def _trim(self):
+        # hors parole, on ne garde que la marge précédant un éventuel début d'énoncé
+        keep_from = self.speech_start if self.speech_start is not None else self.position - self.pad
+        keep_from = max(keep_from, self.base)
+        self.audio = self.audio[keep_from - self.base:]
+        self.base = keep_from
+
+
+def transcribe_utterance(backend, utterance, language="fr"):
+    """
+    Transcrit un énoncé ; temps des segments replacés dans le flux.
+    """
+    start = time.perf_counter()
+    result = backend.transcribe(utterance["audio"], language=language)
+    text = " ".join(seg["text"].strip() for seg in result["segments"])
+    return {
+        "type": "utterance",
+        "start": utterance["start"],
+        "end": utterance["end"],
+        "text": text,
+        "transcription_ms": (time.perf_counter() - start) * 1000,
+    }
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from audio_processor import QUALITY_CSV, QUALITY_CSV_HEADER, TIER_SKIPPED_METRICS, quality_csv_row
+from transcriber import TRANSCRIPT_CSV, TRANSCRIPT_CSV_HEADER, transcript_csv_row
+
+DB_PATH = "data/metrics.db"
+FLUSH_SIZE = 200  # enregistrements en mémoire avant écriture groupée
+FLUSH_INTERVAL = 5.0  # secondes
+
+QUALITY_COLUMNS = [
+    "file", "duration", "rms", "saturation_count", "dominant_freq", "mean_freq",
+    "bandwidth", "speech_ratio", "noise_level", "spectral_centroid",
+    "spectral_rolloff", "signal_std", "rejected", "rejection_reasons", "rejected_tier",
+]
+TRANSCRIPT_COLUMNS = ["file", "avg_logprob", "rejected", "language"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quality (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    file TEXT NOT NULL,
+    duration REAL, rms INTEGER, saturation_count INTEGER,
+    dominant_freq REAL, mean_freq REAL, bandwidth REAL,
+    speech_ratio REAL, noise_level REAL, spectral_centroid REAL,
+    spectral_rolloff REAL, signal_std REAL,
+    rejected INTEGER, rejection_reasons TEXT, rejected_tier TEXT
+);
+CREATE INDEX IF NOT EXISTS quality_file ON quality(file);
+CREATE INDEX IF NOT EXISTS quality_run ON quality(run_id);
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    file TEXT NOT NULL,
+    avg_logprob REAL, rejected INTEGER, language TEXT
+);
+CREATE INDEX IF NOT EXISTS transcripts_file ON transcripts(file);
+CREATE INDEX IF NOT EXISTS transcripts_run ON transcripts(run_id);
+"""
+
+
+class MetricsStore:
+    """
+    Stockage SQLite (mode WAL) des métriques qualité et transcription.
+    Les enregistrements sont mis en tampon et écrits par lots, depuis
+    n'importe quel thread ; plusieurs processus peuvent écrire dans la même base.
+    """
+
+    def __init__(self, path=DB_PATH, run_id=None, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffers = {"quality": [], "transcripts": []}
+        self._last_flush = time.monotonic()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # bases créées avant la colonne rejected_tier (NULL : évaluation complète)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(quality)")}
+        if "rejected_tier" not in columns:
+            self.conn.execute("ALTER TABLE quality ADD COLUMN rejected_tier TEXT")
+
+    def add_quality(self, records):
+        """
+        records : un dict ou une liste de dicts produits par AudioProcessor.metrics().
+        Les métriques qu'un palier de rejet n'a pas mesurées sont écrites NULL.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        rows = []
+        for record in records:
+            skipped = TIER_SKIPPED_METRICS.get(record.get("rejected_tier"), ())
+            rows.append([
+                None if c in skipped
+                else json.dumps(record[c], ensure_ascii=False) if c == "rejection_reasons"
+                else record.get(c)
+                for c in QUALITY_COLUMNS
+            ])
+        self._add("quality", rows)
+
+    def add_transcript(self, record):
+        self._add("transcripts", [[record.get(c) for c in TRANSCRIPT_COLUMNS]])
+
+    def _add(self, table, rows):
+        with self._lock:
+            self._buffers[table].extend(rows)
+            pending = sum(len(b) for b in self._buffers.values())
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if pending >= self.flush_size or due:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        now = time.time()
+        with self.conn:  # une transaction par lot
+            for table, columns in (("quality", QUALITY_COLUMNS), ("transcripts", TRANSCRIPT_COLUMNS)):
+                rows = self._buffers[table]
+                if not rows:
+                    continue
+                names = ", ".join(["run_id", "created_at"] + columns)
+                marks = ", ".join("?" * (len(columns) + 2))
+                self.conn.executemany(
+                    f"INSERT INTO {table} ({names}) VALUES ({marks})",
+                    [[self.run_id, now] + row for row in rows],
+                )
+                self._buffers[table] = []
+        self._last_flush = time.monotonic()
+
+    def _select(self, table, columns, where="", params=()):
+        self.flush()
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY id", params)
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def quality_records(self, run_id=None, file=None):
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if file is not None:
+            clauses.append("file = ?")
+            params.append(file)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        records = self._select("quality", ["run_id", "created_at"] + QUALITY_COLUMNS, where, params)
+        for record in records:
+            record["rejected"] = bool(record["rejected"])
+            record["rejection_reasons"] = json.loads(record["rejection_reasons"] or "[]")
+        return records
+
+    def transcript_records(self, run_id=None, file=None):
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if file is not None:
+            clauses.append("file = ?")
+            params.append(file)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        records = self._select("transcripts", ["run_id", "created_at"] + TRANSCRIPT_COLUMNS, where, params)
+        for record in records:
+            record["rejected"] = bool(record["rejected"])
+        return records
+
+    def query_file(self, file):
+        """
+        Historique d'un fichier (nom de base) dans les deux tables.
+        """
+        return {
+            "quality": self.quality_records(file=file),
+            "transcripts": self.transcript_records(file=file),
+        }
+
+    def export_csv(self, run_id=None, quality_csv=QUALITY_CSV, transcript_csv=TRANSCRIPT_CSV):
+        """
+        Réécrit les CSV au format historique (par défaut : exécution courante).
+        """
+        run_id = run_id or self.run_id
+        for output_csv, header, row_fn, records in (
+            (quality_csv, QUALITY_CSV_HEADER, quality_csv_row, self.quality_records(run_id)),
+            (transcript_csv, TRANSCRIPT_CSV_HEADER, transcript_csv_row, self.transcript_records(run_id)),
+        ):
+            if not records:
+                continue
+            with open(output_csv, mode="w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(row_fn(record) for record in records)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+# script principal : interrogation de la base et export CSV
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interrogation de la base de métriques")
+    parser.add_argument("--db", default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_file = sub.add_parser("file", help="historique d'un fichier")
+    p_file.add_argument("name")
+    p_export = sub.add_parser("export", help="export CSV au format historique")
+    p_export.add_argument("run_id")
+    p_export.add_argument("--quality-csv", default=QUALITY_CSV)
+    p_export.add_argument("--transcript-csv", default=TRANSCRIPT_CSV)
+    args = parser.parse_args()
+
+    store = MetricsStore(args.db)
+    try:
+        if args.command == "file":
+            print(json.dumps(store.query_file(args.name), indent=2, ensure_ascii=False))
+        elif args.command == "export":
+            store.export_csv(args.run_id, args.quality_csv, args.transcript_csv)
+    finally:
+        store.close()
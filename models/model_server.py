@@ -0,0 +1,270 @@
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+HOST = "127.0.0.1"
+PORT = 8765
+SERVER_URL = f"http://{HOST}:{PORT}"
+LATENCY_WINDOW = 500  # dernières requêtes gardées pour les percentiles
+REQUEST_TIMEOUT = 600  # secondes, une transcription longue peut prendre plusieurs minutes
+SAMPLE_RATE = 16000
+
+
+class LatencyStats:
+    """
+    Latence par type de requête (fenêtre glissante) et profondeur de file.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.errors = {}
+        self.waiting = 0
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.waiting += 1
+
+    def begin(self):
+        with self._lock:
+            self.waiting -= 1
+            self.active += 1
+
+    def end(self, endpoint, seconds, ok=True):
+        with self._lock:
+            self.active -= 1
+            self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, samples in self.samples.items():
+                ms = np.asarray(samples) * 1000
+                endpoints[endpoint] = {
+                    "count": self.counts[endpoint],
+                    "errors": self.errors.get(endpoint, 0),
+                    "mean_ms": float(ms.mean()),
+                    "p50_ms": float(np.percentile(ms, 50)),
+                    "p95_ms": float(np.percentile(ms, 95)),
+                    "last_ms": float(ms[-1]),
+                }
+            return {"queue_depth": self.waiting, "active": self.active, "endpoints": endpoints}
+
+
+class ModelServer:
+    """
+    Modèles Whisper et Silero VAD chargés une fois et partagés par tous les clients
+    (pipeline, Transcriber, application FastAPI). Les requêtes sont sérialisées par
+    modèle : un seul décodage à la fois, les autres attendent dans la file.
+    """
+
+    def __init__(self, backend, vad_model=None):
+        self.backend = backend
+        self.vad_model = vad_model
+        self.stats = LatencyStats()
+        self.started_at = time.time()
+        self._transcribe_lock = threading.Lock()
+        self._vad_lock = threading.Lock()
+
+    def info(self):
+        return {
+            "model": self.backend.cache_name,
+            "device": str(self.backend.device),
+            "uptime_s": time.time() - self.started_at,
+        }
+
+    def run(self, endpoint, lock, fn, *args, **kwargs):
+        self.stats.enter()
+        with lock:
+            self.stats.begin()
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                self.stats.end(endpoint, time.perf_counter() - start, ok)
+
+    def transcribe(self, audio, options):
+        return self.run("transcribe", self._transcribe_lock, self.backend.transcribe, audio, **options)
+
+    def vad(self, audio, options):
+        return self.run("vad", self._vad_lock, self._speech_timestamps, audio, options)
+
+    def _speech_timestamps(self, audio, options):
+        """
+        Segments de parole en indices d'échantillons à 16 kHz, comme get_speech_timestamps
+        appelé localement (audio : chemin de fichier ou signal float32 16 kHz).
+        """
+        import torch
+        from silero_vad import read_audio, get_speech_timestamps
+
+        if self.vad_model is None:
+            from vad_pool import get_vad_model
+            self.vad_model = get_vad_model()
+        if isinstance(audio, str):
+            wav = read_audio(audio, sampling_rate=SAMPLE_RATE)
+        else:
+            wav = torch.from_numpy(np.array(audio, dtype=np.float32))  # copie : le tampon reçu est en lecture seule
+        return get_speech_timestamps(wav, self.vad_model, sampling_rate=SAMPLE_RATE, **options)
+
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, payload, status=200):
+            body = json.dumps(payload, ensure_ascii=False, default=float).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self.send_json(server.info())
+            elif self.path == "/stats":
+                self.send_json(dict(server.stats.snapshot(), **server.info()))
+            else:
+                self.send_json({"error": f"Route inconnue : {self.path}"}, 404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            try:
+                if self.path not in ("/transcribe", "/vad"):
+                    self.send_json({"error": f"Route inconnue : {self.path}"}, 404)
+                    return
+                # signal float32 16 kHz brut (options en en-tête) ou chemin de fichier en JSON
+                if self.headers.get("Content-Type") == "application/octet-stream":
+                    audio = np.frombuffer(body, dtype=np.float32)
+                    options = json.loads(self.headers.get("X-Options", "{}"))
+                else:
+                    payload = json.loads(body)
+                    audio, options = payload["audio_path"], payload.get("options", {})
+                if self.path == "/transcribe":
+                    self.send_json(server.transcribe(audio, options))
+                else:
+                    self.send_json({"speech_timestamps": server.vad(audio, options)})
+            except Exception as e:
+                self.send_json({"error": str(e)}, 500)
+
+    return Handler
+
+
+def serve(backend, host=HOST, port=PORT, vad_model=None):
+    server = ModelServer(backend, vad_model)
+    httpd = ThreadingHTTPServer((host, port), make_handler(server))
+    print(f"Serveur de modèles ({backend.cache_name}) à l'écoute sur http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+class RemoteBackend:
+    """
+    Client du serveur de modèles, avec la même interface que les backends locaux
+    (transcribe, transcribe_batch, cache_name) : utilisable tel quel par Transcriber.
+    """
+    name = "remote"
+
+    def __init__(self, url=SERVER_URL, timeout=REQUEST_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        info = self._request("/health", timeout=5)
+        # même nom que le backend du serveur : les entrées du cache de transcriptions sont partagées
+        self.cache_name = info["model"]
+        self.device = info["device"]
+
+    def _request(self, path, data=None, headers=None, timeout=None):
+        request = urllib.request.Request(self.url + path, data=data, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(json.loads(e.read()).get("error", str(e))) from None
+
+    def _post_json(self, path, payload):
+        return self._request(path, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+    def _post_audio(self, path, audio, options):
+        if isinstance(audio, str):
+            return self._post_json(path, {"audio_path": audio, "options": options})
+        return self._request(
+            path, np.asarray(audio, dtype=np.float32).tobytes(),
+            {"Content-Type": "application/octet-stream", "X-Options": json.dumps(options)},
+        )
+
+    def transcribe(self, audio, **options):
+        return self._post_audio("/transcribe", audio, options)
+
+    def transcribe_batch(self, audios, **options):
+        return [self.transcribe(audio, **options) for audio in audios]
+
+    def load_audio(self, audio_path):
+        from silero_vad import read_audio
+        return read_audio(audio_path, sampling_rate=SAMPLE_RATE).numpy()
+
+    def speech_timestamps(self, audio, **options):
+        """
+        get_speech_timestamps exécuté par le serveur : [{"start", "end"}] en indices
+        d'échantillons à 16 kHz (audio : chemin de fichier ou signal float32 16 kHz).
+        """
+        return self._post_audio("/vad", audio, options)["speech_timestamps"]
+
+    def stats(self):
+        return self._request("/stats", timeout=5)
+
+
+def connect(url=SERVER_URL):
+    """
+    RemoteBackend si le serveur répond, None sinon (le client charge alors son propre modèle).
+    """
+    try:
+        return RemoteBackend(url)
+    except (OSError, ValueError):
+        return None
+
+
+# script principal : lancement du serveur ou lecture de ses statistiques
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur local gardant Whisper et Silero VAD en mémoire")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="lance le serveur")
+    p_serve.add_argument("--host", default=HOST)
+    p_serve.add_argument("--port", type=int, default=PORT)
+    p_serve.add_argument("--backend", default="whisper")
+    p_serve.add_argument("--model", default="large-v3-turbo")
+    p_serve.add_argument("--device", default=None)
+    p_serve.add_argument("--compute-type", default="int8")
+    p_serve.add_argument("--cpu-threads", type=int, default=0)
+    p_stats = sub.add_parser("stats", help="profondeur de file et latences")
+    p_stats.add_argument("--url", default=SERVER_URL)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from pipeline import build_backend
+        from vad_pool import get_vad_model
+        backend = build_backend(args.backend, args.model, args.device, args.compute_type, args.cpu_threads, lazy=False)
+        serve(backend, args.host, args.port, vad_model=get_vad_model())
+    else:
+        print(json.dumps(RemoteBackend(args.url).stats(), indent=2, ensure_ascii=False))
@@ -1,92 +1,497 @@
 import os
-import whisper
+import argparse
+import multiprocessing
+import queue
+import threading
+import time
 from functools import partial
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from audio_processor import AudioProcessor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from audio_processor import AudioProcessor, log_records_to_csv
 from transcriber import Transcriber
 from file_cleaner import FileCleaner
+from vad_pool import get_vad_model
+from quality_cache import QualityCache, CACHE_DIR, CACHE_SIZE_LIMIT
+from transcript_cache import TranscriptCache
+from transcription_backends import load_backend, LazyBackend, BACKENDS
+from batch_transcriber import transcribe_batched
+from stage_stats import StageStats, TierStats
+from plot_renderer import PlotRenderer, RENDER_WORKERS
+from metrics_store import MetricsStore, DB_PATH
+from model_server import RemoteBackend
+from profiling import Profiler, REPORT_PATH
 
 from threading import current_thread
 
 NUM_THREADS_AUDIO = 4
 NUM_TRHEADS_TRANSCRIPTION = 1
+IN_MEMORY_AUDIO = False  # décodage unique en numpy, sans pydub ni fichier temporaire
+MMAP_AUDIO = False  # WAV projeté en mémoire (numpy.memmap), vues en lecture seule, une copie float32
+TIERED_REJECTION = False  # rejet par paliers : métriques estimées d'abord, Pedalboard/VAD/FFT ensuite
+PLOTS = False  # figures de diagnostic rendues en arrière-plan (PlotRenderer)
+WINDOWED_SPECTRUM = False  # spectre par fenêtres : seule la FFT est bornée, le signal reste chargé en entier
+EXECUTION_MODE = "thread"  # "thread" ou "process" pour l'étape qualité
+NUM_PROCESSES_AUDIO = os.cpu_count() or 1
+PROCESS_CHUNKSIZE = 4  # nombre de fichiers envoyés à un worker par tâche
+USE_QUALITY_CACHE = True
+USE_TRANSCRIPT_CACHE = True
+WHISPER_MODEL = "large-v3-turbo"
+TRANSCRIPTION_BACKEND = "whisper"  # "whisper" ou "faster-whisper"
+COMPUTE_TYPE = "int8"  # faster-whisper : int8, int8_float16, float16, float32
+CPU_THREADS = 0  # faster-whisper : 0 = valeur par défaut de CTranslate2
+TRANSCRIPTION_BATCH_SIZE = 0  # > 0 : transcription par lots de clips courts
+STREAMING = False  # transcription lancée dès qu'un fichier passe le filtre qualité
+QUEUE_SIZE = 8  # fichiers acceptés en attente de transcription (contre-pression)
+IN_FLIGHT_FACTOR = 2  # tâches qualité soumises en avance par worker
+SEGMENTS_IN_MEMORY = False  # transcription des segments VAD en mémoire, sans _cleaned.wav
+DECODE_OPTIONS = {}  # options passées à model.transcribe (font partie de la clé du cache)
 AUDIO_DIR = "data/audio/hospital"
 TRANSCRIPT_DIR = "data/transcript"
 SECOND_TRANSCRIPT_DIR = "data/transcript/REJECTED"
 CSV_DIR = "data"
 
+_worker_options = {}
+# temps par étape de tous les fichiers traités par ce processus (workers compris, via les métriques)
+profiler = Profiler()
+# fichiers éliminés par palier quand le rejet par paliers est actif
+tier_stats = TierStats()
+# rendu des figures de diagnostic, créé par main() avec --plots
+plot_renderer = None
+
+def processor_options(in_memory=IN_MEMORY_AUDIO, windowed_spectrum=WINDOWED_SPECTRUM,
+                      segments_in_memory=SEGMENTS_IN_MEMORY, trace_memory=False, mmap=MMAP_AUDIO,
+                      tiered=TIERED_REJECTION, plots=PLOTS, vad_server=None):
+    """
+    Options transmises à AudioProcessor par les workers (threads ou processus).
+    """
+    options = {
+        "in_memory": in_memory,
+        "windowed_spectrum": windowed_spectrum,
+        "export_cleaned": not segments_in_memory,
+    }
+    if trace_memory:
+        options["trace_memory"] = True
+    if mmap:
+        options["mmap"] = True
+    if tiered:
+        options["tiered"] = True
+    if plots:
+        options["plots"] = True
+    if vad_server:
+        options["vad_server"] = vad_server
+    return options
+
 def clean():
     # Nettoyage des audio & transcriptions
     for directory in [AUDIO_DIR, TRANSCRIPT_DIR, SECOND_TRANSCRIPT_DIR, CSV_DIR]:
         cleaner = FileCleaner(directory)
         cleaner.remove_files()
 
-def process_audio_pipeline(audio_path):
-    cleaned_audio = []
+def process_audio_pipeline(audio_path, options=None):
+    """
+    Traite un fichier et renvoie ses métriques (None en cas d'erreur).
+    L'écriture du CSV est faite par le processus principal.
+    """
     try:
         thread_name = current_thread().name
         print(f"\n[{thread_name}] : Traitement de la qualité audio de {audio_path}")
 
-        processor = AudioProcessor(audio_path)
-        if not processor.process():
+        start = time.perf_counter()
+        processor = AudioProcessor(audio_path, **(options or processor_options()))
+        if not processor.process(log=False):
             print(f"[{thread_name}] : Audio rejeté (qualité) pour {audio_path}")
-            return
         else:
-            cleaned_audio.append(processor.cleaned_path)
-
-        print(f"[{thread_name}] : Qualité audio traité avec succès ({audio_path}).")
-        return cleaned_audio
+            print(f"[{thread_name}] : Qualité audio traité avec succès ({audio_path}).")
+        record = processor.metrics()
+        if not processor.should_reject and not processor.export_cleaned:
+            record["speech_clips"] = processor.speech_clips()
+        record["processing_s"] = time.perf_counter() - start
+        return record
 
     except Exception as e:
         print(f"[{thread_name}] : Erreur lors du traitement de ({audio_path}) : {e}")
 
-def transcription(audio_path, model):
+def init_audio_worker(options=None):
+    """
+    Initialisation d'un processus worker : un seul thread torch et un VAD chargé une fois
+    (aucun avec vad_server : le VAD est exécuté par le serveur de modèles).
+    """
+    global _worker_options
+    import torch
+    torch.set_num_threads(1)
+    _worker_options = options or processor_options()
+    if not _worker_options.get("vad_server"):
+        get_vad_model()
+
+def process_audio_chunk(audio_paths):
+    """
+    Tâche du pool de processus : un lot de fichiers, avec les options fixées par init_audio_worker.
+    """
+    return [process_audio_pipeline(audio_path, _worker_options) for audio_path in audio_paths]
+
+def iter_completed(executor, fn, items, max_in_flight):
+    """
+    Soumet les tâches au fur et à mesure (au plus max_in_flight en cours) et produit
+    les résultats dans l'ordre de fin. Si le consommateur s'arrête de lire,
+    plus rien n'est soumis : c'est la contre-pression.
+    """
+    items = iter(items)
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            break
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = next(items, None)
+            if item is not None:
+                pending.add(executor.submit(fn, item))
+            yield future.result()
+
+def iter_quality_records(audio_files, mode=EXECUTION_MODE, workers=None, chunksize=PROCESS_CHUNKSIZE, options=None):
+    """
+    Exécute le filtre qualité (threads ou processus) et produit les métriques au fil de l'eau.
+    """
+    options = options or processor_options()
+
+    if mode == "process":
+        workers = workers or NUM_PROCESSES_AUDIO
+        print(f"Lancement du traitement avec {workers} processus (chunksize={chunksize})...\n")
+        chunks = [audio_files[i:i + chunksize] for i in range(0, len(audio_files), chunksize)]
+        # spawn : pas de fork d'un processus qui a déjà initialisé torch
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=init_audio_worker, initargs=(options,)) as executor:
+            for records in iter_completed(executor, process_audio_chunk, chunks, workers * IN_FLIGHT_FACTOR):
+                yield from records
+        return
+
+    workers = workers or NUM_THREADS_AUDIO
+    print(f"Lancement du traitement avec {workers} threads...\n")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fn = partial(process_audio_pipeline, options=options)
+        yield from iter_completed(executor, fn, audio_files, workers * IN_FLIGHT_FACTOR)
+
+def iter_stage_records(audio_files, mode=EXECUTION_MODE, workers=None, chunksize=PROCESS_CHUNKSIZE, options=None, cache=None):
+    """
+    Métriques de tous les fichiers : d'abord ceux trouvés dans le cache,
+    puis les fichiers nouveaux ou modifiés au fur et à mesure de leur traitement.
+    """
+    to_process = []
+    hits = 0
+    for audio_path in audio_files:
+        record = cache.get(audio_path) if cache is not None else None
+        if record is not None:
+            hits += 1
+            yield record
+        else:
+            to_process.append(audio_path)
+
+    if cache is not None:
+        print(f"{hits} fichiers trouvés dans le cache, {len(to_process)} à traiter.")
+
+    if to_process:
+        for record in iter_quality_records(to_process, mode, workers, chunksize, options):
+            if record is None:
+                continue
+            # la figure part au rendu en arrière-plan, elle ne suit pas les métriques
+            plot = record.pop("plot", None)
+            if plot is not None and plot_renderer is not None:
+                plot_renderer.submit(plot)
+            if cache is not None:
+                cache.put(record["audio_path"], record)
+            yield record
+
+def log_quality(records, sink=None):
+    for record in records:
+        profiler.add_record(record)
+        tier_stats.add_record(record)
+    if sink is not None:
+        sink.add_quality(records)
+    else:
+        log_records_to_csv(records)
+
+def run_quality_stage(audio_files, mode=EXECUTION_MODE, workers=None, chunksize=PROCESS_CHUNKSIZE, options=None, cache=None, sink=None):
+    """
+    Lance le filtre qualité et retourne les enregistrements des audios acceptés.
+    Avec un cache, seuls les fichiers nouveaux ou modifiés sont traités.
+    """
+    records = list(iter_stage_records(audio_files, mode, workers, chunksize, options, cache))
+
+    log_quality(records, sink)
+    if cache is not None:
+        cache.report()
+    return [record for record in records if not record["rejected"]]
+
+def build_backend(name=TRANSCRIPTION_BACKEND, model_name=WHISPER_MODEL, device=None,
+                  compute_type=COMPUTE_TYPE, cpu_threads=CPU_THREADS, lazy=True):
+    """
+    lazy=True : le modèle n'est chargé qu'au premier fichier réellement à transcrire.
+    """
+    factory = LazyBackend if lazy else load_backend
+    if name == "faster-whisper":
+        return factory(name, model_name, device=device or "cpu",
+                       compute_type=compute_type, cpu_threads=cpu_threads)
+    return factory(name, model_name, device=device)
+
+def transcription(record, backend, cache=None, sink=None):
+    """
+    Transcrit un audio accepté : le fichier _cleaned.wav, ou directement ses
+    segments de parole en mémoire (temps de l'enregistrement d'origine).
+    """
+    clips = record.get("speech_clips")
+    audio_path = record["audio_path"] if clips is not None else record["cleaned_path"]
     try:
         thread_name = current_thread().name
-        transcriber = Transcriber(audio_path, model=model)
+        transcriber = Transcriber(audio_path, backend=backend, clips=clips,
+                                  decode_options=DECODE_OPTIONS, cache=cache, sink=sink)
         transcriber.transcribe()
+        profiler.add(transcriber.timer.timings)
     except Exception as e:
         print(f"[{thread_name}] : Erreur lors du traitement de ({audio_path}) : {e}")
+    finally:
+        # le record reste dans la liste des métriques jusqu'à la fin : sans ses
+        # segments audio, la mémoire ne croît pas avec la taille du corpus
+        record.pop("speech_clips", None)
 
+def transcribe_records(records, backend, batch_size, cache=None, sink=None):
+    """
+    Transcription par lots des fichiers nettoyés ; les audios transmis en segments
+    mémoire sont transcrits un par un (leurs segments ont déjà des durées variables).
+    """
+    files = [record["cleaned_path"] for record in records if "speech_clips" not in record]
+    if files:
+        done = transcribe_batched(files, backend, batch_size=batch_size,
+                                  cache=cache, decode_options=DECODE_OPTIONS, sink=sink)
+        for transcriber in done:
+            profiler.add(transcriber.timer.timings)
+    for record in records:
+        if "speech_clips" in record:
+            transcription(record, backend, cache=cache, sink=sink)
 
-def main():
-    clean()
-    whisper_model = whisper.load_model("large-v3-turbo")
+def run_streaming(audio_files, backend, args, options, cache=None, transcript_cache=None, sink=None):
+    """
+    Filtre qualité et transcription en parallèle : chaque fichier accepté passe
+    dans une file bornée et est transcrit sans attendre la fin de l'étape qualité.
+    """
+    accepted = queue.Queue(maxsize=args.queue_size)
+    quality_stats = StageStats("qualité")
+    transcription_stats = StageStats("transcription")
+    records = []
+    failed = []
+    consumers = max(args.transcription_workers, 1)
 
-    audio_files = [
-        os.path.join(AUDIO_DIR, f)
-        for f in os.listdir(AUDIO_DIR)
-        if f.endswith(".wav") and not f.endswith("_cleaned.wav")
-    ]
+    def producer():
+        quality_stats.start()
+        try:
+            for record in iter_stage_records(audio_files, args.mode, args.workers, args.chunksize, options, cache):
+                records.append(record)
+                quality_stats.add(record.get("processing_s", 0.0))
+                if not record["rejected"]:
+                    start = time.perf_counter()
+                    accepted.put(record)  # bloque si la transcription est en retard
+                    quality_stats.add_wait(time.perf_counter() - start)
+        except Exception as e:
+            print(f"Erreur dans l'étape qualité : {e}")
+        finally:
+            quality_stats.stop()
+            for _ in range(consumers):
+                accepted.put(None)
 
-    if not audio_files:
-        print("Aucun fichier audio à traiter.")
-        return
+    def consumer():
+        finished = False
+        while not finished:
+            start = time.perf_counter()
+            record = accepted.get()
+            transcription_stats.add_wait(time.perf_counter() - start)
+            if record is None:
+                break
+            transcription_stats.start()
 
-    print(f"Lancement du traitement avec {NUM_THREADS_AUDIO} threads...\n")
-    cleaned_audios = []
+            batch = [record]
+            # par lots : on prend ce qui est déjà disponible dans la file
+            while len(batch) < args.batch_size:
+                try:
+                    record = accepted.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    finished = True
+                    break
+                batch.append(record)
 
-    with ThreadPoolExecutor(max_workers=NUM_THREADS_AUDIO) as executor:
-        futures = {executor.submit(process_audio_pipeline, audio): audio for audio in audio_files}
+            with transcription_stats.timed(len(batch)):
+                # une erreur ne doit pas arrêter le consommateur : le producteur resterait
+                # bloqué sur la file pleine
+                try:
+                    if args.batch_size > 0:
+                        transcribe_records(batch, backend, args.batch_size, cache=transcript_cache, sink=sink)
+                    else:
+                        transcription(batch[0], backend, cache=transcript_cache, sink=sink)
+                except Exception as e:
+                    print(f"Erreur lors de la transcription de {len(batch)} fichier(s) : {e}")
+                    failed.extend(record["audio_path"] for record in batch)
+        transcription_stats.stop()
 
-        for future in as_completed(futures):
-            result = future.result()
-            if result:  # non vide
-                cleaned_audios.extend(result)
+    print(f"Pipeline en flux : file de {args.queue_size} fichiers, {consumers} thread(s) de transcription.\n")
+    threads = [threading.Thread(target=producer, name="qualite")]
+    threads += [threading.Thread(target=consumer, name=f"transcription-{i}") for i in range(consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
-    if not cleaned_audios:
+    log_quality(records, sink)
+    if cache is not None:
+        cache.report()
+    print("\nStatistiques par étape :")
+    quality_stats.report()
+    transcription_stats.report()
+    if failed:
+        print(f"{len(failed)} fichier(s) non transcrits : {', '.join(os.path.basename(p) for p in failed)}")
+
+def run_sequential_stages(audio_files, backend, args, options, cache=None, transcript_cache=None, sink=None):
+    """
+    Filtre qualité sur tous les fichiers, puis transcription des fichiers acceptés.
+    """
+    accepted = run_quality_stage(
+        audio_files, mode=args.mode, workers=args.workers,
+        chunksize=args.chunksize, options=options, cache=cache, sink=sink,
+    )
+
+    if not accepted:
         print("Aucun audio n'a passé le filtre qualité. Fin du programme.")
         return
 
-    print(f"\nLancement de la transcription avec {NUM_TRHEADS_TRANSCRIPTION} threads...\n")
-    with ThreadPoolExecutor(max_workers=NUM_TRHEADS_TRANSCRIPTION) as executor:
-        transcribe_fn = partial(transcription, model=whisper_model)
-        transcriptions = [executor.submit(transcribe_fn, audio) for audio in cleaned_audios]
+    if args.batch_size > 0:
+        print(f"\nLancement de la transcription par lots de {args.batch_size} clips...\n")
+        transcribe_records(accepted, backend, args.batch_size, cache=transcript_cache, sink=sink)
+        return
+
+    print(f"\nLancement de la transcription avec {args.transcription_workers} threads...\n")
+    with ThreadPoolExecutor(max_workers=args.transcription_workers) as executor:
+        transcribe_fn = partial(transcription, backend=backend, cache=transcript_cache, sink=sink)
+        transcriptions = [executor.submit(transcribe_fn, record) for record in accepted]
 
         for future in as_completed(transcriptions):
             future.result()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline qualité audio + transcription")
+    parser.add_argument("--mode", choices=["thread", "process"], default=EXECUTION_MODE,
+                        help="exécution de l'étape qualité par threads ou par processus")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de workers pour l'étape qualité")
+    parser.add_argument("--chunksize", type=int, default=PROCESS_CHUNKSIZE,
+                        help="fichiers par tâche envoyée à un processus")
+    parser.add_argument("--in-memory", action="store_true", default=IN_MEMORY_AUDIO,
+                        help="analyse en mémoire sans pydub ni fichier temporaire")
+    parser.add_argument("--mmap", action="store_true", default=MMAP_AUDIO,
+                        help="analyse en mémoire sur le WAV projeté (numpy.memmap), pic mémoire réduit")
+    parser.add_argument("--tiered", action="store_true", default=TIERED_REJECTION,
+                        help="rejet par paliers : les fichiers nettement hors seuils évitent Pedalboard, VAD et FFT")
+    parser.add_argument("--plots", action="store_true", default=PLOTS,
+                        help="figures de diagnostic rendues en arrière-plan dans plots/")
+    parser.add_argument("--plot-workers", type=int, default=RENDER_WORKERS,
+                        help="processus dédiés au rendu des figures")
+    parser.add_argument("--windowed-spectrum", action="store_true", default=WINDOWED_SPECTRUM,
+                        help="spectre par fenêtres : borne la mémoire de la FFT, pas celle du signal "
+                             "(analyse entièrement en flux : spectral_stream.py)")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", default=USE_QUALITY_CACHE,
+                        help="désactive le cache des métriques qualité")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE_LIMIT,
+                        help="taille maximale du cache en octets (éviction LRU)")
+    parser.add_argument("--no-transcript-cache", dest="transcript_cache", action="store_false",
+                        default=USE_TRANSCRIPT_CACHE, help="désactive le cache des transcriptions")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=TRANSCRIPTION_BACKEND,
+                        help="moteur de transcription")
+    parser.add_argument("--model", default=WHISPER_MODEL, help="modèle Whisper")
+    parser.add_argument("--device", default=None, help="cpu ou cuda (auto par défaut)")
+    parser.add_argument("--compute-type", default=COMPUTE_TYPE,
+                        help="type de calcul CTranslate2 (faster-whisper)")
+    parser.add_argument("--cpu-threads", type=int, default=CPU_THREADS,
+                        help="threads CPU par modèle (faster-whisper)")
+    parser.add_argument("--batch-size", type=int, default=TRANSCRIPTION_BATCH_SIZE,
+                        help="taille des lots de transcription (0 = fichier par fichier)")
+    parser.add_argument("--streaming", action="store_true", default=STREAMING,
+                        help="transcrit chaque fichier dès qu'il passe le filtre qualité")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                        help="taille de la file entre qualité et transcription")
+    parser.add_argument("--transcription-workers", type=int, default=NUM_TRHEADS_TRANSCRIPTION,
+                        help="threads de transcription")
+    parser.add_argument("--vad-segments", action="store_true", default=SEGMENTS_IN_MEMORY,
+                        help="transcrit les segments de parole en mémoire, sans fichier _cleaned.wav")
+    parser.add_argument("--metrics-db", default=DB_PATH,
+                        help="base SQLite des métriques (les CSV sont exportés en fin d'exécution)")
+    parser.add_argument("--model-server", default=None, metavar="URL",
+                        help="transcription et VAD par le serveur de modèles (ex. http://127.0.0.1:8765)")
+    parser.add_argument("--profile-report", default=None, metavar="JSON", nargs="?", const=REPORT_PATH,
+                        help=f"rapport des temps par étape (p50/p95/p99), défaut {REPORT_PATH}")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="pic mémoire par fichier (tracemalloc, ralentit le traitement)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="affiche le temps d'import de chaque module puis quitte")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global plot_renderer
+    args = parse_args(argv)
+    if args.profile_startup:
+        from startup_profile import report
+        report("pipeline")
+        return
+    clean()
+    if args.model_server:
+        # modèle déjà chargé dans le serveur : pas de chargement au démarrage
+        backend = RemoteBackend(args.model_server)
+    else:
+        backend = build_backend(args.backend, args.model, args.device, args.compute_type, args.cpu_threads)
+
+    audio_files = [
+        os.path.join(AUDIO_DIR, f)
+        for f in os.listdir(AUDIO_DIR)
+        if f.endswith(".wav") and not f.endswith("_cleaned.wav")
+    ]
+
+    if not audio_files:
+        print("Aucun fichier audio à traiter.")
+        return
+
+    options = processor_options(args.in_memory, args.windowed_spectrum, args.vad_segments, args.profile_memory,
+                                args.mmap, args.tiered, args.plots, args.model_server)
+    cache = QualityCache(args.cache_dir, args.cache_size, options) if args.cache else None
+    transcript_cache = TranscriptCache() if args.transcript_cache else None
+    sink = MetricsStore(args.metrics_db)
+    if args.plots:
+        plot_renderer = PlotRenderer(workers=args.plot_workers)
+    try:
+        if args.streaming:
+            run_streaming(audio_files, backend, args, options, cache, transcript_cache, sink)
+        else:
+            run_sequential_stages(audio_files, backend, args, options, cache, transcript_cache, sink)
+    finally:
+        # export au format CSV habituel pour les outils existants
+        sink.export_csv()
+        sink.close()
+        print(f"Métriques enregistrées dans {args.metrics_db} (exécution {sink.run_id}).")
+        if cache is not None:
+            cache.close()
+        if transcript_cache is not None:
+            transcript_cache.report()
+            transcript_cache.close()
+        print("\nTemps par étape :")
+        profiler.print_summary()
+        if args.tiered:
+            tier_stats.report()
+        if plot_renderer is not None:
+            plot_renderer.close()
+            plot_renderer.report()
+        if args.profile_report:
+            print(f"Rapport de profilage : {profiler.write_json(args.profile_report)}")
+
     print("\nTraitement terminé pour tous les fichiers.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
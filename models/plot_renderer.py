@@ -0,0 +1,210 @@
+import os
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PLOT_DIR = "plots"
+ENVELOPE_POINTS = 2000  # colonnes min/max de la forme d'onde (largeur de la figure en pixels)
+SPECTRUM_POINTS = 1024
+RENDER_WORKERS = 1
+QUEUE_SIZE = 256  # au-delà, les figures sont abandonnées plutôt que de ralentir le pipeline
+BATCH_SIZE = 8  # figures rendues par tâche envoyée à un processus
+BATCH_WAIT = 0.5  # secondes d'attente maximale pour compléter un lot
+DPI = 100
+
+
+def envelope(samples, points=ENVELOPE_POINTS):
+    """
+    Enveloppe min/max par colonne : même aspect visuel que tracer tous les
+    échantillons, pour une taille fixe quelle que soit la durée.
+    """
+    n = len(samples)
+    if n <= 2 * points:
+        return samples.astype(np.float32), samples.astype(np.float32)
+    bucket = n // points
+    frames = samples[:bucket * points].reshape(points, bucket)
+    return frames.min(axis=1).astype(np.float32), frames.max(axis=1).astype(np.float32)
+
+
+def decimate_spectrum(freqs, magnitude, points=SPECTRUM_POINTS):
+    """
+    Spectre réduit à points valeurs (maximum par groupe de bins : les pics restent visibles).
+    """
+    n = len(magnitude)
+    if n <= points:
+        return np.asarray(freqs, dtype=np.float32), np.asarray(magnitude, dtype=np.float32)
+    group = n // points
+    usable = group * points
+    freqs = np.asarray(freqs[:usable]).reshape(points, group)[:, 0]
+    magnitude = np.asarray(magnitude[:usable]).reshape(points, group).max(axis=1)
+    return freqs.astype(np.float32), magnitude.astype(np.float32)
+
+
+def plot_payload(name, samples, sample_rate, spectrum, metrics):
+    """
+    Données d'une figure (quelques dizaines de Ko, picklables) : enveloppe de la
+    forme d'onde, spectre décimé (freqs, magnitudes) ou None, métriques affichées.
+    """
+    env_min, env_max = envelope(samples)
+    return {
+        "name": name,
+        "duration": len(samples) / sample_rate if sample_rate else 0.0,
+        "envelope": (env_min, env_max),
+        "spectrum": spectrum,
+        "metrics": metrics,
+    }
+
+
+def render_plot(payload, plot_dir=PLOT_DIR):
+    """
+    Rendu d'une figure avec l'API objet de matplotlib (pas d'état global pyplot) :
+    plusieurs rendus peuvent avoir lieu en parallèle sans verrou.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    name = payload["name"]
+    metrics = payload["metrics"]
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+
+    # Signal temporel
+    ax = fig.add_subplot(2, 2, 1)
+    env_min, env_max = payload["envelope"]
+    t = np.linspace(0, payload["duration"], len(env_min))
+    ax.fill_between(t, env_min, env_max, color='gray', alpha=0.7, linewidth=0)
+    ax.set_title(f"{name} - Signal temporel")
+    ax.set_xlabel("Temps (s)")
+    ax.set_ylabel("Amplitude")
+
+    # Spectre fréquentiel
+    ax = fig.add_subplot(2, 2, 2)
+    if payload["spectrum"] is not None:
+        xf, yf = payload["spectrum"]
+        ax.plot(xf, yf, color='blue')
+        centroid = metrics["spectral_centroid"]
+        ax.axvline(centroid, color='red', linestyle='--', label=f'Centroïde: {centroid:.0f}Hz')
+        ax.legend()
+    ax.set_title("Spectre fréquentiel")
+    ax.set_xlabel("Fréquence (Hz)")
+    ax.set_ylabel("Magnitude")
+
+    # Métriques de qualité
+    ax = fig.add_subplot(2, 2, 3)
+    lines = [
+        f"RMS: {metrics['rms']}",
+        f"Bruit: {metrics['noise_level']:.2f}",
+        f"Centroïde: {metrics['spectral_centroid']:.0f}Hz",
+    ]
+    if metrics.get("rejection_reasons"):
+        lines.append("Rejet : " + "; ".join(metrics["rejection_reasons"]))
+    for i, line in enumerate(lines):
+        ax.text(0.1, 0.9 - i * 0.15, line, transform=ax.transAxes)
+    ax.set_title("Métriques de qualité")
+    ax.axis('off')
+
+    fig.tight_layout()
+    os.makedirs(plot_dir, exist_ok=True)
+    final_path = os.path.join(plot_dir, f"{name}.png")
+    temp_path = os.path.join(plot_dir, f".{name}.{os.getpid()}.png")
+    fig.savefig(temp_path, dpi=DPI, bbox_inches='tight')
+    os.replace(temp_path, final_path)  # remplacement atomique, même si le fichier existe
+    return final_path
+
+
+def render_batch(payloads, plot_dir=PLOT_DIR):
+    """
+    Tâche d'un processus de rendu ; une erreur sur une figure n'arrête pas le lot.
+    Retourne (nombre rendu, erreurs).
+    """
+    rendered, errors = 0, []
+    for payload in payloads:
+        try:
+            render_plot(payload, plot_dir)
+            rendered += 1
+        except Exception as e:
+            errors.append(f"{payload.get('name')}: {e}")
+    return rendered, errors
+
+
+class PlotRenderer:
+    """
+    Rendu des figures en arrière-plan : les producteurs déposent des payloads dans
+    une file bornée sans jamais attendre (figure abandonnée si la file est pleine),
+    un thread les regroupe par lots et les envoie à un pool de processus.
+    """
+
+    def __init__(self, plot_dir=PLOT_DIR, workers=RENDER_WORKERS, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+        self.plot_dir = plot_dir
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        # spawn : pas de fork d'un processus qui a déjà initialisé torch
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.submitted = 0
+        self.dropped = 0
+        self.rendered = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._dispatch, name="plots", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload):
+        try:
+            self.queue.put_nowait(payload)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _dispatch(self):
+        finished = False
+        while not finished:
+            payload = self.queue.get()
+            if payload is None:
+                break
+            batch = [payload]
+            while len(batch) < self.batch_size:
+                try:
+                    payload = self.queue.get(timeout=BATCH_WAIT)
+                except queue.Empty:
+                    break
+                if payload is None:
+                    finished = True
+                    break
+                batch.append(payload)
+            self.executor.submit(render_batch, batch, self.plot_dir).add_done_callback(self._done)
+
+    def _done(self, future):
+        try:
+            rendered, errors = future.result()
+        except Exception as e:
+            rendered, errors = 0, [str(e)]
+        with self._lock:
+            self.rendered += rendered
+            self.errors.extend(errors)
+
+    def close(self, wait=True):
+        """
+        wait=True : les figures déjà en file sont rendues avant l'arrêt.
+        """
+        if not wait:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+        self.queue.put(None)
+        self._thread.join()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def report(self):
+        print(f"Figures : {self.rendered} rendues, {self.dropped} abandonnées (file pleine), "
+              f"{len(self.errors)} erreurs ({self.plot_dir})")
+        for error in self.errors[:5]:
+            print(f"  {error}")
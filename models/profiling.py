@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+MAX_SAMPLES = 10000  # valeurs gardées par étape pour les percentiles
+REPORT_PATH = "data/profile_report.json"
+METRIC_PREFIX = "sca"
+
+
+class StageTimer:
+    """
+    Temps passé dans chaque étape pour un fichier (étape -> secondes) et, si
+    trace_memory, pic d'allocation pendant le traitement (tracemalloc, numpy compris).
+    Le pic est exact quand un processus traite un fichier à la fois (mode process
+    ou un seul thread) ; avec plusieurs threads il couvre tous les fichiers en cours.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.timings = {}
+        self.trace_memory = trace_memory
+        self.peak_memory = None
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def stop(self):
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+        return self.timings
+
+
+class Profiler:
+    """
+    Agrégation des StageTimer de tous les fichiers : histogrammes (p50/p95/p99) par
+    étape et pic mémoire par fichier, en rapport JSON ou au format texte Prometheus.
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.samples = {}
+        self.totals = {}
+        self.counts = {}
+        self.peak_memory = {}
+        self._lock = threading.Lock()
+
+    def add(self, timings, peak_memory=None, file=None):
+        with self._lock:
+            for stage, seconds in timings.items():
+                self.samples.setdefault(stage, deque(maxlen=self.max_samples)).append(seconds)
+                self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+                self.counts[stage] = self.counts.get(stage, 0) + 1
+            if peak_memory is not None:
+                self.peak_memory[file] = peak_memory
+
+    def add_record(self, record):
+        """
+        Enregistrement produit par process_audio_pipeline (champs timings / peak_memory).
+        """
+        if record.get("timings"):
+            self.add(record["timings"], record.get("peak_memory"), record.get("file"))
+
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add({stage: time.perf_counter() - start})
+
+    def summary(self):
+        with self._lock:
+            stages = {}
+            for stage, samples in self.samples.items():
+                ms = np.asarray(samples) * 1000
+                stats = {
+                    "count": self.counts[stage],
+                    "total_s": self.totals[stage],
+                    "mean_ms": float(ms.mean()),
+                    "max_ms": float(ms.max()),
+                }
+                for p in PERCENTILES:
+                    stats[f"p{p}_ms"] = float(np.percentile(ms, p))
+                stages[stage] = stats
+
+            memory = {}
+            if self.peak_memory:
+                mb = np.asarray(list(self.peak_memory.values())) / (1024 * 1024)
+                memory = {"files": len(mb), "max_mb": float(mb.max())}
+                for p in PERCENTILES:
+                    memory[f"p{p}_mb"] = float(np.percentile(mb, p))
+            return {"stages": stages, "peak_memory": memory}
+
+    def write_json(self, path=REPORT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = dict(self.summary(), created_at=time.time())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"{'étape':<18} {'n':>6} {'total (s)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}")
+        for stage, s in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            print(f"{stage:<18} {s['count']:>6} {s['total_s']:>10.2f} {s['p50_ms']:>10.1f} "
+                  f"{s['p95_ms']:>10.1f} {s['p99_ms']:>10.1f}")
+        memory = summary["peak_memory"]
+        if memory:
+            print(f"Pic mémoire par fichier : p50 {memory['p50_mb']:.1f} Mo, "
+                  f"p95 {memory['p95_mb']:.1f} Mo, max {memory['max_mb']:.1f} Mo")
+
+    def prometheus(self):
+        """
+        Texte d'exposition Prometheus (type summary).
+        """
+        with self._lock:
+            name = f"{METRIC_PREFIX}_stage_seconds"
+            lines = [f"# HELP {name} Durée des étapes du pipeline", f"# TYPE {name} summary"]
+            for stage, samples in self.samples.items():
+                values = np.asarray(samples)
+                for p in PERCENTILES:
+                    lines.append(f'{name}{{stage="{stage}",quantile="{p / 100}"}} {np.percentile(values, p):.6f}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {self.totals[stage]:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {self.counts[stage]}')
+
+            if self.peak_memory:
+                name = f"{METRIC_PREFIX}_peak_memory_bytes"
+                values = np.asarray(list(self.peak_memory.values()))
+                lines += [f"# HELP {name} Pic mémoire par fichier", f"# TYPE {name} summary"]
+                for p in PERCENTILES:
+                    lines.append(f'{name}{{quantile="{p / 100}"}} {np.percentile(values, p):.0f}')
+                lines.append(f"{name}_sum {values.sum():.0f}")
+                lines.append(f"{name}_count {len(values)}")
+            return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+import diskcache
+
+from audio_processor import processing_params
+
+CACHE_DIR = "data/cache/quality"
+CACHE_SIZE_LIMIT = 2 * 1024 ** 3  # 2 Go, éviction LRU au-delà
+CACHE_VERSION = 1  # à incrémenter si le calcul des métriques change
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path):
+    """
+    Hash SHA-256 du contenu d'un fichier, lu par blocs.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def params_hash(options=None):
+    payload = {"version": CACHE_VERSION, "params": processing_params(options)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class QualityCache:
+    """
+    Cache persistant des métriques qualité et des fichiers nettoyés, indexé par
+    hash du contenu audio + hash des paramètres de traitement.
+    """
+
+    def __init__(self, directory=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT, options=None):
+        self.directory = directory
+        self.cache = diskcache.Cache(directory, size_limit=size_limit, eviction_policy="least-recently-used")
+        self.params = params_hash(options)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, audio_path):
+        return f"quality:{file_hash(audio_path)}:{self.params}"
+
+    def get(self, audio_path):
+        """
+        Retourne l'enregistrement de métriques si le fichier est connu et restaure
+        le fichier nettoyé à côté de l'audio ; None sinon.
+        """
+        entry = self.cache.get(self.key(audio_path))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        record = dict(entry["metrics"])
+        record["audio_path"] = audio_path
+        record["file"] = os.path.basename(audio_path)
+        # avec les segments de parole en mémoire (speech_clips), pas de fichier nettoyé à restaurer
+        if not record["rejected"] and "speech_clips" not in record:
+            record["cleaned_path"] = audio_path.replace(".wav", "_cleaned.wav")
+            with open(record["cleaned_path"], "wb") as f:
+                f.write(entry["cleaned_wav"])
+
+        with self._lock:
+            self.hits += 1
+        return record
+
+    def put(self, audio_path, record):
+        cleaned_wav = None
+        if not record["rejected"] and record["cleaned_path"] is not None:
+            with open(record["cleaned_path"], "rb") as f:
+                cleaned_wav = f.read()
+        # temps de traitement et figure propres à cette exécution : un hit n'a rien coûté
+        metrics = {k: v for k, v in record.items() if k not in ("timings", "peak_memory", "plot")}
+        self.cache.set(self.key(audio_path), {"metrics": metrics, "cleaned_wav": cleaned_wav})
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        size_mb = self.cache.volume() / (1024 * 1024)
+        print(f"Cache qualité : {self.hits} hits, {self.misses} miss ({rate:.0f}% de hits), "
+              f"{len(self.cache)} entrées, {size_mb:.1f} Mo ({self.directory})")
+
+    def close(self):
+        self.cache.close()
@@ -0,0 +1,165 @@
+import argparse
+import itertools
+import json
+import sqlite3
+import numpy as np
+import pandas as pd
+
+import audio_processor
+from metrics_store import DB_PATH
+
+# un bit par critère de rejet de AudioProcessor.check_rejection_criteria
+RMS_LOW = 1
+RMS_HIGH = 2
+SPEECH_RATIO_LOW = 4
+SATURATION = 8
+NOISE = 16
+CENTROID_OUT = 32
+SIGNAL_FLAT = 64
+ROLLOFF_LOW = 128
+
+REASON_NAMES = {
+    RMS_LOW: "RMS trop faible",
+    RMS_HIGH: "RMS trop élevé",
+    SPEECH_RATIO_LOW: "Ratio de parole insuffisant",
+    SATURATION: "Saturation excessive",
+    NOISE: "Bruit excessif",
+    CENTROID_OUT: "Centroïde spectral hors limites",
+    SIGNAL_FLAT: "Signal trop plat",
+    ROLLOFF_LOW: "Faible articulation",
+}
+
+# paliers de rejet d'AudioProcessor(tiered=True) : métriques suivantes non mesurées (NULL)
+PARTIAL_TIERS = ("cheap", "vad")
+
+PROFILE_KEYS = [
+    "MIN_RMS", "MAX_RMS", "MAX_SATURATION_FRAMES", "MAX_NOISE_LEVEL",
+    "MIN_SPECTRAL_CENTROID", "MAX_SPECTRAL_CENTROID", "MIN_SPEECH_RATIO",
+    "MIN_SIGNAL_STD", "MIN_SPECTRAL_ROLLOFF",
+]
+
+
+def default_profile():
+    """
+    Seuils actuels de audio_processor.
+    """
+    return {key: getattr(audio_processor, key) for key in PROFILE_KEYS}
+
+
+def score(metrics, profile=None):
+    """
+    Applique les critères de rejet à toutes les lignes d'un coup.
+    metrics : DataFrame ou dict de colonnes (rms, speech_ratio, saturation_count,
+    noise_level, spectral_centroid, signal_std, spectral_rolloff).
+    Retourne (masque de rejet, bits de raisons) sous forme de tableaux numpy.
+    """
+    p = default_profile()
+    p.update(profile or {})
+
+    rms = np.asarray(metrics["rms"], dtype=np.float64)
+    centroid = np.asarray(metrics["spectral_centroid"], dtype=np.float64)
+    flags = np.zeros(len(rms), dtype=np.uint16)
+
+    flags |= np.where(rms < p["MIN_RMS"], RMS_LOW, 0).astype(np.uint16)
+    flags |= np.where((rms >= p["MIN_RMS"]) & (rms > p["MAX_RMS"]), RMS_HIGH, 0).astype(np.uint16)
+    flags |= np.where(np.asarray(metrics["speech_ratio"]) < p["MIN_SPEECH_RATIO"], SPEECH_RATIO_LOW, 0).astype(np.uint16)
+    flags |= np.where(np.asarray(metrics["saturation_count"]) > p["MAX_SATURATION_FRAMES"], SATURATION, 0).astype(np.uint16)
+    flags |= np.where(np.asarray(metrics["noise_level"]) > p["MAX_NOISE_LEVEL"], NOISE, 0).astype(np.uint16)
+    flags |= np.where((centroid < p["MIN_SPECTRAL_CENTROID"]) | (centroid > p["MAX_SPECTRAL_CENTROID"]), CENTROID_OUT, 0).astype(np.uint16)
+    flags |= np.where(np.asarray(metrics["signal_std"]) < p["MIN_SIGNAL_STD"], SIGNAL_FLAT, 0).astype(np.uint16)
+    flags |= np.where(np.asarray(metrics["spectral_rolloff"]) < p["MIN_SPECTRAL_ROLLOFF"], ROLLOFF_LOW, 0).astype(np.uint16)
+
+    return flags != 0, flags
+
+
+def reason_names(flags):
+    """
+    Bits de raisons -> liste des libellés.
+    """
+    return [name for bit, name in REASON_NAMES.items() if int(flags) & bit]
+
+
+def reason_counts(flags):
+    flags = np.asarray(flags)
+    return {name: int(np.count_nonzero(flags & bit)) for bit, name in REASON_NAMES.items()}
+
+
+def load_metrics(db_path=DB_PATH, run_id=None):
+    """
+    Métriques qualité depuis la base MetricsStore : dernière mesure de chaque fichier,
+    ou celles d'une exécution donnée.
+    """
+    with sqlite3.connect(db_path) as conn:
+        if run_id is not None:
+            return pd.read_sql_query("SELECT * FROM quality WHERE run_id = ?", conn, params=(run_id,))
+        return pd.read_sql_query(
+            "SELECT * FROM quality WHERE id IN (SELECT MAX(id) FROM quality GROUP BY file)", conn
+        )
+
+
+def measured(metrics):
+    """
+    Lignes dont toutes les métriques ont été mesurées : un fichier rejeté par un palier
+    n'a pas de valeurs pour les critères suivants, un autre profil ne peut pas être rejoué.
+    """
+    if "rejected_tier" not in metrics:
+        return metrics
+    return metrics[~metrics["rejected_tier"].isin(PARTIAL_TIERS)]
+
+
+def expand_grid(settings):
+    """
+    ["MIN_RMS=1500,2000", "MAX_NOISE_LEVEL=0.2,0.3"] -> liste de profils (produit cartésien).
+    """
+    axes = []
+    for setting in settings:
+        key, values = setting.split("=", 1)
+        if key not in PROFILE_KEYS:
+            raise ValueError(f"Seuil inconnu : {key}")
+        axes.append([(key, float(v)) for v in values.split(",")])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def sweep(metrics, profiles):
+    """
+    Évalue chaque profil sur les lignes entièrement mesurées (rejets par palier exclus) ;
+    retourne un DataFrame récapitulatif.
+    """
+    metrics = measured(metrics)
+    rows = []
+    for profile in profiles:
+        mask, flags = score(metrics, profile)
+        row = dict(profile)
+        row["rejected"] = int(mask.sum())
+        row["accepted"] = int(len(mask) - mask.sum())
+        row["reject_rate"] = float(mask.mean()) if len(mask) else 0.0
+        row.update(reason_counts(flags))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# script principal : balayage de profils de seuils sur les métriques déjà calculées
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Balayage de seuils de rejet sans retraiter l'audio")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--run-id", default=None, help="exécution à utiliser (défaut : dernière mesure par fichier)")
+    parser.add_argument("--set", dest="settings", nargs="*", default=[],
+                        help="grille de seuils, ex. MIN_RMS=1500,2000 MAX_NOISE_LEVEL=0.2,0.3")
+    parser.add_argument("--profiles", default=None, help="fichier JSON : liste de profils de seuils")
+    parser.add_argument("--output", default=None, help="export CSV du récapitulatif")
+    args = parser.parse_args()
+
+    metrics = load_metrics(args.db, args.run_id)
+    profiles = [{}]
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as f:
+            profiles = json.load(f)
+    elif args.settings:
+        profiles = expand_grid(args.settings)
+
+    summary = sweep(metrics, profiles)
+    partial = len(metrics) - len(measured(metrics))
+    print(f"{len(metrics) - partial} fichiers ({partial} rejetés par palier exclus), {len(profiles)} profils")
+    print(summary.to_string(index=False))
+    if args.output:
+        summary.to_csv(args.output, index=False)
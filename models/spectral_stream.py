@@ -0,0 +1,185 @@
+import argparse
+import csv
+import numpy as np
+from scipy.fft import rfft, rfftfreq
+from pedalboard.io import AudioFile, StreamResampler
+
+TARGET_SAMPLE_RATE = 16000
+WINDOW_SIZE = 2048  # 128 ms à 16 kHz
+HOP_SIZE = 1024
+BLOCK_SECONDS = 10  # taille des blocs lus sur le disque
+SATURATION_BINS = 32768  # résolution int16 pour le comptage de saturation
+ROLLOFF_RATIO = 0.85
+SATURATION_RATIO = 0.95
+
+
+class StreamingSpectralAnalyzer:
+    """
+    Analyse spectrale par fenêtres (type Welch) sur un flux de blocs mono.
+    La mémoire utilisée ne dépend que de WINDOW_SIZE, pas de la durée du signal.
+    """
+
+    def __init__(self, sample_rate=TARGET_SAMPLE_RATE, window_size=WINDOW_SIZE, hop_size=HOP_SIZE, keep_windows=False):
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.keep_windows = keep_windows
+
+        self.window = np.hanning(window_size).astype(np.float32)
+        self.freqs = rfftfreq(window_size, 1 / sample_rate)
+        self.magnitude_sum = np.zeros(len(self.freqs), dtype=np.float64)
+        self.num_windows = 0
+        self.window_metrics = []
+
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # position (en échantillons) du début de _carry
+
+        # statistiques globales du signal
+        self.num_samples = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self.peak = 0.0
+        self._abs_hist = np.zeros(SATURATION_BINS, dtype=np.int64)
+
+    def update(self, block):
+        """
+        Ajoute un bloc mono float32 (valeurs dans [-1, 1]).
+        """
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if len(block) == 0:
+            return
+
+        self.num_samples += len(block)
+        self._sum += float(np.sum(block, dtype=np.float64))
+        self._sum_sq += float(np.dot(block.astype(np.float64), block))
+        abs_block = np.abs(block)
+        self.peak = max(self.peak, float(abs_block.max()))
+        idx = np.minimum((abs_block * SATURATION_BINS).astype(np.int64), SATURATION_BINS - 1)
+        self._abs_hist += np.bincount(idx, minlength=SATURATION_BINS)
+
+        data = np.concatenate([self._carry, block]) if len(self._carry) else block
+        start = 0
+        while start + self.window_size <= len(data):
+            frame = data[start:start + self.window_size]
+            self._add_frame(frame, self._offset + start)
+            start += self.hop_size
+        self._carry = data[start:].copy()
+        self._offset += start
+
+    def _add_frame(self, frame, position):
+        frame = frame - frame.mean()
+        magnitude = np.abs(rfft(frame * self.window)) / self.window_size
+        self.magnitude_sum += magnitude
+        self.num_windows += 1
+
+        if self.keep_windows:
+            metrics = spectral_metrics(self.freqs, magnitude)
+            metrics["time"] = position / self.sample_rate
+            metrics["rms"] = float(np.sqrt(np.mean(np.square(frame))))
+            self.window_metrics.append(metrics)
+
+    def finalize(self):
+        """
+        Métriques globales, mêmes noms que les attributs de AudioProcessor.
+        """
+        # le reste (< une fenêtre) est complété par des zéros pour ne rien perdre
+        if len(self._carry) and (self.num_windows == 0 or len(self._carry) > self.window_size - self.hop_size):
+            frame = np.zeros(self.window_size, dtype=np.float32)
+            frame[:len(self._carry)] = self._carry
+            self._add_frame(frame, self._offset)
+        self._carry = np.zeros(0, dtype=np.float32)
+
+        metrics = spectral_metrics(self.freqs, self.magnitude_sum / max(self.num_windows, 1))
+
+        if self.num_samples > 0 and self.peak > 0:
+            mean = self._sum / self.num_samples
+            variance = max(self._sum_sq / self.num_samples - mean ** 2, 0.0)
+            # comme AudioProcessor : signal normalisé par son pic avant std / saturation
+            metrics["signal_std"] = float(np.sqrt(variance) / self.peak)
+            first_bin = int(SATURATION_RATIO * self.peak * SATURATION_BINS)
+            metrics["saturation_count"] = int(self._abs_hist[first_bin:].sum())
+        else:
+            metrics["signal_std"] = 0.0
+            metrics["saturation_count"] = 0
+        metrics["duration_sec"] = self.num_samples / self.sample_rate
+        return metrics
+
+
+def spectral_metrics(freqs, magnitude):
+    """
+    Centroïde, rolloff, bande passante et fréquence dominante d'un spectre d'amplitude.
+    """
+    total = float(np.sum(magnitude))
+    if len(magnitude) == 0 or total <= 0:
+        return {"dominant_freq": 0.0, "mean_freq": 0.0, "spectral_centroid": 0.0,
+                "bandwidth": 0.0, "spectral_rolloff": 0.0}
+
+    centroid = float(np.sum(freqs * magnitude) / total)
+    bandwidth = float(np.sqrt(np.sum(((freqs - centroid) ** 2) * magnitude) / total))
+    cumulative = np.cumsum(magnitude)
+    rolloff_idx = np.searchsorted(cumulative, ROLLOFF_RATIO * cumulative[-1])
+    return {
+        "dominant_freq": float(freqs[np.argmax(magnitude)]),
+        "mean_freq": centroid,
+        "spectral_centroid": centroid,
+        "bandwidth": bandwidth,
+        "spectral_rolloff": float(freqs[min(rolloff_idx, len(freqs) - 1)]),
+    }
+
+
+def analyze_file(audio_path, board=None, keep_windows=False, block_seconds=BLOCK_SECONDS):
+    """
+    Analyse un fichier bloc par bloc depuis le disque : Pedalboard optionnel (sans reset
+    entre les blocs), conversion mono, rééchantillonnage 16 kHz en flux puis analyse par fenêtres.
+    Retourne (métriques globales, métriques par fenêtre ou None).
+    """
+    analyzer = StreamingSpectralAnalyzer(keep_windows=keep_windows)
+
+    with AudioFile(audio_path) as f:
+        sr = f.samplerate
+        block_frames = int(sr * block_seconds)
+        resampler = StreamResampler(sr, TARGET_SAMPLE_RATE, 1)
+
+        while f.tell() < f.frames:
+            block = f.read(block_frames)
+            last = f.tell() >= f.frames
+            if board is not None:
+                block = board.process(block, sr, reset=False)
+            mono = block.mean(axis=0, keepdims=True) if block.shape[0] > 1 else block
+            np.clip(mono, -1.0, 1.0, out=mono)
+            analyzer.update(resampler.process(mono.astype(np.float32)))
+            if last:
+                analyzer.update(resampler.process(None))
+
+    metrics = analyzer.finalize()
+    return metrics, (analyzer.window_metrics if keep_windows else None)
+
+
+def save_windows_csv(window_metrics, output_csv):
+    fields = ["time", "rms", "dominant_freq", "spectral_centroid", "bandwidth", "spectral_rolloff"]
+    with open(output_csv, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(window_metrics)
+
+
+# script principal : analyse d'un long enregistrement à mémoire bornée
+if __name__ == "__main__":
+    from audio_processor import build_board
+
+    parser = argparse.ArgumentParser(description="Analyse spectrale par fenêtres d'un fichier audio")
+    parser.add_argument("audio_path")
+    parser.add_argument("--windows-csv", default=None, help="export des métriques par fenêtre")
+    parser.add_argument("--raw", action="store_true", help="sans la chaîne Pedalboard")
+    args = parser.parse_args()
+
+    metrics, windows = analyze_file(
+        args.audio_path,
+        board=None if args.raw else build_board(),
+        keep_windows=args.windows_csv is not None,
+    )
+    for name, value in metrics.items():
+        print(f"{name}: {value}")
+    if windows is not None:
+        save_windows_csv(windows, args.windows_csv)
+        print(f"{len(windows)} fenêtres exportées dans {args.windows_csv}")
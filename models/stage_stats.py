@@ -0,0 +1,118 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageStats:
+    """
+    Statistiques d'une étape du pipeline : éléments traités, temps actif,
+    temps d'attente (file vide ou pleine) et durée totale.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.busy = 0.0
+        self.wait = 0.0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started is None:
+                self.started = time.perf_counter()
+
+    def stop(self):
+        with self._lock:
+            self.finished = time.perf_counter()
+
+    def add(self, seconds, count=1):
+        with self._lock:
+            self.busy += seconds
+            self.count += count
+
+    def add_wait(self, seconds):
+        with self._lock:
+            self.wait += seconds
+
+    @contextmanager
+    def timed(self, count=1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(time.perf_counter() - start, count)
+
+    @property
+    def wall(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self):
+        per_item = self.busy / self.count if self.count else 0
+        print(f"[{self.name}] {self.count} éléments en {self.wall:.1f}s "
+              f"(actif {self.busy:.1f}s, {per_item:.2f}s/élément, attente {self.wait:.1f}s)")
+
+
+class TierStats:
+    """
+    Bilan de l'évaluation par paliers (AudioProcessor tiered) : fichiers éliminés
+    par palier et temps évité, estimé à partir du coût par seconde d'audio des
+    étapes sautées mesuré sur les fichiers évalués jusqu'au bout.
+    """
+
+    # étapes évitées par un rejet à chaque palier
+    SKIPPED_STAGES = {
+        "cheap": ("pedalboard", "normalize", "resample", "vad", "fft"),
+        "vad": ("fft",),
+    }
+
+    def __init__(self):
+        self.files = 0
+        self.eliminated = {}
+        self.early_audio = {}
+        self.stage_seconds = {}
+        self.stage_audio = {}
+        self.overhead = 0.0
+        self._lock = threading.Lock()
+
+    def add_record(self, record):
+        tier = record.get("rejected_tier")
+        timings = record.get("timings") or {}
+        duration = record.get("duration", 0.0)
+        with self._lock:
+            self.files += 1
+            if tier is not None:
+                self.eliminated[tier] = self.eliminated.get(tier, 0) + 1
+            if not timings:
+                return  # résultat du cache : rien n'a été calculé
+            self.overhead += timings.get("tier_cheap", 0.0)
+            if tier in self.SKIPPED_STAGES:
+                self.early_audio[tier] = self.early_audio.get(tier, 0.0) + duration
+            else:
+                for stage in self.SKIPPED_STAGES["cheap"]:
+                    if stage in timings:
+                        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + timings[stage]
+                        self.stage_audio[stage] = self.stage_audio.get(stage, 0.0) + duration
+
+    def saved(self, tier):
+        """
+        Temps estimé évité par les rejets à ce palier (secondes).
+        """
+        total = 0.0
+        for stage in self.SKIPPED_STAGES.get(tier, ()):
+            if self.stage_audio.get(stage):
+                total += self.stage_seconds[stage] / self.stage_audio[stage] * self.early_audio.get(tier, 0.0)
+        return total
+
+    def report(self):
+        print(f"[paliers] {self.files} fichiers évalués")
+        for tier in ("cheap", "vad", "full"):
+            line = f"  {tier:<6} : {self.eliminated.get(tier, 0)} rejetés"
+            if tier in self.SKIPPED_STAGES:
+                line += f", ~{self.saved(tier):.1f}s évitées"
+            print(line)
+        saved = sum(self.saved(tier) for tier in self.SKIPPED_STAGES)
+        print(f"  gain net estimé : {saved - self.overhead:.1f}s (coût du palier cheap {self.overhead:.1f}s)")
@@ -0,0 +1,89 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_S = 0.5  # interpréteur compris
+# dépendances lourdes qui ne doivent être chargées qu'à leur premier usage
+HEAVY_MODULES = ["torch", "whisper", "faster_whisper", "matplotlib", "pedalboard", "pydub", "scipy", "silero_vad",
+                 "speechbrain", "sklearn"]
+ENTRY_POINTS = ["pipeline", "audio_processor", "transcriber", "quality_cache", "metrics_store", "diarization",
+                "live_transcriber", "toWav"]
+
+
+def import_profile(module):
+    """
+    Importe module dans un interpréteur neuf avec -X importtime.
+    Retourne (durée totale en s, [(cumulé en s, propre en s, nom)], modules lourds chargés).
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=MODELS_DIR,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, name.rstrip()))
+    heavy = [m for m in result.stdout.strip().split(",") if m]
+    return wall, entries, heavy
+
+
+def report(module, top=15):
+    wall, entries, heavy = import_profile(module)
+    print(f"Démarrage de '{module}' : {wall * 1000:.0f} ms (interpréteur compris)")
+    print(f"{'cumulé (ms)':>12} {'propre (ms)':>12}  module")
+    for cumulative, own, name in sorted(entries, reverse=True)[:top]:
+        print(f"{cumulative * 1000:12.1f} {own * 1000:12.1f}  {name}")
+    if heavy:
+        print(f"Dépendances lourdes chargées à l'import : {', '.join(heavy)}")
+    return wall, heavy
+
+
+def check_budget(modules=ENTRY_POINTS, budget=IMPORT_BUDGET_S):
+    """
+    Vérifie que chaque point d'entrée s'importe sous le budget sans charger de
+    dépendance lourde. Retourne True si tout passe.
+    """
+    ok = True
+    for module in modules:
+        try:
+            wall, _, heavy = import_profile(module)
+        except RuntimeError as e:
+            print(f"[ÉCHEC] import {module} : {e}")
+            ok = False
+            continue
+        passed = wall <= budget and not heavy
+        ok = ok and passed
+        status = "OK" if passed else "ÉCHEC"
+        detail = f" ; chargés : {', '.join(heavy)}" if heavy else ""
+        print(f"[{status}] import {module} : {wall * 1000:.0f} ms (budget {budget * 1000:.0f} ms){detail}")
+    return ok
+
+
+# script principal : profil d'import d'un module ou vérification du budget
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de démarrage des points d'entrée")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_S, help="secondes par import")
+    parser.add_argument("--check", action="store_true", help="code de sortie 1 si le budget est dépassé")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check_budget(args.modules, args.budget) else 1)
+    for module in args.modules:
+        report(module)
+        print()
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import wave
+import numpy as np
+
+CORPUS_DIR = "data/bench/corpus"
+MANIFEST_NAME = "corpus.json"
+SAMPLE_RATES = [8000, 16000, 22050, 44100, 48000]
+DURATIONS = [2, 5, 10, 30, 60]  # secondes
+KINDS = ["speech", "noisy_speech", "clipped_speech", "noise", "silence", "sparse_speech"]
+CORPUS_VERSION = 1  # à incrémenter si la génération change (les références deviennent incomparables)
+
+
+def speech_like(rng, n, sr):
+    """
+    Signal voisé : fondamentale glissante, harmoniques pondérées par deux formants,
+    enveloppe syllabique (~4 Hz) et pauses.
+    """
+    t = np.arange(n) / sr
+    f0 = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    formants = rng.uniform(500, 900), rng.uniform(1100, 2200)
+    signal = np.zeros(n)
+    for h in range(1, 16):
+        freq = h * f0.mean()
+        if freq >= sr / 2:
+            break
+        gain = sum(np.exp(-((freq - f) / 300) ** 2) for f in formants) + 0.05
+        signal += gain / h * np.sin(h * phase)
+
+    syllables = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 5) * t + rng.uniform(0, np.pi)))
+    # pauses de 0.3 à 1 s entre des phrases de 1 à 4 s
+    voiced = np.zeros(n)
+    pos = 0
+    while pos < n:
+        length = int(rng.uniform(1, 4) * sr)
+        voiced[pos:pos + length] = 1
+        pos += length + int(rng.uniform(0.3, 1.0) * sr)
+    signal *= syllables * voiced
+    peak = np.max(np.abs(signal))
+    return signal / peak if peak > 0 else signal
+
+
+def generate_signal(kind, rng, n, sr):
+    if kind == "silence":
+        return rng.normal(0, 1e-4, n)
+    if kind == "noise":
+        return rng.normal(0, 0.3, n)
+
+    signal = speech_like(rng, n, sr) * rng.uniform(0.2, 0.6)
+    if kind == "noisy_speech":
+        signal += rng.normal(0, rng.uniform(0.05, 0.2), n)
+    elif kind == "clipped_speech":
+        signal = np.clip(signal * rng.uniform(3, 6), -1, 1)
+    elif kind == "sparse_speech":
+        # longue plage de silence : ratio de parole faible
+        signal[: int(n * 0.7)] = rng.normal(0, 1e-3, int(n * 0.7))
+    return signal
+
+
+def write_wav(path, signal, sr):
+    pcm = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sr)
+        f.writeframes(pcm.tobytes())
+
+
+def corpus_specs(n_files, seed=0):
+    """
+    Liste déterministe (nom, type, durée, fréquence d'échantillonnage, graine) ;
+    types, durées et fréquences varient ensemble d'un fichier à l'autre.
+    """
+    rng = np.random.RandomState(seed)
+    specs = []
+    for i in range(n_files):
+        specs.append({
+            "file": f"synth_{i:04d}.wav",
+            "kind": KINDS[i % len(KINDS)],
+            "duration": DURATIONS[(i // len(KINDS)) % len(DURATIONS)],
+            "sample_rate": SAMPLE_RATES[i % len(SAMPLE_RATES)],
+            "seed": int(rng.randint(0, 2 ** 31 - 1)),
+        })
+    return specs
+
+
+def generate_corpus(output_dir=CORPUS_DIR, n_files=24, seed=0, force=False):
+    """
+    Génère le corpus (sans réseau) et son manifeste. Un corpus existant avec les
+    mêmes paramètres est réutilisé. Retourne la liste des chemins.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    specs = corpus_specs(n_files, seed)
+    manifest = {"version": CORPUS_VERSION, "seed": seed, "files": specs}
+
+    paths = [os.path.join(output_dir, spec["file"]) for spec in specs]
+    if not force and os.path.isfile(manifest_path) and all(os.path.isfile(p) for p in paths):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if json.load(f) == manifest:
+                return paths
+
+    for spec, path in zip(specs, paths):
+        rng = np.random.RandomState(spec["seed"])
+        n = int(spec["duration"] * spec["sample_rate"])
+        write_wav(path, generate_signal(spec["kind"], rng, n, spec["sample_rate"]), spec["sample_rate"])
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return paths
+
+
+def corpus_duration(output_dir=CORPUS_DIR):
+    with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return sum(spec["duration"] for spec in json.load(f)["files"])
+
+
+# script principal : génération du corpus synthétique
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Corpus audio synthétique déterministe pour les benchmarks")
+    parser.add_argument("output_dir", nargs="?", default=CORPUS_DIR)
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.output_dir, args.files, args.seed, args.force)
+    print(f"{len(paths)} fichiers ({corpus_duration(args.output_dir)} s d'audio) dans {args.output_dir}")
@@ -1,27 +1,154 @@
-from pydub import AudioSegment
-import torchaudio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import json
 import os
+import threading
+import wave
+
+TARGET_SAMPLE_RATE = 16000
+AUDIO_DIR = "data/audio/23032024_juin"
+MANIFEST_NAME = ".towav_manifest.json"
+NUM_WORKERS = os.cpu_count() or 1
 
 def toWav(audio_path: str) -> str:
     """
     Convertit un fichier .mp3 en .wav (16kHz mono).
     """
+    from pydub import AudioSegment
+
     if not os.path.isfile(audio_path):
         raise FileNotFoundError(f"Fichier introuvable: {audio_path}.")
-    
+
     base, ext = os.path.splitext(audio_path)
     wav_path = base + ".wav"
 
     audio = AudioSegment.from_file(audio_path, format=ext[1:])
-    audio = audio.set_frame_rate(16000).set_channels(1)
+    audio = audio.set_frame_rate(TARGET_SAMPLE_RATE).set_channels(1)
 
     audio.export(wav_path, format="wav")
     return wav_path
 
+def toWav_av(audio_path: str) -> str:
+    """
+    Convertit un fichier en .wav (16kHz mono) avec le décodeur av, dans le processus
+    et trame par trame (ni ffmpeg externe ni fichier entier en mémoire).
+    """
+    import av
+
+    if not os.path.isfile(audio_path):
+        raise FileNotFoundError(f"Fichier introuvable: {audio_path}.")
+
+    wav_path = os.path.splitext(audio_path)[0] + ".wav"
+    tmp_path = wav_path + ".part"
+
+    try:
+        with av.open(audio_path) as container:
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=TARGET_SAMPLE_RATE)
+            with wave.open(tmp_path, "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(TARGET_SAMPLE_RATE)
+                for frame in container.decode(stream):
+                    for resampled in resampler.resample(frame):
+                        out.writeframes(resampled.to_ndarray().tobytes())
+                for resampled in resampler.resample(None):  # vide le tampon du rééchantillonneur
+                    out.writeframes(resampled.to_ndarray().tobytes())
+    except BaseException:
+        # décodage interrompu : pas de .part orphelin dans le dossier de sortie
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # renommage atomique : un .wav présent est toujours complet
+    os.replace(tmp_path, wav_path)
+    return wav_path
+
+DECODERS = {"pydub": toWav, "av": toWav_av}
+
+def convert_file(audio_path, decoder="pydub"):
+    return DECODERS[decoder](audio_path)
+
+class ConversionManifest:
+    """
+    Manifeste JSON des conversions terminées (taille et mtime de la source),
+    pour reprendre un lot interrompu et sauter les fichiers déjà à jour.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def signature(audio_path):
+        st = os.stat(audio_path)
+        return {"size": st.st_size, "mtime": st.st_mtime}
+
+    def is_up_to_date(self, audio_path):
+        entry = self.entries.get(os.path.basename(audio_path))
+        if entry is None or not os.path.isfile(entry["wav"]):
+            return False
+        return entry["size"] == os.path.getsize(audio_path) and entry["mtime"] == os.path.getmtime(audio_path)
+
+    def mark_done(self, audio_path, wav_path):
+        with self._lock:
+            entry = self.signature(audio_path)
+            entry["wav"] = wav_path
+            self.entries[os.path.basename(audio_path)] = entry
+            self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+def convert_directory(audio_dir=AUDIO_DIR, workers=NUM_WORKERS, decoder="pydub", extensions=(".mp3",), force=False):
+    """
+    Convertit en parallèle tous les fichiers du dossier. Les fichiers déjà convertis
+    (même taille et mtime que lors de leur conversion) sont sautés.
+    Retourne (convertis, sautés, erreurs).
+    """
+    manifest = ConversionManifest(os.path.join(audio_dir, MANIFEST_NAME))
+    sources = sorted(
+        os.path.join(audio_dir, f)
+        for f in os.listdir(audio_dir)
+        if f.lower().endswith(tuple(extensions))
+    )
+    todo = [path for path in sources if force or not manifest.is_up_to_date(path)]
+    skipped = len(sources) - len(todo)
+    print(f"{len(sources)} fichiers, {skipped} déjà à jour, {len(todo)} à convertir ({decoder}, {workers} workers).")
+
+    converted, errors = 0, []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_file, path, decoder): path for path in todo}
+        for future in as_completed(futures):
+            audio_path = futures[future]
+            try:
+                wav_path = future.result()
+            except Exception as e:
+                print(f"Erreur lors de la conversion de {audio_path} : {e}")
+                errors.append(audio_path)
+                continue
+            # enregistré après chaque fichier : un lot interrompu reprend ici
+            manifest.mark_done(audio_path, wav_path)
+            converted += 1
+
+    print(f"{converted} fichiers convertis, {len(errors)} erreurs.")
+    return converted, skipped, errors
+
 # script principal
 if __name__ == "__main__":
-    audio_dir = "data/audio/23032024_juin"
-    for file_name in os.listdir(audio_dir):
-        if file_name.lower().endswith(".mp3"):
-            audio_path = os.path.join(audio_dir, file_name)
-            toWav(audio_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Conversion par lot en .wav 16 kHz mono")
+    parser.add_argument("audio_dir", nargs="?", default=AUDIO_DIR)
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    parser.add_argument("--decoder", choices=sorted(DECODERS), default="pydub",
+                        help="pydub (ffmpeg par fichier) ou av (décodage dans le processus)")
+    parser.add_argument("--force", action="store_true", help="reconvertit même les fichiers à jour")
+    args = parser.parse_args()
+
+    convert_directory(args.audio_dir, args.workers, args.decoder, force=args.force)
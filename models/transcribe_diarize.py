@@ -0,0 +1,67 @@
+import argparse
+import os
+import time
+
+from diarization import Diarizer, assign_speakers
+from transcriber import Transcriber
+
+LAST_FILENAME_PATH = "data/last_filename.txt"
+RAW_DIR = "data/raw"
+
+
+def transcribe_diarize(processor, backend, diarizer, cache=None, language="fr"):
+    """
+    Transcription des segments VAD d'un AudioProcessor déjà passé (temps de
+    l'enregistrement d'origine) et attribution d'un locuteur à chaque segment.
+    Retourne (Transcriber, tours de parole).
+    """
+    clips = processor.speech_clips()
+    transcriber = Transcriber(processor.audio_path, backend=backend, clips=clips, cache=cache,
+                              language=language, verbose=False)
+    transcriber.run_transcription()
+    with transcriber.timer.stage("diarize"):
+        turns = diarizer.diarize(clips, duration=processor.duration_sec)
+    assign_speakers(transcriber.segments, turns)
+    with transcriber.timer.stage("save_transcript"):
+        transcriber.save_results()
+    return transcriber, turns
+
+
+# script principal : transcription et diarisation du dernier fichier envoyé (ou d'un fichier donné)
+if __name__ == "__main__":
+    from audio_processor import AudioProcessor
+    from embedding_cache import EmbeddingCache
+    from pipeline import build_backend, TRANSCRIPTION_BACKEND, WHISPER_MODEL
+    from toWav import toWav_av
+
+    parser = argparse.ArgumentParser(description="Transcription et diarisation d'un enregistrement")
+    parser.add_argument("audio_path", nargs="?", default=None, help="défaut : dernier fichier du dashboard")
+    parser.add_argument("--backend", default=TRANSCRIPTION_BACKEND)
+    parser.add_argument("--model", default=WHISPER_MODEL)
+    parser.add_argument("--speakers", type=int, default=None, help="nombre de locuteurs s'il est connu")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="désactive le cache des embeddings")
+    args = parser.parse_args()
+
+    audio_path = args.audio_path
+    if audio_path is None:
+        with open(LAST_FILENAME_PATH, "r", encoding="utf-8") as f:
+            audio_path = os.path.join(RAW_DIR, f.read().strip())
+    wav_path = audio_path if audio_path.endswith(".wav") else toWav_av(audio_path)
+
+    processor = AudioProcessor(wav_path, verbose=False, mmap=True)
+    if not processor.process():
+        print("Audio rejeté (qualité) : " + ", ".join(processor.rejection_reasons))
+    else:
+        cache = EmbeddingCache() if args.cache else None
+        diarizer = Diarizer(cache=cache, num_speakers=args.speakers)
+        backend = build_backend(args.backend, args.model, lazy=False)
+        start = time.perf_counter()
+        try:
+            transcriber, turns = transcribe_diarize(processor, backend, diarizer)
+        finally:
+            if cache is not None:
+                cache.close()
+        for seg in transcriber.segments:
+            print(Transcriber.format_segment(seg))
+        print(f"{len({turn['speaker'] for turn in turns})} locuteur(s), "
+              f"transcription + diarisation en {time.perf_counter() - start:.1f}s, RTF diarisation {diarizer.rtf:.3f}")
@@ -1,40 +1,93 @@
-import torch
 import csv
 import gc
+import hashlib
 import os
+import sys
 import threading
+from transcription_backends import WhisperBackend
+from profiling import StageTimer
 
 PLOT_LOCK = threading.Lock()
 MIN_AVG_LOGPROB = -0.3
+TRANSCRIPT_CSV = "data/transcripts_log.csv"
+TRANSCRIPT_CSV_HEADER = ["file", "avg_logprob", "rejected"]
 
 class Transcriber:
-    def __init__(self, audio_path, model=None, language="fr", verbose=True):
+    def __init__(self, audio_path, model=None, language="fr", verbose=True,
+                 model_name=None, decode_options=None, cache=None, backend=None, clips=None,
+                 sink=None):
         self.audio_path = audio_path
+        # clips : segments de parole en mémoire (AudioProcessor.speech_clips) ; audio_path
+        # est alors l'enregistrement d'origine et sert seulement à nommer les sorties
+        self.clips = clips
+        self.audio_hash = clips_hash(clips) if clips is not None else None
         self.model = model
+        # backend : WhisperBackend, FasterWhisperBackend... Un modèle openai-whisper
+        # passé directement est enveloppé dans un WhisperBackend.
+        if backend is None and model is not None:
+            backend = WhisperBackend(model_name=model_name, model=model)
+        self.backend = backend
         self.language = language
-        self.device = "cuda"
+        self.device = backend.device if backend is not None else default_device()
         self.transcription = ""
         self.avg_logprob = 0
+        self.segments = []
+        self.detected_language = None
+        # cache des transcriptions : le nom du modèle et les options font partie de la clé
+        self.model_name = model_name if model_name is not None else (
+            backend.cache_name if backend is not None and model is None else None
+        )
+        self.decode_options = decode_options or {}
+        # options de la clé du cache : décodage, plus le mode lot quand il change le résultat
+        self.cache_options = self.decode_options
+        self.cache = cache
+        self.from_cache = False
         self.should_reject = False
         self.verbose = verbose
+        # sink : MetricsStore partagé ; sans sink, ajout direct au CSV
+        self.sink = sink
+        self.timer = StageTimer()
 
-    def run_transcription(self):
+    def load_from_cache(self):
+        if self.cache is None or self.model_name is None:
+            return False
+
+        entry = self.cache.get(self.audio_path, self.model_name, self.cache_options, audio_hash=self.audio_hash)
+        if entry is None:
+            return False
+
+        self.segments = entry["segments"]
+        self.avg_logprob = entry["avg_logprob"]
+        self.detected_language = entry["language"]
+        self.transcription = " ".join([seg["text"].strip() for seg in self.segments])
+        self.from_cache = True
+        if self.verbose:
+            print(f"Transcription de {self.audio_path} trouvée dans le cache.")
+        return True
+
+    def run_transcription(self, check_cache=True):
+        """
+        check_cache=False : cache déjà consulté par l'appelant (transcription par lots).
+        """
+        if check_cache:
+            with self.timer.stage("transcript_cache"):
+                found = self.load_from_cache()
+            if found:
+                return
 
         try:
-            if self.model is None:
+            if self.backend is None:
                 raise ValueError("Le modèle Whisper n'a pas été fourni.")
         
             if self.verbose:
                 print(f"Transcription de {self.audio_path} en cours...")
         # transcription de l'audio
-            result = self.model.transcribe(self.audio_path)
-            self.avg_logprob = sum(s['avg_logprob'] for s in result['segments']) / len(result['segments'])
-            # print(f"Score de confiance moyen : {avg_confidence:.3f}")
-
-
-            self.segments = result.get("segments", [])
-
-            self.transcription = " ".join([seg["text"].strip() for seg in self.segments])
+            with self.timer.stage("transcribe"):
+                if self.clips is not None:
+                    result = self.transcribe_clips()
+                else:
+                    result = self.backend.transcribe(self.audio_path, **self.decode_options)
+            self.apply_result(result)
             if self.verbose:
                 print(f"Transcription de {self.audio_path} terminée.")
 
@@ -44,10 +97,47 @@ class Transcriber:
 
         finally:
             gc.collect()
-            if torch.cuda.is_available():
+            # torch n'est pas importé ici juste pour vider le cache (backend faster-whisper, serveur)
+            torch = sys.modules.get("torch")
+            if torch is not None and torch.cuda.is_available():
                 torch.cuda.empty_cache()
                 torch.cuda.synchronize()
         
+    def transcribe_clips(self):
+        """
+        Transcrit chaque segment de parole séparément ; les temps des segments sont
+        décalés pour correspondre à l'enregistrement d'origine.
+        """
+        segments = []
+        language = None
+        for clip in self.clips:
+            result = self.backend.transcribe(clip["audio"], **self.decode_options)
+            language = language or result.get("language")
+            for seg in result["segments"]:
+                seg = dict(seg)
+                seg["start"] = seg["start"] + clip["start"]
+                seg["end"] = min(seg["end"] + clip["start"], clip["end"])
+                segments.append(seg)
+        return {"segments": segments, "language": language}
+
+    def apply_result(self, result):
+        """
+        Renseigne segments / avg_logprob depuis un résultat de backend
+        (transcription seule ou lot) et le met en cache.
+        """
+        self.avg_logprob = sum(s['avg_logprob'] for s in result['segments']) / len(result['segments'])
+        # print(f"Score de confiance moyen : {avg_confidence:.3f}")
+
+        self.segments = result.get("segments", [])
+        self.detected_language = result.get("language")
+
+        if self.cache is not None and self.model_name is not None:
+            self.cache.put(self.audio_path, self.model_name, self.cache_options,
+                           self.segments, self.avg_logprob, self.detected_language,
+                           audio_hash=self.audio_hash)
+
+        self.transcription = " ".join([seg["text"].strip() for seg in self.segments])
+
     def save_transcript(self, path):
         if not self.segments:
             print("Aucune transcription à sauvegarder.")
@@ -61,9 +151,7 @@ class Transcriber:
             try:
                 with open(output_path, "w", encoding="utf-8") as f:
                     for seg in self.segments:
-                        start = self.format_time(seg["start"])
-                        end = self.format_time(seg["end"])
-                        f.write(f"[{start} - {end}] : {seg['text'].strip()}\n")
+                        f.write(self.format_segment(seg) + "\n")
 
                 print(f"Transcription sauvegardée : {output_path}")
 
@@ -71,18 +159,34 @@ class Transcriber:
                 print(f"Erreur lors de la sauvegarde : {e}")
                 raise
 
+    def record(self):
+        return {
+            "file": os.path.basename(self.audio_path),
+            "avg_logprob": float(self.avg_logprob),
+            "rejected": bool(self.should_reject),
+            "language": self.detected_language,
+        }
+
     def save_csv(self):
-        file_exists = os.path.isfile("data/transcripts_log.csv")
-        with open("data/transcripts_log.csv", mode="a", newline="", encoding="utf-8") as f:
+        if self.sink is not None:
+            self.sink.add_transcript(self.record())
+            return
+
+        file_exists = os.path.isfile(TRANSCRIPT_CSV)
+        with open(TRANSCRIPT_CSV, mode="a", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             if not file_exists:
-                writer.writerow(["file", "avg_logprob", "rejected"])
+                writer.writerow(TRANSCRIPT_CSV_HEADER)
 
-            writer.writerow([
-                os.path.basename(self.audio_path),
-                round(self.avg_logprob, 3) if self.avg_logprob else "",
-                self.should_reject,
-            ])
+            writer.writerow(transcript_csv_row(self.record()))
+
+    @classmethod
+    def format_segment(cls, seg):
+        """
+        "[mm:ss - mm:ss] : texte", avec le locuteur s'il a été attribué (diarisation).
+        """
+        speaker = f" {seg['speaker']}" if seg.get("speaker") else ""
+        return f"[{cls.format_time(seg['start'])} - {cls.format_time(seg['end'])}]{speaker} : {seg['text'].strip()}"
 
     @staticmethod
     def format_time(seconds):
@@ -92,10 +196,38 @@ class Transcriber:
     
     def transcribe(self):
         self.run_transcription()
+        with self.timer.stage("save_transcript"):
+            self.save_results()
+
+    def save_results(self):
         if self.avg_logprob < MIN_AVG_LOGPROB:
             self.should_reject = True
             print(f"La qualité de la transcription est trop mauvaise. Audio non retenu.")
             self.save_transcript(path="data/transcript/REJECTED")
         else:
             self.save_transcript(path="data/transcript")
-        self.save_csv()
\ No newline at end of file
+        self.save_csv()
+
+
+def default_device():
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def clips_hash(clips):
+    """
+    Hash du contenu de segments de parole en mémoire (temps + échantillons).
+    """
+    h = hashlib.sha256()
+    for clip in clips:
+        h.update(f"{clip['start']:.3f}:{clip['end']:.3f}".encode("utf-8"))
+        h.update(clip["audio"].tobytes())
+    return h.hexdigest()
+
+
+def transcript_csv_row(record):
+    return [
+        record["file"],
+        round(record["avg_logprob"], 3) if record["avg_logprob"] else "",
+        record["rejected"],
+    ]
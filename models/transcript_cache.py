@@ -0,0 +1,125 @@
+import argparse
+import hashlib
+import json
+import threading
+import diskcache
+
+from quality_cache import file_hash
+
+CACHE_DIR = "data/cache/transcripts"
+CACHE_SIZE_LIMIT = 512 * 1024 ** 2  # 512 Mo, éviction LRU au-delà
+CACHE_VERSION = 1
+SEGMENT_KEYS = ["start", "end", "text", "avg_logprob", "no_speech_prob"]
+
+
+def options_hash(model_name, decode_options=None):
+    payload = {
+        "version": CACHE_VERSION,
+        "model": model_name,
+        "options": dict(sorted((decode_options or {}).items())),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """
+    Cache persistant des transcriptions (diskcache : index SQLite + fichiers),
+    indexé par hash de l'audio nettoyé + modèle + options de décodage.
+    """
+
+    def __init__(self, directory=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT):
+        self.directory = directory
+        self.cache = diskcache.Cache(directory, size_limit=size_limit, eviction_policy="least-recently-used")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(audio_hash, model_name, decode_options=None):
+        return f"transcript:{audio_hash}:{options_hash(model_name, decode_options)}"
+
+    def get(self, audio_path, model_name, decode_options=None, audio_hash=None):
+        """
+        audio_hash : hash déjà calculé (ex. segments en mémoire), sinon hash du fichier.
+        """
+        audio_hash = audio_hash or file_hash(audio_path)
+        entry = self.cache.get(self.key(audio_hash, model_name, decode_options))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, audio_path, model_name, decode_options, segments, avg_logprob, language=None, audio_hash=None):
+        audio_hash = audio_hash or file_hash(audio_path)
+        entry = {
+            "model": model_name,
+            "options": decode_options or {},
+            "language": language,
+            "avg_logprob": float(avg_logprob),
+            "segments": [
+                {k: (float(seg[k]) if k != "text" else seg[k]) for k in SEGMENT_KEYS if k in seg}
+                for seg in segments
+            ],
+        }
+        # tag = hash audio, pour pouvoir invalider toutes les entrées d'un fichier
+        self.cache.set(self.key(audio_hash, model_name, decode_options), entry, tag=audio_hash)
+
+    def invalidate(self, audio_path=None, model_name=None):
+        """
+        Supprime les entrées d'un fichier, d'un modèle, ou tout le cache.
+        Retourne le nombre d'entrées supprimées.
+        """
+        if audio_path is None and model_name is None:
+            return self.cache.clear()
+
+        if audio_path is not None and model_name is None:
+            return self.cache.evict(file_hash(audio_path))
+
+        audio_hash = file_hash(audio_path) if audio_path is not None else None
+        removed = 0
+        for key in list(self.cache.iterkeys()):
+            entry = self.cache.get(key)
+            if entry is None or entry["model"] != model_name:
+                continue
+            if audio_hash is not None and not key.startswith(f"transcript:{audio_hash}:"):
+                continue
+            if self.cache.delete(key):
+                removed += 1
+        return removed
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        size_mb = self.cache.volume() / (1024 * 1024)
+        print(f"Cache transcription : {self.hits} hits, {self.misses} miss ({rate:.0f}% de hits), "
+              f"{len(self.cache)} entrées, {size_mb:.1f} Mo ({self.directory})")
+
+    def close(self):
+        self.cache.close()
+
+
+# script principal : statistiques et invalidation du cache
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gestion du cache des transcriptions")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="nombre d'entrées et taille du cache")
+    p_inv = sub.add_parser("invalidate", help="supprime des entrées du cache")
+    p_inv.add_argument("--file", default=None, help="audio nettoyé dont les transcriptions sont supprimées")
+    p_inv.add_argument("--model", default=None, help="modèle dont les transcriptions sont supprimées")
+    p_inv.add_argument("--all", action="store_true", help="vide tout le cache")
+    args = parser.parse_args()
+
+    cache = TranscriptCache(args.cache_dir)
+    try:
+        if args.command == "stats":
+            cache.report()
+        elif args.command == "invalidate":
+            if not (args.all or args.file or args.model):
+                parser.error("préciser --file, --model ou --all")
+            removed = cache.invalidate() if args.all else cache.invalidate(args.file, args.model)
+            print(f"{removed} entrées supprimées.")
+    finally:
+        cache.close()
@@ -0,0 +1,251 @@
+import os
+import threading
+import numpy as np
+
+DEFAULT_MODEL = "large-v3-turbo"
+SAMPLE_RATE = 16000
+MAX_CLIP_SECONDS = 30  # fenêtre de Whisper : au-delà, pas de décodage par lot
+# options de model.transcribe reprises telles quelles par whisper.DecodingOptions
+BATCH_DECODE_OPTIONS = ("language", "task", "beam_size", "best_of", "patience", "suppress_tokens")
+
+
+class WhisperBackend:
+    """
+    Backend openai-whisper (PyTorch).
+    """
+    name = "whisper"
+    # transcribe_batch décode sans timestamps ni repli de température : résultats
+    # mis en cache sous une clé distincte de ceux de transcribe
+    batch_cache_tag = "whisper-decode"
+
+    def __init__(self, model_name=DEFAULT_MODEL, device=None, model=None):
+        import torch
+
+        self.model_name = model_name
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        if model is None:
+            import whisper
+            model = whisper.load_model(model_name, device=self.device)
+        self.model = model
+
+    @property
+    def cache_name(self):
+        return self.cache_key(self.model_name)
+
+    @classmethod
+    def cache_key(cls, model_name, **kwargs):
+        return f"{cls.name}:{model_name}"
+
+    def transcribe(self, audio, **options):
+        """
+        audio : chemin d'un fichier ou signal float32 mono 16 kHz.
+        Retourne {"segments": [...], "language": ...}.
+        """
+        result = self.model.transcribe(audio, **options)
+        return {"segments": result.get("segments", []), "language": result.get("language")}
+
+    def load_audio(self, audio_path):
+        import whisper
+        return whisper.load_audio(audio_path)
+
+    def transcribe_batch(self, audios, **options):
+        """
+        Transcrit plusieurs clips courts (<= 30 s, float32 16 kHz) en un seul appel
+        à whisper.decode sur un lot de mel-spectrogrammes. Un segment par clip.
+        Les options de décodage compatibles sont reprises ; la température est la
+        première de la liste (pas de repli), initial_prompt devient prompt.
+        """
+        import torch
+        import whisper
+
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), n_mels=self.model.dims.n_mels)
+            for audio in audios
+        ]).to(self.model.device)
+        kwargs = {k: options[k] for k in BATCH_DECODE_OPTIONS if k in options}
+        temperature = options.get("temperature", 0.0)
+        kwargs["temperature"] = temperature[0] if isinstance(temperature, (list, tuple)) else temperature
+        if options.get("initial_prompt"):
+            kwargs["prompt"] = options["initial_prompt"]
+        decode_options = whisper.DecodingOptions(
+            without_timestamps=True,
+            fp16=self.model.device.type == "cuda",
+            **kwargs,
+        )
+        results = whisper.decode(self.model, mels, decode_options)
+
+        return [
+            {
+                "segments": [{
+                    "id": 0,
+                    "start": 0.0,
+                    "end": len(audio) / SAMPLE_RATE,
+                    "text": result.text,
+                    "avg_logprob": result.avg_logprob,
+                    "no_speech_prob": result.no_speech_prob,
+                }],
+                "language": result.language,
+            }
+            for audio, result in zip(audios, results)
+        ]
+
+
+class FasterWhisperBackend:
+    """
+    Backend faster-whisper (CTranslate2), adapté aux noeuds CPU avec quantification int8.
+    """
+    name = "faster-whisper"
+    batch_cache_tag = None  # BatchedInferencePipeline reçoit les mêmes options que transcribe
+
+    def __init__(self, model_name=DEFAULT_MODEL, device="cpu", compute_type="int8", cpu_threads=0, num_workers=1):
+        from faster_whisper import WhisperModel
+
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        # cpu_threads=0 : valeur par défaut de CTranslate2 (4 threads ou OMP_NUM_THREADS)
+        self.cpu_threads = cpu_threads or int(os.environ.get("OMP_NUM_THREADS", 0))
+        self.model = WhisperModel(
+            model_name, device=device, compute_type=compute_type,
+            cpu_threads=self.cpu_threads, num_workers=num_workers,
+        )
+        self._batched = None
+
+    @property
+    def cache_name(self):
+        return self.cache_key(self.model_name, compute_type=self.compute_type)
+
+    @classmethod
+    def cache_key(cls, model_name, compute_type="int8", **kwargs):
+        return f"{cls.name}:{model_name}:{compute_type}"
+
+    def transcribe(self, audio, **options):
+        segments, info = self.model.transcribe(audio, **options)
+        return {
+            "segments": [segment_to_dict(seg) for seg in segments],  # générateur : le décodage a lieu ici
+            "language": info.language,
+        }
+
+    def load_audio(self, audio_path):
+        from faster_whisper import decode_audio
+        return decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+
+    def transcribe_batch(self, audios, **options):
+        """
+        Transcrit plusieurs clips courts en un lot : les clips sont mis bout à bout et
+        BatchedInferencePipeline décode chaque clip (clip_timestamps) dans le même lot.
+        Les segments sont ensuite redistribués par clip avec des temps relatifs au clip.
+        """
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=self.model)
+
+        # clip_timestamps en indices d'échantillons (collect_chunks découpe audio[start:end]) ;
+        # les segments renvoyés sont en secondes, d'où les deux tableaux de décalages
+        offsets_samples = np.cumsum([0] + [len(audio) for audio in audios])
+        offsets = offsets_samples / SAMPLE_RATE
+        clips = [{"start": int(offsets_samples[i]), "end": int(offsets_samples[i + 1])} for i in range(len(audios))]
+        segments, info = self._batched.transcribe(
+            np.concatenate(audios), clip_timestamps=clips, vad_filter=False,
+            batch_size=len(audios), **options,
+        )
+
+        results = [{"segments": [], "language": info.language} for _ in audios]
+        for seg in segments:
+            middle = (seg.start + seg.end) / 2
+            index = min(int(np.searchsorted(offsets, middle, side="right")) - 1, len(audios) - 1)
+            record = segment_to_dict(seg)
+            record["id"] = len(results[index]["segments"])
+            record["start"] = max(seg.start - offsets[index], 0.0)
+            record["end"] = max(seg.end - offsets[index], 0.0)
+            results[index]["segments"].append(record)
+        return results
+
+
+def segment_to_dict(seg):
+    """
+    Segment faster-whisper -> même structure que openai-whisper (avg_logprob par segment).
+    """
+    return {
+        "id": seg.id,
+        "start": seg.start,
+        "end": seg.end,
+        "text": seg.text,
+        "avg_logprob": seg.avg_logprob,
+        "no_speech_prob": seg.no_speech_prob,
+        "compression_ratio": seg.compression_ratio,
+        "temperature": seg.temperature,
+    }
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+class LazyBackend:
+    """
+    Backend instancié au premier appel qui en a besoin (transcribe, load_audio...) :
+    une exécution où tout est en cache ou rejeté ne charge jamais le modèle.
+    cache_name est connu sans chargement (clé du cache des transcriptions).
+    """
+
+    def __init__(self, name="whisper", model_name=DEFAULT_MODEL, **kwargs):
+        if name not in BACKENDS:
+            raise ValueError(f"Backend de transcription inconnu : {name}")
+        self.name = name
+        self.model_name = model_name
+        self.kwargs = kwargs
+        self.device = kwargs.get("device")
+        self.cache_name = BACKENDS[name].cache_key(model_name, **kwargs)
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._backend is not None
+
+    def get(self):
+        with self._lock:
+            if self._backend is None:
+                self._backend = load_backend(self.name, self.model_name, **self.kwargs)
+                self.device = self._backend.device
+            return self._backend
+
+    def __getattr__(self, attr):
+        # transcribe, transcribe_batch, load_audio, model... : chargement à la demande
+        return getattr(self.get(), attr)
+
+
+class SerializedBackend:
+    """
+    Backend local partagé entre plusieurs threads (jobs, sessions live) : les appels
+    au modèle passent un par un, comme dans ModelServer. Les hooks de kv-cache de
+    openai-whisper gardent un état par module, deux transcribe simultanés se corrompraient.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **options):
+        with self._lock:
+            return self.backend.transcribe(audio, **options)
+
+    def transcribe_batch(self, audios, **options):
+        with self._lock:
+            return self.backend.transcribe_batch(audios, **options)
+
+    def __getattr__(self, attr):
+        # cache_name, device, load_audio... : sans état, pas de verrou
+        return getattr(self.backend, attr)
+
+
+def load_backend(name="whisper", model_name=DEFAULT_MODEL, **kwargs):
+    """
+    Instancie un backend par son nom ("whisper" ou "faster-whisper").
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de transcription inconnu : {name}")
+    return BACKENDS[name](model_name, **kwargs)
@@ -0,0 +1,58 @@
+import threading
+
+# Un modèle Silero VAD par thread : le modèle garde un état interne
+# (reset_states) pendant get_speech_timestamps, il ne doit donc pas être
+# partagé entre deux threads qui l'utilisent en même temps.
+_local = threading.local()
+_lock = threading.Lock()
+_load_count = 0
+# clients du serveur de modèles par URL : sans état, partagés par tous les threads
+_remote = {}
+
+
+def get_vad_model():
+    """
+    Retourne le modèle Silero VAD du thread courant, chargé au premier appel puis réutilisé.
+    """
+    global _load_count
+    model = getattr(_local, "model", None)
+    if model is None:
+        from silero_vad import load_silero_vad
+        model = load_silero_vad()
+        _local.model = model
+        with _lock:
+            _load_count += 1
+    return model
+
+
+def get_remote_vad(url):
+    """
+    Client du serveur de modèles utilisé à la place du modèle local (un par URL et
+    par processus) : le VAD tourne dans le serveur, aucun modèle n'est chargé ici.
+    """
+    with _lock:
+        if url not in _remote:
+            from model_server import RemoteBackend
+            _remote[url] = RemoteBackend(url)
+        return _remote[url]
+
+
+def set_vad_model(model):
+    """
+    Injecte un modèle déjà chargé pour le thread courant (ex. initialisation d'un worker).
+    """
+    _local.model = model
+
+
+def reset_vad_model():
+    """
+    Oublie le modèle du thread courant (il sera rechargé au prochain appel).
+    """
+    _local.model = None
+
+
+def load_count():
+    """
+    Nombre de chargements effectués dans ce processus.
+    """
+    return _load_count
@@ -0,0 +1,68 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+
+try:
+    import numpy as np
+except ImportError:  # dépendances du projet absentes
+    np = None
+
+
+def write_pcm16(path, frames, channels=1, rate=16000):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x01\x00" * frames * channels)
+
+
+@unittest.skipIf(np is None, "numpy non installé")
+class WavLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "test.wav")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_complete_file(self):
+        from audio_buffer import wav_layout
+
+        write_pcm16(self.path, 1000, channels=2)
+        offset, frames, channels, rate, dtype = wav_layout(self.path)
+        self.assertEqual((frames, channels, rate, dtype), (1000, 2, 16000, "<i2"))
+        self.assertEqual(offset + frames * channels * 2, os.path.getsize(self.path))
+
+    def test_truncated_file_is_clamped(self):
+        from audio_buffer import AudioBuffer, wav_layout
+
+        write_pcm16(self.path, 1000)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 401)  # taille déclarée > taille réelle
+        _, frames, _, _, _ = wav_layout(self.path)
+        self.assertEqual(frames, 799)
+        buffer = AudioBuffer(self.path)
+        self.assertEqual(buffer.frames, 799)
+        buffer.close()
+
+    def test_zero_frames_not_mapped(self):
+        from audio_buffer import wav_layout
+
+        write_pcm16(self.path, 0)
+        self.assertIsNone(wav_layout(self.path))
+
+    def test_short_header_not_mapped(self):
+        from audio_buffer import wav_layout
+
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<4sI", b"RIFF", 4))
+        self.assertIsNone(wav_layout(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+
+# dépendances du traitement audio (les trois modes de lecture et le VAD)
+MISSING = [name for name in ("numpy", "scipy", "pydub", "pedalboard", "torch", "silero_vad")
+           if importlib.util.find_spec(name) is None]
+
+# un fichier de 2 s par type de signal (parole, bruit, saturation, silence...)
+CORPUS_FILES = 6
+
+
+@unittest.skipIf(MISSING, f"dépendances absentes : {', '.join(MISSING)}")
+class AudioModesTest(unittest.TestCase):
+    """
+    Les modes in_memory et mmap donnent les métriques du mode pydub, aux tolérances
+    de benchmark.METRIC_TOLERANCES près, et la même décision de rejet.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from synthetic_corpus import generate_corpus
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.paths = generate_corpus(cls.tmp.name, n_files=CORPUS_FILES)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_modes_agree_with_pydub(self):
+        from benchmark import compare_modes
+
+        for path in self.paths:
+            with self.subTest(file=os.path.basename(path)):
+                mismatches, processors, _ = compare_modes(path)
+                self.assertEqual(mismatches, [])
+                self.assertEqual(set(processors), {"pydub", "in_memory", "mmap"})
+
+
+if __name__ == "__main__":
+    unittest.main()
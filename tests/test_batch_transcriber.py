@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+
+try:
+    import numpy  # noqa: F401  (importé par transcription_backends)
+except ImportError:  # dépendances du projet absentes
+    numpy = None
+
+
+def fake_result(text):
+    return {"segments": [{"start": 0.0, "end": 1.0, "text": text, "avg_logprob": -0.1, "no_speech_prob": 0.0}],
+            "language": "fr"}
+
+
+class FakeBackend:
+    """
+    Backend avec décodage par lot à perte (batch_cache_tag), sans modèle.
+    """
+    name = "fake"
+    cache_name = "fake-model"
+    device = "cpu"
+    batch_cache_tag = "fake-batch"
+
+    def __init__(self, fail_batch=False):
+        self.fail_batch = fail_batch
+        self.transcribed = []
+
+    def load_audio(self, audio_path):
+        return audio_path
+
+    def transcribe(self, audio, **options):
+        self.transcribed.append(audio)
+        return fake_result(f"seul {os.path.basename(audio)}")
+
+    def transcribe_batch(self, audios, **options):
+        if self.fail_batch:
+            raise RuntimeError("lot en échec")
+        return [fake_result(f"lot {os.path.basename(audio)}") for audio in audios]
+
+
+class FakeCache:
+    """
+    Cache de transcriptions en mémoire, indexé comme TranscriptCache (chemin, modèle, options).
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.gets = 0
+
+    @staticmethod
+    def key(audio_path, model_name, options):
+        return audio_path, model_name, tuple(sorted(options.items()))
+
+    def get(self, audio_path, model_name, options, audio_hash=None):
+        self.gets += 1
+        return self.entries.get(self.key(audio_path, model_name, options))
+
+    def put(self, audio_path, model_name, options, segments, avg_logprob, language, audio_hash=None):
+        self.entries[self.key(audio_path, model_name, options)] = {
+            "segments": segments, "avg_logprob": avg_logprob, "language": language,
+        }
+
+
+class FakeSink:
+    def __init__(self):
+        self.records = []
+
+    def add_transcript(self, record):
+        self.records.append(record)
+
+
+@unittest.skipIf(numpy is None, "numpy non installé")
+class TranscribeBatchedFallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)  # sorties data/transcript dans un dossier temporaire
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_batched(self, durations, backend):
+        from batch_transcriber import transcribe_batched
+
+        cache = FakeCache()
+        with mock.patch("batch_transcriber.clip_duration", side_effect=lambda path: durations[path]):
+            done = transcribe_batched(list(durations), backend, cache=cache, decode_options={"language": "fr"},
+                                      verbose=False, sink=FakeSink())
+        return done, cache
+
+    def assert_sequential_key(self, cache, path):
+        # résultat complet : clé du décodage classique, pas celle du mode lot
+        self.assertIn(FakeCache.key(path, "fake-model", {"language": "fr"}), cache.entries)
+        self.assertNotIn(FakeCache.key(path, "fake-model", {"language": "fr", "batch": "fake-batch"}), cache.entries)
+
+    def test_too_long_clip_uses_sequential_key(self):
+        done, cache = self.run_batched({"court.wav": 3.0, "long.wav": 45.0}, FakeBackend())
+
+        self.assertEqual({t.audio_path for t in done}, {"court.wav", "long.wav"})
+        self.assert_sequential_key(cache, "long.wav")
+        self.assertIn(FakeCache.key("court.wav", "fake-model", {"language": "fr", "batch": "fake-batch"}),
+                      cache.entries)
+        # deux consultations par fichier (clé classique puis clé du lot), pas de troisième
+        self.assertEqual(cache.gets, 4)
+
+    def test_failed_batch_falls_back_to_sequential_key(self):
+        backend = FakeBackend(fail_batch=True)
+        done, cache = self.run_batched({"a.wav": 2.0, "b.wav": 4.0}, backend)
+
+        self.assertEqual(sorted(backend.transcribed), ["a.wav", "b.wav"])
+        self.assertEqual([t.segments[0]["text"] for t in done], ["seul a.wav", "seul b.wav"])
+        for path in ("a.wav", "b.wav"):
+            self.assert_sequential_key(cache, path)
+        self.assertEqual(cache.gets, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
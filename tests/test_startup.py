@@ -0,0 +1,19 @@
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+
+from startup_profile import ENTRY_POINTS, IMPORT_BUDGET_S, check_budget
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy non installé")
+class StartupBudgetTest(unittest.TestCase):
+    def test_entry_points_within_budget(self):
+        # chaque point d'entrée sous le budget, sans dépendance lourde chargée à l'import
+        self.assertTrue(check_budget(ENTRY_POINTS, IMPORT_BUDGET_S))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models"))
+
+try:
+    import numpy as np
+except ImportError:  # dépendances du projet absentes
+    np = None
+
+
+class FakeBatchedPipeline:
+    """
+    Reproduit le découpage de BatchedInferencePipeline (collect_chunks : audio[start:end])
+    et renvoie un segment par clip, en secondes sur la piste concaténée.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, clip_timestamps, **options):
+        self.calls.append((clip_timestamps, options))
+        segments = []
+        for i, clip in enumerate(clip_timestamps):
+            chunk = audio[clip["start"]:clip["end"]]  # TypeError si les bornes ne sont pas entières
+            segments.append(SimpleNamespace(
+                id=i, start=clip["start"] / 16000, end=clip["end"] / 16000, text=f"clip {i} ({len(chunk)})",
+                avg_logprob=-0.1, no_speech_prob=0.0, compression_ratio=1.0, temperature=0.0,
+            ))
+        return iter(segments), SimpleNamespace(language="fr")
+
+
+@unittest.skipIf(np is None, "numpy non installé")
+class FasterWhisperBatchTest(unittest.TestCase):
+    def test_two_clip_batch(self):
+        from transcription_backends import FasterWhisperBackend
+
+        backend = FasterWhisperBackend.__new__(FasterWhisperBackend)  # sans charger de modèle
+        backend._batched = FakeBatchedPipeline()
+        audios = [np.zeros(16000, dtype=np.float32), np.zeros(8000, dtype=np.float32)]
+
+        results = backend.transcribe_batch(audios, language="fr")
+
+        clips, options = backend._batched.calls[0]
+        self.assertEqual(clips, [{"start": 0, "end": 16000}, {"start": 16000, "end": 24000}])
+        self.assertTrue(all(isinstance(v, int) for clip in clips for v in clip.values()))
+        self.assertEqual(options["language"], "fr")
+        self.assertEqual([r["segments"][0]["text"] for r in results], ["clip 0 (16000)", "clip 1 (8000)"])
+        self.assertAlmostEqual(results[1]["segments"][0]["start"], 0.0)
+        self.assertAlmostEqual(results[1]["segments"][0]["end"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()